@@ -1,8 +1,17 @@
+"""
+Deprecated: the earthquake, flood and forest-fire models are now served by
+the FastAPI app in server.py, which accepts the same POST /predict body and
+adds typed and batch endpoints under /api/v1/hazards. This module is kept
+only for existing deployments and will be removed.
+"""
+import warnings
 from flask import Flask, request, jsonify
 from flask_cors import CORS
 import joblib
 import pandas as pd
 
+warnings.warn("Web-Project/Backend/app.py is deprecated; run server.py instead", DeprecationWarning)
+
 # Initialize Flask app
 app = Flask(__name__)
 CORS(app)  # Allow cross-origin requests for React frontend
@@ -28,7 +28,7 @@ const PredictionForm = () => {
     setError(""); // Clear previous errors
 
     try {
-      const response = await axios.post("http://127.0.0.1:5000/predict", {
+      const response = await axios.post("http://127.0.0.1:8000/predict", {
         model_type: "earthquake",
         latitude: parseFloat(latitude),
         longitude: parseFloat(longitude),
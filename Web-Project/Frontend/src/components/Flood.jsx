@@ -30,7 +30,7 @@ const FloodPredictionForm = () => {
     setError(""); // Clear previous errors
 
     try {
-      const response = await axios.post("http://127.0.0.1:5000/predict", {
+      const response = await axios.post("http://127.0.0.1:8000/predict", {
         model_type: "flood",
         latitude: parseFloat(latitude),
         longitude: parseFloat(longitude),
@@ -1,7 +1,39 @@
+import { cpSync, createReadStream, existsSync, statSync } from 'node:fs'
+import path from 'node:path'
+import { fileURLToPath } from 'node:url'
 import { defineConfig } from 'vite'
 import react from '@vitejs/plugin-react'
 
+// Risk-map tiles are generated (by the *-Prediction-Model.py scripts or
+// export_map_tiles.py) into one directory outside the frontend and are not
+// committed. They are served from there at /Map-Tiles in development and
+// copied into the build output.
+const TILES_DIR = fileURLToPath(new URL('../../Disaster Prediction ML Model/Map-Tiles', import.meta.url))
+
+function mapTiles() {
+  return {
+    name: 'map-tiles',
+    configureServer(server) {
+      server.middlewares.use('/Map-Tiles', (req, res, next) => {
+        const file = path.join(TILES_DIR, decodeURIComponent(req.url.split('?')[0]))
+        if (!file.startsWith(TILES_DIR + path.sep) || !existsSync(file) || !statSync(file).isFile()) {
+          return next()
+        }
+        res.setHeader('Content-Type', 'application/json')
+        createReadStream(file).pipe(res)
+      })
+    },
+    writeBundle(options) {
+      if (!existsSync(TILES_DIR)) {
+        this.warn(`No map tiles in ${TILES_DIR}; run the *-Prediction-Model.py scripts before building`)
+        return
+      }
+      cpSync(TILES_DIR, path.join(options.dir, 'Map-Tiles'), { recursive: true })
+    },
+  }
+}
+
 // https://vite.dev/config/
 export default defineConfig({
-  plugins: [react()],
+  plugins: [react(), mapTiles()],
 })
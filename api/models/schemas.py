@@ -1,7 +1,8 @@
+from enum import Enum
+from typing import Any, Dict, List, Optional
 from pydantic import BaseModel, Field
 
-class PredictionInput(BaseModel):
-    model_name: str = Field(..., example="xgboost_20250306_193033")
+class PredictionFeatures(BaseModel):
     elevation: float = Field(..., ge=0, le=10000)
     slope: float = Field(..., ge=0, le=90)
     aspect: float = Field(..., ge=0, le=360)
@@ -15,10 +16,103 @@ class PredictionInput(BaseModel):
     previous_landslides: int = Field(..., ge=0)
     snow_melt: float = Field(..., ge=0)
     landslide_probability: float = Field(..., ge=0, le=1)
-    lithology: str
-    land_use: str
-    human_activity: str
+    # Empty categories are rejected per row, so one bad site does not fail a batch
+    lithology: str = Field(..., min_length=1)
+    land_use: str = Field(..., min_length=1)
+    human_activity: str = Field(..., min_length=1)
+
+class PredictionInput(PredictionFeatures):
+    model_name: str = Field(..., example="xgboost_20250306_193033")
 
 class PredictionOutput(BaseModel):
     prediction: float = Field(..., ge=0, le=1)
-    prediction_variability: float = Field(..., ge=0.0, le=0.5)
\ No newline at end of file
+    prediction_variability: float = Field(..., ge=0.0, le=0.5)
+
+class BatchPredictionInput(BaseModel):
+    """Batch of sites, either as a list of rows or as one list per column."""
+    model_name: str = Field(..., example="xgboost_20250306_193033")
+    inputs: Optional[List[Dict[str, Any]]] = None
+    columns: Optional[Dict[str, List[Any]]] = None
+
+class BatchPredictionResult(BaseModel):
+    index: int
+    prediction: Optional[float] = Field(None, ge=0, le=1)
+    error: Optional[str] = None
+
+class BatchPredictionOutput(BaseModel):
+    model_name: str
+    prediction_variability: float = Field(..., ge=0.0, le=0.5)
+    results: List[BatchPredictionResult]
+
+class HazardType(str, Enum):
+    earthquake = "earthquake"
+    flood = "flood"
+    forestfire = "forestfire"
+
+class EarthquakeFeatures(BaseModel):
+    latitude: float = Field(..., ge=-90, le=90)
+    longitude: float = Field(..., ge=-180, le=180)
+    depth: float = Field(..., ge=0)
+
+class FloodFeatures(BaseModel):
+    latitude: float = Field(..., ge=-90, le=90)
+    longitude: float = Field(..., ge=-180, le=180)
+    rainfall_mm: float = Field(..., ge=0)
+    elevation_m: float
+    river_discharge_m3_s: float = Field(..., ge=0)
+
+class ForestFireFeatures(BaseModel):
+    state: str = Field(..., example="Odisha")
+
+HAZARD_FEATURES = {
+    HazardType.earthquake: EarthquakeFeatures,
+    HazardType.flood: FloodFeatures,
+    HazardType.forestfire: ForestFireFeatures,
+}
+
+class HazardPredictionOutput(BaseModel):
+    """Model output (magnitude, flood score or risk class) and its risk label."""
+    hazard: HazardType
+    prediction: float
+    risk_level: str
+
+class HazardBatchInput(BaseModel):
+    """Batch of inputs, either as a list of rows or as one list per column."""
+    inputs: Optional[List[Dict[str, Any]]] = None
+    columns: Optional[Dict[str, List[Any]]] = None
+
+class HazardBatchResult(BaseModel):
+    index: int
+    prediction: Optional[float] = None
+    risk_level: Optional[str] = None
+    error: Optional[str] = None
+
+class HazardBatchOutput(BaseModel):
+    hazard: HazardType
+    results: List[HazardBatchResult]
+
+class HazardPlace(BaseModel):
+    """A scored city, state centroid or grid cell; distance_km is set for point queries."""
+    name: Optional[str] = None
+    state: Optional[str] = None
+    latitude: float
+    longitude: float
+    prediction: Optional[float] = None
+    risk_level: str
+    distance_km: Optional[float] = None
+
+class HazardPlacesOutput(BaseModel):
+    hazard: HazardType
+    results: List[HazardPlace]
+
+class LegacyHazardInput(BaseModel):
+    """Request body of the retired Flask backend's /predict."""
+    model_type: HazardType
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    depth: Optional[float] = None
+    rainfall_mm: Optional[float] = None
+    elevation_m: Optional[float] = None
+    river_discharge_m3_s: Optional[float] = None
+    state: Optional[str] = None
+
@@ -0,0 +1,224 @@
+from typing import Callable, Dict, List, Optional, Type
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from pydantic import BaseModel, ValidationError
+from api.routers.predictions import _batch_rows, _queue_full, _report_timing, _validate_rows
+from api.services.hazard_service import HazardService, get_hazard_service
+from api.services.inference_executor import InferenceExecutor, QueueFullError, get_inference_executor
+from api.models.schemas import (
+    HAZARD_FEATURES, HazardBatchInput, HazardBatchOutput, HazardBatchResult,
+    HazardPlace, HazardPlacesOutput, HazardPredictionOutput, HazardType, LegacyHazardInput,
+)
+from src.config.hazard_config import HAZARD_CONFIGS
+from src.hazards.spatial import SpatialIndex
+import logging
+
+router = APIRouter()
+# Mounted without a prefix: the /predict contract of the retired Flask backend
+legacy_router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# Forest-fire labels the Flask backend returned for risk classes 0, 1 and 2
+LEGACY_FOREST_FIRE_LEVELS = ["Low", "Medium", "High"]
+
+async def _predict_one(hazard: HazardType, row: Dict, response: Response,
+                       hazard_service: HazardService, executor: InferenceExecutor):
+    try:
+        (prediction, risk_level), timing = await executor.run(hazard_service.predict, hazard, row)
+        _report_timing(response, timing, "hazard_predict", hazard.value)
+        return prediction, risk_level
+    except QueueFullError as e:
+        raise _queue_full(e)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        logger.error(f"Validation error: {e}")
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Hazard prediction failed: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+def _add_hazard_routes(hazard: HazardType, features: Type[BaseModel]):
+    @router.post(f"/{hazard.value}/predict", response_model=HazardPredictionOutput,
+                 name=f"predict_{hazard.value}")
+    async def predict(
+        data: features,
+        response: Response,
+        hazard_service: HazardService = Depends(get_hazard_service),
+        executor: InferenceExecutor = Depends(get_inference_executor)
+    ):
+        prediction, risk_level = await _predict_one(hazard, data.dict(), response, hazard_service, executor)
+        return {"hazard": hazard, "prediction": prediction, "risk_level": risk_level}
+
+    @router.post(f"/{hazard.value}/predict/batch", response_model=HazardBatchOutput,
+                 name=f"predict_{hazard.value}_batch")
+    async def predict_batch(
+        data: HazardBatchInput,
+        response: Response,
+        hazard_service: HazardService = Depends(get_hazard_service),
+        executor: InferenceExecutor = Depends(get_inference_executor)
+    ):
+        try:
+            rows = _batch_rows(data)
+            valid_indices, valid_rows, errors = _validate_rows(rows, features)
+
+            (predictions, levels, model_errors), timing = await executor.run(
+                hazard_service.predict_batch, hazard, valid_rows
+            )
+            _report_timing(response, timing, "hazard_predict_batch", hazard.value)
+
+            for position, error in model_errors.items():
+                errors[valid_indices[position]] = error
+            scored = {
+                i: (prediction, hazard_service.risk_label(hazard, level))
+                for i, prediction, level in zip(valid_indices, predictions.tolist(), levels.tolist())
+                if level >= 0
+            }
+            results = [
+                HazardBatchResult(
+                    index=i,
+                    prediction=scored[i][0] if i in scored else None,
+                    risk_level=scored[i][1] if i in scored else None,
+                    error=errors.get(i),
+                )
+                for i in range(len(rows))
+            ]
+            return {"hazard": hazard, "results": results}
+
+        except QueueFullError as e:
+            raise _queue_full(e)
+        except FileNotFoundError as e:
+            raise HTTPException(status_code=404, detail=str(e))
+        except ValueError as e:
+            logger.error(f"Validation error: {e}")
+            raise HTTPException(status_code=400, detail=str(e))
+        except Exception as e:
+            logger.error(f"Hazard batch prediction failed: {e}")
+            raise HTTPException(status_code=500, detail="Internal server error")
+
+for _hazard, _features in HAZARD_FEATURES.items():
+    _add_hazard_routes(_hazard, _features)
+
+@router.get("", response_model=Dict[str, bool])
+async def get_hazards(hazard_service: HazardService = Depends(get_hazard_service)):
+    """Hazard types and whether their models are available"""
+    return hazard_service.available()
+
+def _min_level(hazard: HazardType, min_risk: Optional[str]) -> Optional[int]:
+    if min_risk is None:
+        return None
+    labels = HAZARD_CONFIGS[hazard.value]["risk_labels"]
+    if min_risk not in labels:
+        raise HTTPException(status_code=400, detail=f"min_risk must be one of {labels}")
+    return labels.index(min_risk)
+
+def _places(hazard: HazardType, rows: List[Dict]) -> List[HazardPlace]:
+    labels = HAZARD_CONFIGS[hazard.value]["risk_labels"]
+    places = []
+    for row in rows:
+        places.append(HazardPlace(
+            name=row.get("Name"),
+            state=row.get("State"),
+            latitude=row["Latitude"],
+            longitude=row["Longitude"],
+            prediction=row.get("Prediction"),
+            risk_level=labels[int(row["Risk_Level"])],
+            distance_km=row.get("Distance_km"),
+        ))
+    return places
+
+async def _query_places(hazard: HazardType, name: str, query: Callable[[SpatialIndex], List[Dict]],
+                        response: Response, hazard_service: HazardService, executor: InferenceExecutor) -> Dict:
+    """Run query on the hazard's spatial index, which is built on the pool the first time."""
+    try:
+        rows, timing = await executor.run(lambda: query(hazard_service.spatial_index(hazard)))
+        _report_timing(response, timing, f"hazard_{name}", hazard.value)
+        return {"hazard": hazard, "results": _places(hazard, rows)}
+    except QueueFullError as e:
+        raise _queue_full(e)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.error(f"Hazard {name} query failed: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.get("/{hazard}/nearest", response_model=HazardPlacesOutput)
+async def nearest_places(
+    hazard: HazardType,
+    response: Response,
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    k: int = Query(1, ge=1, le=1000),
+    min_risk: Optional[str] = None,
+    hazard_service: HazardService = Depends(get_hazard_service),
+    executor: InferenceExecutor = Depends(get_inference_executor)
+):
+    """The k scored places closest to a point, e.g. the nearest known district"""
+    min_level = _min_level(hazard, min_risk)
+    return await _query_places(
+        hazard, "nearest", lambda index: index.records(*index.nearest(lat, lon, k, min_level)),
+        response, hazard_service, executor,
+    )
+
+@router.get("/{hazard}/within", response_model=HazardPlacesOutput)
+async def places_within_radius(
+    hazard: HazardType,
+    response: Response,
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    radius_km: float = Query(..., gt=0, le=20000),
+    min_risk: Optional[str] = None,
+    limit: int = Query(1000, ge=1, le=100000),
+    hazard_service: HazardService = Depends(get_hazard_service),
+    executor: InferenceExecutor = Depends(get_inference_executor)
+):
+    """Scored places within radius_km of a point, nearest first"""
+    min_level = _min_level(hazard, min_risk)
+    return await _query_places(
+        hazard, "within", lambda index: index.records(*index.within_radius(lat, lon, radius_km, min_level, limit)),
+        response, hazard_service, executor,
+    )
+
+@router.get("/{hazard}/bbox", response_model=HazardPlacesOutput)
+async def places_in_bbox(
+    hazard: HazardType,
+    response: Response,
+    lat_min: float = Query(..., ge=-90, le=90),
+    lat_max: float = Query(..., ge=-90, le=90),
+    lon_min: float = Query(..., ge=-180, le=180),
+    lon_max: float = Query(..., ge=-180, le=180),
+    min_risk: Optional[str] = None,
+    limit: int = Query(1000, ge=1, le=100000),
+    hazard_service: HazardService = Depends(get_hazard_service),
+    executor: InferenceExecutor = Depends(get_inference_executor)
+):
+    """Scored places inside a bounding box; lon_min > lon_max crosses the antimeridian"""
+    if lat_min > lat_max:
+        raise HTTPException(status_code=400, detail="lat_min must not exceed lat_max")
+    min_level = _min_level(hazard, min_risk)
+    return await _query_places(
+        hazard, "bbox",
+        lambda index: index.records(index.within_bbox(lat_min, lat_max, lon_min, lon_max, min_level, limit)),
+        response, hazard_service, executor,
+    )
+
+@legacy_router.post("/predict")
+async def legacy_predict(
+    data: LegacyHazardInput,
+    response: Response,
+    hazard_service: HazardService = Depends(get_hazard_service),
+    executor: InferenceExecutor = Depends(get_inference_executor)
+):
+    """Drop-in for the Flask backend's /predict, keyed by model_type."""
+    hazard = data.model_type
+    try:
+        features = HAZARD_FEATURES[hazard](**data.dict(exclude={"model_type"}))
+    except ValidationError:
+        missing = ", ".join(HAZARD_FEATURES[hazard].__fields__)
+        raise HTTPException(status_code=400, detail=f"Missing input data for {hazard.value} model. Provide {missing}.")
+
+    prediction, risk_level = await _predict_one(hazard, features.dict(), response, hazard_service, executor)
+    if hazard is HazardType.earthquake:
+        return {"model_type": hazard.value, "predicted_magnitude": prediction}
+    if hazard is HazardType.flood:
+        return {"model_type": hazard.value, "predicted_flood_risk": prediction}
+    return {"model_type": hazard.value, "predicted_risk_level": LEGACY_FOREST_FIRE_LEVELS[int(prediction)]}
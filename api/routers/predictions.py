@@ -1,32 +1,92 @@
-from pathlib import Path
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Request
+from typing import Any, Dict, List, Tuple, Type
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from pydantic import BaseModel, ValidationError
+from api.services.inference_executor import (
+    InferenceExecutor, InferenceTiming, QueueFullError, get_inference_executor,
+)
 from api.services.model_service import ModelService, get_model_service
-from api.models.schemas import PredictionInput, PredictionOutput
+from api.models.schemas import (
+    BatchPredictionInput, BatchPredictionOutput, BatchPredictionResult,
+    PredictionFeatures, PredictionInput, PredictionOutput,
+)
 import logging
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+def _batch_rows(data: BatchPredictionInput) -> List[Dict[str, Any]]:
+    """Normalise the row-oriented and columnar request forms into a list of rows."""
+    if (data.inputs is None) == (data.columns is None):
+        raise ValueError("Provide exactly one of 'inputs' or 'columns'")
+    if data.inputs is not None:
+        return data.inputs
+
+    lengths = {len(values) for values in data.columns.values()}
+    if len(lengths) > 1:
+        raise ValueError("All columns must have the same length")
+    names = list(data.columns)
+    return [dict(zip(names, values)) for values in zip(*data.columns.values())]
+
+def _validate_rows(
+    rows: List[Dict[str, Any]], features: Type[BaseModel] = PredictionFeatures
+) -> Tuple[List[int], List[Dict], Dict[int, str]]:
+    """Validate each row against features on its own so one bad input does not fail the whole batch."""
+    valid_indices, valid_rows, errors = [], [], {}
+    for i, row in enumerate(rows):
+        try:
+            valid_rows.append(features(**row).dict())
+            valid_indices.append(i)
+        except ValidationError as e:
+            errors[i] = "; ".join(
+                f"{'.'.join(str(loc) for loc in err['loc'])}: {err['msg']}" for err in e.errors()
+            )
+    return valid_indices, valid_rows, errors
+
+def _report_timing(response: Response, timing: InferenceTiming, route: str, model_name: str):
+    response.headers["X-Queue-Wait-Ms"] = f"{timing.queue_wait_ms:.3f}"
+    response.headers["X-Execution-Ms"] = f"{timing.execution_ms:.3f}"
+    logger.info(
+        f"{route} model={model_name} queue_wait_ms={timing.queue_wait_ms:.2f} "
+        f"execution_ms={timing.execution_ms:.2f}"
+    )
+
+def _queue_full(e: QueueFullError) -> HTTPException:
+    logger.warning(str(e))
+    return HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+
 @router.get("/models", response_model=List[str])
-async def get_available_models():
+async def get_available_models(model_service: ModelService = Depends(get_model_service)):
     """Get list of available models in ml-models directory"""
-    model_dir = Path("ml-models")
-    return [f.stem for f in model_dir.glob("*.pkl")]
+    return model_service.get_available_models()
 
 @router.post("/predict", response_model=PredictionOutput)
 async def predict(
     data: PredictionInput,
-    model_service: ModelService = Depends(get_model_service)
+    response: Response,
+    model_service: ModelService = Depends(get_model_service),
+    executor: InferenceExecutor = Depends(get_inference_executor)
 ):
+    input_data = data.dict(exclude={'model_name'})
+
+    def job():
+        prediction = model_service.predict(data.model_name, input_data)
+        return prediction, model_service.precision(data.model_name)
+
     try:
-        prediction = model_service.predict(data.model_name, data.dict(exclude={'model_name'}))
-        prediction_variability = model_service.precision(data.model_name)
+        if model_service.coalescer.enabled:
+            (prediction, prediction_variability), timing = await model_service.predict_coalesced(
+                data.model_name, input_data, executor
+            )
+        else:
+            (prediction, prediction_variability), timing = await executor.run(job)
+        _report_timing(response, timing, "predict", data.model_name)
         return {
             "prediction": prediction,
             "prediction_variability": prediction_variability
         }
 
+    except QueueFullError as e:
+        raise _queue_full(e)
     except FileNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except ValueError as e:
@@ -34,4 +94,44 @@ async def predict(
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Prediction failed: {e}")
-        raise HTTPException(status_code=500, detail="Internal server error")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.post("/predict/batch", response_model=BatchPredictionOutput)
+async def predict_batch(
+    data: BatchPredictionInput,
+    response: Response,
+    model_service: ModelService = Depends(get_model_service),
+    executor: InferenceExecutor = Depends(get_inference_executor)
+):
+    try:
+        rows = _batch_rows(data)
+        valid_indices, valid_rows, errors = _validate_rows(rows)
+
+        def job():
+            predictions = model_service.predict_batch(data.model_name, valid_rows)
+            return predictions, model_service.precision(data.model_name)
+
+        (predictions, prediction_variability), timing = await executor.run(job)
+        _report_timing(response, timing, "predict_batch", data.model_name)
+
+        scored = dict(zip(valid_indices, predictions.tolist()))
+        results = [
+            BatchPredictionResult(index=i, prediction=scored.get(i), error=errors.get(i))
+            for i in range(len(rows))
+        ]
+        return {
+            "model_name": data.model_name,
+            "prediction_variability": prediction_variability,
+            "results": results
+        }
+
+    except QueueFullError as e:
+        raise _queue_full(e)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        logger.error(f"Validation error: {e}")
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Batch prediction failed: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
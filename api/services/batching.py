@@ -0,0 +1,120 @@
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+from api.services.inference_executor import InferenceExecutor, InferenceTiming
+
+logger = logging.getLogger(__name__)
+
+
+class _PendingBatch:
+    def __init__(self, opened: float):
+        self.opened = opened
+        self.rows: List[Dict] = []
+        self.futures: List[asyncio.Future] = []
+        self.timer = None
+
+
+class RequestCoalescer:
+    """
+    Collects concurrent single-row requests for the same model and scores
+    them with one batch call.
+
+    A batch is dispatched when it reaches ``max_batch_size`` rows or when
+    ``max_wait_ms`` has passed since its first row arrived, whichever comes
+    first. A larger window raises throughput per model call at the cost of
+    added latency for the first request in each batch; ``max_wait_ms=0``
+    disables coalescing.
+
+    ``score_batch(model_name, rows)`` must return one result per row, in order.
+    """
+
+    def __init__(
+        self,
+        score_batch: Callable[[str, List[Dict]], Sequence[Any]],
+        max_batch_size: int = 64,
+        max_wait_ms: float = 2.0,
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.score_batch = score_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self._pending: Dict[str, _PendingBatch] = {}
+        self._running = set()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_wait_ms > 0 and self.max_batch_size > 1
+
+    async def submit(
+        self, model_name: str, input_data: Dict, executor: InferenceExecutor
+    ) -> Tuple[Any, InferenceTiming]:
+        """Queue one row and wait for its result from the shared batch."""
+        loop = asyncio.get_running_loop()
+        batch = self._pending.get(model_name)
+        if batch is None:
+            batch = _PendingBatch(time.perf_counter())
+            batch.timer = loop.call_later(self.max_wait_ms / 1000, self._dispatch, model_name, executor)
+            self._pending[model_name] = batch
+
+        future = loop.create_future()
+        batch.rows.append(input_data)
+        batch.futures.append(future)
+        enqueued = time.perf_counter()
+
+        if len(batch.rows) >= self.max_batch_size:
+            batch.timer.cancel()
+            self._dispatch(model_name, executor)
+
+        result, timing, dispatched = await future
+        # Time spent waiting for the batch to fill counts as queue wait
+        return result, InferenceTiming(
+            queue_wait_ms=(dispatched - enqueued) * 1000 + timing.queue_wait_ms,
+            execution_ms=timing.execution_ms,
+        )
+
+    def _dispatch(self, model_name: str, executor: InferenceExecutor):
+        batch = self._pending.pop(model_name, None)
+        if batch is None:
+            return
+        task = asyncio.ensure_future(self._run(model_name, batch, executor))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _run(self, model_name: str, batch: _PendingBatch, executor: InferenceExecutor):
+        dispatched = time.perf_counter()
+        try:
+            results, timing = await executor.run(self._score_isolated, model_name, batch.rows)
+        except Exception as e:
+            for future in batch.futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        logger.debug(f"Coalesced {len(batch.rows)} requests for {model_name}")
+        for future, result in zip(batch.futures, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result((result, timing, dispatched))
+
+    def _score_isolated(self, model_name: str, rows: List[Dict]) -> List[Any]:
+        """Score the batch; if it fails, score rows one by one so a bad row only fails itself."""
+        try:
+            return list(self.score_batch(model_name, rows))
+        except FileNotFoundError:
+            raise
+        except Exception:
+            if len(rows) == 1:
+                raise
+        results = []
+        for row in rows:
+            try:
+                results.extend(self.score_batch(model_name, [row]))
+            except Exception as e:
+                results.append(e)
+        return results
@@ -0,0 +1,226 @@
+import logging
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Sequence
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+logger = logging.getLogger(__name__)
+
+CATEGORICAL_MAPPINGS = {
+    'lithology': ['basalt', 'granite', 'limestone', 'sandstone', 'shale'],
+    'land_use': ['agriculture', 'barren', 'forest', 'grassland', 'urban'],
+    'human_activity': ['high', 'low', 'medium']
+}
+
+
+class FeatureEncoder:
+    """
+    Column layout for one model, resolved once so that requests can be written
+    straight into a float32 buffer in the model's feature order.
+
+    Features the request does not provide are left at 0, and one-hot slots the
+    model was not trained with are skipped, matching the old DataFrame path.
+    """
+
+    def __init__(self, feature_names: Sequence[str]):
+        self.feature_names = list(feature_names)
+        self.n_features = len(self.feature_names)
+        column_index = {feature: i for i, feature in enumerate(self.feature_names)}
+
+        # field -> {category: column}; only slots present in the model are kept
+        self.categorical_slots: Dict[str, Dict[str, int]] = {}
+        one_hot_columns = set()
+        for field, categories in CATEGORICAL_MAPPINGS.items():
+            slots = {}
+            for category in categories:
+                name = f"{field}_{category}"
+                one_hot_columns.add(name)
+                if name in column_index:
+                    slots[category] = column_index[name]
+            self.categorical_slots[field] = slots
+
+        self.numeric_slots = [
+            (feature, col) for feature, col in column_index.items()
+            if feature not in one_hot_columns
+        ]
+
+    @classmethod
+    def from_model(cls, model, default_features: Sequence[str]) -> "FeatureEncoder":
+        if hasattr(model, 'feature_names_in_'):
+            return cls(model.feature_names_in_.tolist())
+        return cls(default_features)
+
+    def encode_row(self, input_data: Dict) -> np.ndarray:
+        """Encode one request into a (1, n_features) float32 row."""
+        row = np.zeros((1, self.n_features), dtype=np.float32)
+        buffer = row[0]
+        for feature, col in self.numeric_slots:
+            value = input_data.get(feature)
+            if value is not None:
+                buffer[col] = value
+
+        for field, slots in self.categorical_slots.items():
+            value = input_data.get(field)
+            if not value:
+                raise ValueError(f"Missing required field: {field}")
+            col = slots.get(value)
+            if col is not None:
+                buffer[col] = 1.0
+        return row
+
+    def encode_batch(self, rows: List[Dict]) -> np.ndarray:
+        """Encode many requests into one preallocated (n_rows, n_features) float32 matrix."""
+        matrix = np.zeros((len(rows), self.n_features), dtype=np.float32)
+        if not rows:
+            return matrix
+
+        for feature, col in self.numeric_slots:
+            matrix[:, col] = [row.get(feature, 0) for row in rows]
+
+        for field, slots in self.categorical_slots.items():
+            values = np.array([row.get(field) for row in rows], dtype=object)
+            for category, col in slots.items():
+                matrix[:, col] = values == category
+        return matrix
+
+
+class PreprocessorEncoder:
+    """
+    Encoder for models saved together with their fitted ColumnTransformer.
+
+    The saved transformer is the single source of truth for scaling and
+    one-hot encoding. When it only contains StandardScaler / OneHotEncoder
+    steps (what DataPreprocessStrategy fits) their fitted parameters are
+    compiled into index and scale arrays, so a batch is transformed with a few
+    NumPy operations instead of a ColumnTransformer call; anything else goes
+    through preprocessor.transform on the whole batch.
+
+    Requests only need the columns some step reads; columns the transformer
+    drops, remainder='drop' included, may be left out.
+    """
+
+    def __init__(self, preprocessor):
+        self.preprocessor = preprocessor
+        self.fitted_columns = list(preprocessor.feature_names_in_)
+        self.input_columns = self._used_columns()
+        self.feature_names = list(preprocessor.get_feature_names_out())
+        self.n_features = len(self.feature_names)
+        self.compiled = self._compile()
+
+    def _column_names(self, columns) -> List[str]:
+        """Names of a transformer's columns, however the ColumnTransformer was given them"""
+        if isinstance(columns, (str, int, np.integer)):
+            columns = [columns]
+        elif isinstance(columns, slice):
+            return self.fitted_columns[columns]
+        elif np.asarray(columns).dtype == bool:
+            return [c for c, used in zip(self.fitted_columns, columns) if used]
+        return [self.fitted_columns[c] if isinstance(c, (int, np.integer)) else c for c in columns]
+
+    def _used_columns(self) -> List[str]:
+        used = set()
+        for _, transformer, columns in self.preprocessor.transformers_:
+            if isinstance(transformer, str) and transformer == 'drop':
+                continue
+            used.update(self._column_names(columns))
+        return [column for column in self.fitted_columns if column in used]
+
+    def _compile(self) -> bool:
+        numeric_columns, numeric_slots, means, scales = [], [], [], []
+        categorical_slots = {}
+        unknown_is_error = set()
+        offset = 0
+
+        for name, transformer, columns in self.preprocessor.transformers_:
+            if isinstance(transformer, str) and transformer == 'drop':
+                continue
+            columns = self._column_names(columns)
+
+            if isinstance(transformer, StandardScaler):
+                n = len(columns)
+                numeric_columns.extend(columns)
+                numeric_slots.extend(range(offset, offset + n))
+                # transform() skips centring / scaling that was switched off, even where mean_ was fitted
+                means.append(transformer.mean_ if transformer.with_mean and transformer.mean_ is not None
+                             else np.zeros(n))
+                scales.append(transformer.scale_ if transformer.with_std and transformer.scale_ is not None
+                              else np.ones(n))
+                offset += n
+            elif isinstance(transformer, OneHotEncoder) and transformer.drop_idx_ is None \
+                    and getattr(transformer, 'infrequent_categories_', None) is None:
+                for column, categories in zip(columns, transformer.categories_):
+                    categorical_slots[column] = {
+                        category: offset + i for i, category in enumerate(categories.tolist())
+                    }
+                    if transformer.handle_unknown == 'error':
+                        unknown_is_error.add(column)
+                    offset += len(categories)
+            else:
+                logger.info(f"Preprocessor step '{name}' is not compilable, using transform()")
+                return False
+
+        if offset != self.n_features:
+            return False
+
+        self.numeric_columns = numeric_columns
+        self.numeric_slots = np.asarray(numeric_slots, dtype=np.intp)
+        self.numeric_mean = np.concatenate(means) if means else np.zeros(0)
+        self.numeric_scale = np.concatenate(scales) if scales else np.ones(0)
+        self.categorical_slots = categorical_slots
+        self.unknown_is_error = unknown_is_error
+        return True
+
+    def encode_row(self, input_data: Dict) -> np.ndarray:
+        return self.encode_batch([input_data])
+
+    def encode_batch(self, rows: List[Dict]) -> np.ndarray:
+        if not rows:
+            return np.zeros((0, self.n_features), dtype=np.float32)
+
+        for column in self.input_columns:
+            if any(row.get(column) is None for row in rows):
+                raise ValueError(f"Missing required field: {column}")
+
+        if not self.compiled:
+            frame = pd.DataFrame.from_records(rows, columns=self.input_columns)
+            transformed = self.preprocessor.transform(frame)
+            if hasattr(transformed, "toarray"):
+                transformed = transformed.toarray()
+            return np.asarray(transformed, dtype=np.float32)
+
+        matrix = np.zeros((len(rows), self.n_features), dtype=np.float32)
+        if self.numeric_columns:
+            raw = np.array([[row[c] for c in self.numeric_columns] for row in rows], dtype=np.float64)
+            matrix[:, self.numeric_slots] = (raw - self.numeric_mean) / self.numeric_scale
+
+        row_index = np.arange(len(rows))
+        for column, slots in self.categorical_slots.items():
+            cols = np.array([slots.get(row[column], -1) for row in rows], dtype=np.intp)
+            if column in self.unknown_is_error and (cols < 0).any():
+                raise ValueError(f"Unknown category for field: {column}")
+            known = cols >= 0
+            matrix[row_index[known], cols[known]] = 1.0
+        return matrix
+
+
+class OnnxInputEncoder:
+    """
+    Encoder for ONNX graphs that include the preprocessing: requests become
+    one [n, 1] tensor per raw input column, and the graph scales and one-hot
+    encodes them itself.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.input_columns = model.input_columns
+        self.feature_names = model.input_columns
+        self.n_features = len(self.input_columns)
+
+    def encode_row(self, input_data: Dict) -> Dict[str, np.ndarray]:
+        return self.encode_batch([input_data])
+
+    def encode_batch(self, rows: List[Dict]) -> Dict[str, np.ndarray]:
+        for column in self.input_columns:
+            if any(row.get(column) is None for row in rows):
+                raise ValueError(f"Missing required field: {column}")
+        return self.model.feed(rows)
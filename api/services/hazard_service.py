@@ -0,0 +1,237 @@
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from fastapi import Request
+
+from api.models.schemas import HazardType
+from api.services.model_registry import ModelFile, ModelRegistry
+from src.config.hazard_config import HAZARD_CONFIGS
+from src.data.split_cache import file_digest
+from src.hazards.risk import classify_risk
+from src.hazards.spatial import SpatialIndex, city_places, load_places
+from src.utils import load_model_artifact
+
+logger = logging.getLogger(__name__)
+
+
+class HazardService:
+    """
+    Earthquake, flood and forest-fire models behind one cache.
+
+    Artifacts are the files get_hazard_artifact (or the older training
+    scripts) write, for example earthquake_model.pkl, found in model_dir
+    under the names in HAZARD_CONFIGS; timestamped copies resolve to the
+    newest like landslide models. Loading, LRU eviction and hot reload are handled by the same
+    ModelRegistry the landslide ModelService uses.
+
+    Spatial queries run over the hazard's prediction cities, scored by the
+    served model, or over a prediction output named after the hazard in
+    points_dir (for example a score_grid earthquake.parquet).
+    """
+
+    def __init__(
+        self,
+        model_dir: Optional[Path] = None,
+        max_cache_bytes: int = 512 * 1024 ** 2,
+        mmap_mode: Optional[str] = None,
+        points_dir: Optional[Path] = None,
+    ):
+        self.mmap_mode = mmap_mode
+        self.model_dir = Path(model_dir) if model_dir else Path(__file__).parent.parent / "hazard-models"
+        self.registry = ModelRegistry(self.model_dir, self._load_artifact, max_cache_bytes=max_cache_bytes)
+        self.points_dir = Path(points_dir) if points_dir else None
+        # hazard -> (source the index was built from, index)
+        self._indexes: Dict[str, Tuple[Any, SpatialIndex]] = {}
+        self._index_lock = threading.Lock()
+        # (lookup file, model file) -> whether the lookup was built from that model
+        self._lookup_checks: Dict[Tuple[ModelFile, ModelFile], bool] = {}
+
+    def _load_artifact(self, path: Path) -> Dict[str, Any]:
+        try:
+            return load_model_artifact(path, mmap_mode=self.mmap_mode)
+        except Exception as e:
+            logger.error(f"Error loading {path.stem}: {e}")
+            raise
+
+    def available(self) -> Dict[str, bool]:
+        """Whether the artifacts each hazard needs are present"""
+        names = set(self.registry.available())
+        available = {}
+        for hazard, config in HAZARD_CONFIGS.items():
+            # The forest-fire encoder is saved inside newer model artifacts
+            available[hazard] = config["model_name"] in names or config.get("lookup_name") in names
+        return available
+
+    def _get(self, name: str):
+        return self._get_artifact(name)["model"]
+
+    def _get_artifact(self, name: str) -> Dict[str, Any]:
+        try:
+            return self.registry.get(name)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Model {name} not found in {self.model_dir}")
+
+    def _get_model_and_encoder(self, config: Dict) -> Tuple[Any, Any]:
+        """Model with the encoder saved in its artifact, or in the separate encoder file of older models"""
+        artifact = self._get_artifact(config["model_name"])
+        encoder = artifact["preprocessor"]
+        if encoder is None:
+            encoder = self._get(config["encoder_name"])
+        return artifact["model"], encoder
+
+    def predict_batch(self, hazard: HazardType, rows: List[Dict]) -> Tuple[np.ndarray, np.ndarray, Dict[int, str]]:
+        """
+        Score validated rows with one model call.
+
+        Returns the raw predictions, risk level indices into the hazard's
+        risk_labels, and errors for rows that could not be scored; those rows
+        get NaN and -1.
+        """
+        config = HAZARD_CONFIGS[hazard.value]
+        predictions = np.full(len(rows), np.nan)
+        levels = np.full(len(rows), -1, dtype=np.int64)
+        errors: Dict[int, str] = {}
+        if not rows:
+            return predictions, levels, errors
+
+        if hazard is HazardType.forestfire:
+            return self._predict_forest_fire(config, rows, predictions, levels, errors)
+
+        model = self._get(config["model_name"])
+        # The request field for each model feature is its lower-case name
+        features = config["features"]
+        matrix = np.array([[row[feature.lower()] for feature in features] for row in rows], dtype=np.float64)
+        predictions = np.asarray(model.predict(pd.DataFrame(matrix, columns=features)), dtype=np.float64)
+        levels = classify_risk(hazard.value, predictions)
+        return predictions, levels, errors
+
+    def _state_lookup(self, config) -> Dict[str, int]:
+        """
+        The precomputed state table, if it was built from the model currently
+        served; empty when there is none or it is stale.
+
+        The table's metadata holds the SHA-256 of the model file it came from
+        (see save_state_lookup). A table without one, or from another model,
+        is ignored so every state goes through the model. With no model file
+        at all the table is the only source and is used as is.
+        """
+        lookup_file = self.registry.file(config["lookup_name"])
+        if lookup_file is None:
+            return {}
+        artifact = self._get_artifact(config["lookup_name"])
+        model_file = self.registry.file(config["model_name"])
+        if model_file is None:
+            return artifact["model"]
+
+        key = (lookup_file, model_file)
+        current = self._lookup_checks.get(key)
+        if current is None:
+            built_from = artifact["metadata"].get("model_digest")
+            current = built_from is not None and built_from == file_digest(model_file.path)
+            if not current:
+                logger.warning(
+                    f"{lookup_file.path.name} was not built from {model_file.path.name}; "
+                    f"predicting every state with the model. Rebuild it with build_forest_fire_lookup.py"
+                )
+            self._lookup_checks[key] = current
+        return artifact["model"] if current else {}
+
+    def _predict_forest_fire(self, config, rows, predictions, levels, errors):
+        """
+        Answer from the precomputed state table; only states missing from it
+        (or every state, if the table is missing or stale) go through the
+        encoder and model.
+        """
+        lookup = self._state_lookup(config)
+
+        fallback = []
+        for i, row in enumerate(rows):
+            level = lookup.get(row["state"])
+            if level is None:
+                fallback.append(i)
+            else:
+                predictions[i] = level
+                levels[i] = level
+        if not fallback:
+            return predictions, levels, errors
+
+        model, encoder = self._get_model_and_encoder(config)
+        known = set(encoder.categories_[0].tolist())
+        scored = []
+        for i in fallback:
+            if rows[i]["state"] in known:
+                scored.append(i)
+            else:
+                errors[i] = f"Unknown state: {rows[i]['state']}"
+        if scored:
+            states = pd.DataFrame({"State/UT": [rows[i]["state"] for i in scored]})
+            classes = model.predict(encoder.transform(states))
+            predictions[scored] = classes
+            levels[scored] = classes
+        return predictions, levels, errors
+
+    def _points_file(self, hazard: HazardType) -> Optional[Path]:
+        if self.points_dir is None:
+            return None
+        for suffix in (".parquet", ".feather", ".csv"):
+            path = self.points_dir / f"{hazard.value}{suffix}"
+            if path.exists():
+                return path
+        return None
+
+    def _index_source(self, hazard: HazardType):
+        """What the index depends on; a changed source means a rebuild"""
+        points = self._points_file(hazard)
+        if points is not None:
+            return points, points.stat().st_mtime_ns
+        config = HAZARD_CONFIGS[hazard.value]
+        names = [config["model_name"], config.get("encoder_name"), config.get("lookup_name")]
+        return tuple(self.registry.file(name) for name in names if name)
+
+    def spatial_index(self, hazard: HazardType) -> SpatialIndex:
+        """Index of scored places, built on first use and again after the models change"""
+        source = self._index_source(hazard)
+        with self._index_lock:
+            cached = self._indexes.get(hazard.value)
+            if cached is not None and cached[0] == source:
+                return cached[1]
+            index = SpatialIndex(self._scored_places(hazard))
+            self._indexes[hazard.value] = (source, index)
+            logger.info(f"Built {hazard.value} spatial index over {len(index)} places")
+            return index
+
+    def _scored_places(self, hazard: HazardType) -> pd.DataFrame:
+        points = self._points_file(hazard)
+        if points is not None:
+            return load_places(points)
+
+        places = city_places(hazard.value)
+        if hazard is HazardType.forestfire:
+            rows = [{"state": state} for state in places["State"]]
+        else:
+            features = HAZARD_CONFIGS[hazard.value]["features"]
+            rows = places[features].rename(columns=str.lower).to_dict("records")
+        predictions, levels, errors = self.predict_batch(hazard, rows)
+        for i, error in errors.items():
+            logger.warning(f"Leaving {places['Name'].iloc[i]} out of the {hazard.value} index: {error}")
+        places = places.assign(Prediction=predictions, Risk_Level=levels)
+        return places.loc[levels >= 0, ["Name", "State", "Latitude", "Longitude", "Prediction", "Risk_Level"]]
+
+    def risk_label(self, hazard: HazardType, level: int) -> Optional[str]:
+        if level < 0:
+            return None
+        return HAZARD_CONFIGS[hazard.value]["risk_labels"][level]
+
+    def predict(self, hazard: HazardType, row: Dict) -> Tuple[float, str]:
+        predictions, levels, errors = self.predict_batch(hazard, [row])
+        if errors:
+            raise ValueError(errors[0])
+        return float(predictions[0]), self.risk_label(hazard, int(levels[0]))
+
+
+def get_hazard_service(request: Request) -> HazardService:
+    return request.app.state.hazard_service
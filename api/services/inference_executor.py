@@ -0,0 +1,92 @@
+import asyncio
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, NamedTuple, Tuple
+
+from fastapi import Request
+
+logger = logging.getLogger(__name__)
+
+
+class QueueFullError(RuntimeError):
+    """Raised when the inference queue is at capacity."""
+
+
+class InferenceTiming(NamedTuple):
+    queue_wait_ms: float
+    execution_ms: float
+
+
+class InferenceExecutor:
+    """
+    Bounded thread pool that keeps model inference off the event loop.
+
+    Threads rather than processes: loaded models are large and would have to
+    be copied into every process, while sklearn, XGBoost and LightGBM release
+    the GIL inside predict. At most ``max_workers`` jobs run at once and at
+    most ``max_queue_depth`` more may wait; anything beyond that is rejected
+    immediately with QueueFullError instead of piling up behind slow requests.
+    """
+
+    def __init__(self, max_workers: int = 4, max_queue_depth: int = 64):
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        if max_queue_depth < 0:
+            raise ValueError("max_queue_depth must not be negative")
+        self.max_workers = max_workers
+        self.max_queue_depth = max_queue_depth
+        self.in_flight = 0  # only touched from the event loop thread
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="inference")
+
+    @classmethod
+    def from_env(cls) -> "InferenceExecutor":
+        """Build from INFERENCE_WORKERS / INFERENCE_QUEUE_DEPTH"""
+        max_workers = int(os.getenv("INFERENCE_WORKERS", min(4, os.cpu_count() or 1)))
+        max_queue_depth = int(os.getenv("INFERENCE_QUEUE_DEPTH", 64))
+        return cls(max_workers=max_workers, max_queue_depth=max_queue_depth)
+
+    @property
+    def capacity(self) -> int:
+        return self.max_workers + self.max_queue_depth
+
+    async def run(self, func: Callable[..., Any], *args) -> Tuple[Any, InferenceTiming]:
+        """Run func(*args) on the pool and return its result with queue/execution timings."""
+        if self.in_flight >= self.capacity:
+            raise QueueFullError(
+                f"Inference queue is full ({self.in_flight} requests in flight)"
+            )
+
+        self.in_flight += 1
+        submitted = time.perf_counter()
+
+        def job():
+            started = time.perf_counter()
+            result = func(*args)
+            return result, started, time.perf_counter()
+
+        try:
+            result, started, finished = await asyncio.wrap_future(self._executor.submit(job))
+        finally:
+            self.in_flight -= 1
+
+        timing = InferenceTiming(
+            queue_wait_ms=(started - submitted) * 1000,
+            execution_ms=(finished - started) * 1000,
+        )
+        return result, timing
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.max_workers,
+            "queue_depth": self.max_queue_depth,
+            "in_flight": self.in_flight,
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+
+
+def get_inference_executor(request: Request) -> InferenceExecutor:
+    return request.app.state.inference_executor
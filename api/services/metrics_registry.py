@@ -0,0 +1,68 @@
+import json
+import logging
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# save_model names artifacts "<model>_<YYYYmmdd>_<HHMMSS>"
+TIMESTAMP_SUFFIX = re.compile(r"_\d{8}_\d{6}$")
+# Compact and ONNX copies of "<model>" are saved as "<model>_compact" and "<model>_onnx"
+EXPORT_SUFFIX = re.compile(r"_(compact|onnx)$")
+
+
+class MetricsRegistry:
+    """
+    In-memory view of the metrics JSON written by run_pipeline.py.
+
+    The file is parsed once and re-read only when its mtime changes, so a
+    lookup on the request path costs a stat() and a dict access.
+    """
+
+    def __init__(self, metrics_path: str = "model_metrics.txt"):
+        self.metrics_path = Path(metrics_path)
+        self._metrics: Dict[str, Dict] = {}
+        self._mtime: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def _refresh(self):
+        try:
+            stat = os.stat(self.metrics_path)
+        except FileNotFoundError:
+            if self._mtime is not None:
+                logger.warning(f"Metrics file {self.metrics_path} disappeared")
+            self._metrics, self._mtime = {}, None
+            return
+
+        # Atomic replaces change the inode even within one mtime tick
+        mtime = (stat.st_mtime_ns, stat.st_ino, stat.st_size)
+        if mtime == self._mtime:
+            return
+        with self._lock:
+            if mtime == self._mtime:
+                return
+            try:
+                with open(self.metrics_path, "r") as file:
+                    metrics = json.load(file)
+            except (OSError, json.JSONDecodeError) as e:
+                logger.error(f"Could not read metrics file {self.metrics_path}: {e}")
+                return
+            self._metrics = metrics if isinstance(metrics, dict) else {}
+            self._mtime = mtime
+            logger.info(f"Loaded metrics for {len(self._metrics)} models from {self.metrics_path}")
+
+    def get(self, model_name: str) -> Optional[Dict]:
+        """
+        Metrics for a model, falling back from "xgboost_20250306_193033" to
+        "xgboost", and from a compact or ONNX copy to the model it was made from.
+        """
+        self._refresh()
+        metrics = self._metrics.get(model_name)
+        if metrics is None:
+            metrics = self._metrics.get(TIMESTAMP_SUFFIX.sub("", model_name))
+        if metrics is None:
+            metrics = self._metrics.get(EXPORT_SUFFIX.sub("", TIMESTAMP_SUFFIX.sub("", model_name)))
+        return metrics
@@ -0,0 +1,198 @@
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional
+
+from api.services.metrics_registry import TIMESTAMP_SUFFIX
+
+logger = logging.getLogger(__name__)
+
+
+class ModelFile(NamedTuple):
+    path: Path
+    size: int
+    mtime_ns: int
+
+
+class _CacheEntry(NamedTuple):
+    value: Any
+    size: int
+    mtime_ns: int
+
+
+class ModelRegistry:
+    """
+    Index of the model directory plus a memory-bounded LRU cache of loaded models.
+
+    - The directory is scanned once and rescanned by ``refresh()`` only when
+      its mtime changes (a file was added, removed or renamed into place).
+    - Every timestamped artifact "<base>_<YYYYmmdd>_<HHMMSS>" is also
+      reachable under "<base>", which resolves to the newest one.
+    - Pinned models (see ``preload``) are never evicted. Others are evicted
+      least-recently-used first once the summed artifact size exceeds
+      ``max_cache_bytes``; file size is used as the memory estimate.
+    - Reloads build the new model completely before swapping the cache
+      entry, so requests already holding the old one finish with it.
+
+    ``loader(path)`` turns an artifact path into whatever the caller caches.
+    """
+
+    def __init__(
+        self,
+        model_dir: Path,
+        loader: Callable[[Path], Any],
+        max_cache_bytes: int = 2 * 1024 ** 3,
+        pattern: str = "*.pkl",
+    ):
+        self.model_dir = Path(model_dir)
+        self.loader = loader
+        self.max_cache_bytes = max_cache_bytes
+        self.pattern = pattern
+
+        self._files: Dict[str, ModelFile] = {}
+        self._aliases: Dict[str, str] = {}
+        self._dir_mtime_ns: Optional[int] = None
+        self._cache: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._pinned: set = set()  # names or aliases requested for preload
+        self._warm: set = set()  # the artifact names they currently resolve to
+        self._lock = threading.RLock()
+        self._load_locks: Dict[str, threading.Lock] = {}
+        self.refresh()
+
+    # Index
+
+    def _scan(self) -> Dict[str, ModelFile]:
+        files = {}
+        for path in self.model_dir.glob(self.pattern):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            files[path.stem] = ModelFile(path, stat.st_size, stat.st_mtime_ns)
+        return files
+
+    @staticmethod
+    def _build_aliases(names: Iterable[str]) -> Dict[str, str]:
+        aliases = {}
+        # Timestamps sort lexicographically, so the last name wins per base
+        for name in sorted(names):
+            base = TIMESTAMP_SUFFIX.sub("", name)
+            if base != name:
+                aliases[base] = name
+        return aliases
+
+    def refresh(self) -> bool:
+        """Rescan the directory if it changed; reload pinned models that were replaced."""
+        try:
+            dir_mtime_ns = self.model_dir.stat().st_mtime_ns
+        except FileNotFoundError:
+            dir_mtime_ns = None
+        if dir_mtime_ns is not None and dir_mtime_ns == self._dir_mtime_ns:
+            return False
+
+        files = self._scan()
+        aliases = self._build_aliases(files)
+
+        # Warm anything pinned whose artifact is new or changed before it becomes visible
+        for name in self._pinned:
+            target = aliases.get(name, name)
+            entry = files.get(target)
+            cached = self._cache.get(target)
+            if entry is not None and (cached is None or cached.mtime_ns != entry.mtime_ns):
+                self._warm.add(target)
+                self._load(target, entry)
+
+        with self._lock:
+            added = files.keys() - self._files.keys()
+            removed = self._files.keys() - files.keys()
+            self._files, self._aliases = files, aliases
+            self._dir_mtime_ns = dir_mtime_ns
+            # Artifacts superseded by a newer pinned one become evictable
+            self._warm = {aliases.get(name, name) for name in self._pinned}
+            for name, entry in list(self._cache.items()):
+                # Dropped or replaced on disk; pinned replacements were reloaded above
+                if name not in files or files[name].mtime_ns != entry.mtime_ns:
+                    self._cache.pop(name)
+
+        if added or removed:
+            logger.info(f"Model index updated: +{sorted(added)} -{sorted(removed)}")
+        return True
+
+    def resolve(self, model_name: str) -> str:
+        if model_name in self._files:
+            return model_name
+        return self._aliases.get(model_name, model_name)
+
+    def file(self, model_name: str) -> Optional[ModelFile]:
+        """Index entry the name currently resolves to, None if it is not in the directory"""
+        return self._files.get(self.resolve(model_name))
+
+    def available(self) -> List[str]:
+        return sorted(self._files)
+
+    def loaded(self) -> List[str]:
+        return list(self._cache)
+
+    # Cache
+
+    def get(self, model_name: str) -> Any:
+        """Return the loaded model, loading (and possibly evicting others) on a miss."""
+        name = self.resolve(model_name)
+        with self._lock:
+            entry = self._cache.get(name)
+            if entry is not None:
+                self._cache.move_to_end(name)
+                return entry.value
+            model_file = self._files.get(name)
+
+        if model_file is None:
+            # May have been written since the last refresh
+            self.refresh()
+            name = self.resolve(model_name)
+            model_file = self._files.get(name)
+            if model_file is None:
+                raise FileNotFoundError(f"Model {model_name} not found")
+        return self._load(name, model_file)
+
+    def _load(self, name: str, model_file: ModelFile) -> Any:
+        with self._lock:
+            load_lock = self._load_locks.setdefault(name, threading.Lock())
+
+        with load_lock:
+            with self._lock:
+                entry = self._cache.get(name)
+                if entry is not None and entry.mtime_ns == model_file.mtime_ns:
+                    return entry.value
+
+            value = self.loader(model_file.path)
+            with self._lock:
+                self._cache[name] = _CacheEntry(value, model_file.size, model_file.mtime_ns)
+                self._cache.move_to_end(name)
+                self._evict()
+            logger.info(f"Loaded model: {name} ({model_file.size / 1024 ** 2:.1f} MB)")
+            return value
+
+    def _evict(self):
+        total = sum(entry.size for entry in self._cache.values())
+        for name in list(self._cache):
+            if total <= self.max_cache_bytes:
+                break
+            if name in self._warm:
+                continue
+            total -= self._cache.pop(name).size
+            logger.info(f"Evicted model from cache: {name}")
+
+    def preload(self, model_names: Iterable[str]):
+        """Load and pin models (names or base aliases such as "xgboost")."""
+        for model_name in model_names:
+            self._pinned.add(model_name)
+            self._warm.add(self.resolve(model_name))
+            try:
+                self.get(model_name)
+            except FileNotFoundError:
+                logger.warning(f"Cannot preload {model_name}: no such model")
+
+    def invalidate(self, model_name: str):
+        with self._lock:
+            self._cache.pop(self.resolve(model_name), None)
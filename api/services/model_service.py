@@ -1,18 +1,57 @@
-import joblib
 import numpy as np
-import pandas as pd
 from pathlib import Path
-from typing import List, Optional, Dict
+from typing import Any, Iterable, List, NamedTuple, Optional, Dict, Tuple
 import logging
 from fastapi import Depends, Request
+from api.services.batching import RequestCoalescer
+from api.services.feature_encoder import FeatureEncoder, OnnxInputEncoder, PreprocessorEncoder
+from api.services.inference_executor import InferenceExecutor, InferenceTiming
+from api.services.metrics_registry import MetricsRegistry, TIMESTAMP_SUFFIX
+from api.services.model_registry import ModelRegistry
+from src.inference.compiled_trees import CompiledEnsemble, HybridEnsemble, compile_model, max_abs_difference
+from src.inference.onnx_model import OnnxRegressor
+from src.utils import load_estimator, load_model_artifact, with_feature_names
 
 logger = logging.getLogger(__name__)
 
+class LoadedModel(NamedTuple):
+    model: Any
+    encoder: Any
+    backend: str = "native"
+
+    def predict(self, matrix) -> np.ndarray:
+        """Predict encoded rows; native estimators get them under their fitted column names"""
+        if self.backend == "native":
+            matrix = with_feature_names(self.model, matrix)
+        return self.model.predict(matrix)
+
 class ModelService:
-    def __init__(self):
-        self.models = {}  # Dictionary to cache loaded models
+    def __init__(
+        self,
+        model_dir: Optional[Path] = None,
+        batch_window_ms: float = 0.0,
+        max_batch_size: int = 64,
+        metrics_path: str = "model_metrics.txt",
+        max_cache_bytes: int = 2 * 1024 ** 3,
+        mmap_mode: Optional[str] = None,
+        compiled_models: Iterable[str] = (),
+        compiled_tolerance: float = 1e-4,
+        compiled_max_rows: int = 64,
+        onnx_threads: Optional[int] = None,
+    ):
+        self.mmap_mode = mmap_mode
+        # Model names (or base names such as "randomforest", or "all") served by
+        # the NumPy tree engine instead of the library's own predict
+        self.compiled_models = set(compiled_models)
+        self.compiled_tolerance = compiled_tolerance
+        self.compiled_max_rows = compiled_max_rows
+        # intra-op threads per onnxruntime session; None or 0 uses every core
+        self.onnx_threads = onnx_threads
+        self.model_dir = Path(model_dir) if model_dir else Path(__file__).parent.parent / "ml-models"
+        # Indexes model_dir once and keeps loaded models in a bounded LRU cache
+        self.registry = ModelRegistry(self.model_dir, self._load_artifact, max_cache_bytes=max_cache_bytes)
+        self.metrics = MetricsRegistry(metrics_path)
         self.current_model = None
-        self.model_dir = Path(__file__).parent.parent / "ml-models"
         self.feature_names = None
         self.current_model_type = None
         self.expected_features = [
@@ -26,86 +65,155 @@ class ModelService:
             'land_use_grassland', 'land_use_urban',
             'human_activity_high', 'human_activity_low', 'human_activity_medium'
         ]
+        # Merges concurrent single-row requests into batch predictions
+        self.coalescer = RequestCoalescer(
+            self._predict_rows, max_batch_size=max_batch_size, max_wait_ms=batch_window_ms
+        )
 
     def get_available_models(self) -> List[str]:
         """Get list of available model names"""
-        return [f.stem for f in self.model_dir.glob("*.pkl")]
-
-    def load_model(self, model_name: str):
-        """Load or get cached model"""
-        if model_name in self.models:
-            return self.models[model_name]
+        return self.registry.available()
 
-        model_path = self.model_dir / f"{model_name}.pkl"
-        if not model_path.exists():
-            raise FileNotFoundError(f"Model {model_name} not found")
+    def loaded_models(self) -> List[str]:
+        return self.registry.loaded()
 
+    def _load_artifact(self, model_path: Path) -> LoadedModel:
         try:
-            model = joblib.load(model_path)
-            self.models[model_name] = model
-            logger.info(f"Loaded model: {model_name}")
-            return model
+            # With mmap_mode the estimator stays pickled until the mapped arrays turn out unusable
+            artifact = load_model_artifact(model_path, mmap_mode=self.mmap_mode, load_model=not self.mmap_mode)
+            if artifact["model"] is None:
+                mapped = self._mapped(model_path.stem, artifact)
+                if mapped is not None:
+                    return LoadedModel(mapped, self._encoder(artifact, mapped), "mapped")
+                artifact["model"] = load_estimator(artifact)
+            model = artifact["model"]
+            if isinstance(model, OnnxRegressor):
+                # ONNX exports from export_onnx_models.py carry their preprocessing in the graph
+                model.start(self.onnx_threads)
+                if model.input_columns:
+                    encoder = OnnxInputEncoder(model)
+                else:
+                    encoder = FeatureEncoder.from_model(model, self.expected_features)
+                return LoadedModel(model, encoder, "onnx")
+            encoder = self._encoder(artifact, model)
+            if isinstance(model, CompiledEnsemble):
+                # Compact artifacts from export_compact_models.py are served as saved
+                return LoadedModel(model, encoder, "compact")
+            if self._wants_compiled(model_path.stem):
+                compiled = self._compile(model_path.stem, model)
+                if compiled is not None:
+                    return LoadedModel(compiled, encoder, "compiled")
+            return LoadedModel(model, encoder)
         except Exception as e:
-            logger.error(f"Error loading {model_name}: {e}")
+            logger.error(f"Error loading {model_path.stem}: {e}")
             raise
 
-    def precision(self, model_name: str) -> float:
+    def _wants_compiled(self, model_name: str) -> bool:
+        names = self.compiled_models
+        return "all" in names or model_name in names or TIMESTAMP_SUFFIX.sub("", model_name) in names
+
+    def _encoder(self, artifact: Dict, model):
+        if artifact["preprocessor"] is not None:
+            return PreprocessorEncoder(artifact["preprocessor"])
+        # Bare estimators from before preprocessors were saved
+        return FeatureEncoder.from_model(model, self.expected_features)
+
+    def _mapped(self, model_name: str, artifact: Dict) -> Optional[CompiledEnsemble]:
+        """
+        Serve from the node arrays save_model stored next to the pickled
+        estimator. They are memory-mapped from the artifact, so every worker
+        shares one copy through the page cache, and the estimator is never
+        unpickled. Native predict is kept when the arrays were not mapped or
+        save_model measured them off by more than compiled_tolerance.
+        """
+        if artifact.get("compiled") is None:
+            return None
+        ensemble = CompiledEnsemble.from_arrays(artifact["compiled"])
+        if not ensemble.is_memory_mapped:
+            logger.warning(f"Node arrays of {model_name} were not memory-mapped; serving natively")
+            return None
+        difference = artifact.get("compiled_difference", float("inf"))
+        if difference > self.compiled_tolerance:
+            logger.warning(
+                f"Mapped {model_name} differs from native predict by {difference:.3g}; serving natively"
+            )
+            return None
+        logger.info(f"Serving {model_name} from memory-mapped node arrays (max difference {difference:.3g})")
+        return ensemble
+
+    def _compile(self, model_name: str, model):
+        """
+        Compile a tree ensemble for small batches, keeping the native model if
+        it is unsupported or its outputs differ beyond compiled_tolerance
+        """
+        try:
+            compiled = compile_model(model)
+        except NotImplementedError as e:
+            logger.info(f"Serving {model_name} natively: {e}")
+            return None
+        difference = max_abs_difference(model, compiled)
+        if difference > self.compiled_tolerance:
+            logger.warning(
+                f"Compiled {model_name} differs from native predict by {difference:.3g}; serving natively"
+            )
+            return None
+        logger.info(f"Serving {model_name} with compiled trees (max difference {difference:.3g})")
+        return HybridEnsemble(model, compiled, self.compiled_max_rows)
+
+    def get_loaded(self, model_name: str) -> LoadedModel:
+        """Model and its encoder, taken together so a hot reload never mixes versions"""
+        return self.registry.get(model_name)
 
-        # Read the metrics data from the file
-        with open(r"C:\Users\Srish\Desktop\NatureWatch\model_metrics.txt", "r") as file:
-            metrics_data = eval(file.read())
+    def load_model(self, model_name: str):
+        """Load or get cached model"""
+        return self.get_loaded(model_name).model
 
-        if model_name in metrics_data:
-            return metrics_data[model_name].get('mse', 0.0)
-        else:
+    def precision(self, model_name: str) -> float:
+        metrics = self.metrics.get(model_name)
+        if metrics is None:
             logger.info(f"Model '{model_name}' not found in metrics file")
-        return 0.0
+            return 0.0
+        return metrics.get('mse', 0.0)
 
-    def _preprocess_input(self, input_data: Dict, model) -> pd.DataFrame:
-        # Convert input data to DataFrame
-        df = pd.DataFrame([input_data])
+    def get_encoder(self, model_name: str):
+        """Get the feature encoder built when the model was loaded"""
+        return self.get_loaded(model_name).encoder
 
-        # Get expected features from model
-        if hasattr(model, 'feature_names_in_'):
-            expected_features = model.feature_names_in_.tolist()
-        else:
-            expected_features = self.expected_features
-
-        # One-hot encode categorical variables
-        categorical_mappings = {
-            'lithology': ['basalt', 'granite', 'limestone', 'sandstone', 'shale'],
-            'land_use': ['agriculture', 'barren', 'forest', 'grassland', 'urban'],
-            'human_activity': ['high', 'low', 'medium']
-        }
-
-        for field, categories in categorical_mappings.items():
-            value = input_data.get(field)
-            if not value:
-                raise ValueError(f"Missing required field: {field}")
-
-            for category in categories:
-                df[f"{field}_{category}"] = 1 if value == category else 0
-
-        # Add missing features with 0 values
-        for feature in expected_features:
-            if feature not in df.columns:
-                df[feature] = 0
-
-        # Keep only expected features and order them
-        return df[expected_features]
+    def predict_batch(self, model_name: str, rows: List[Dict]) -> np.ndarray:
+        """Score many sites with a single model call, preserving input order"""
+        if not rows:
+            return np.empty(0, dtype=np.float64)
+        try:
+            loaded = self.get_loaded(model_name)
+            matrix = loaded.encoder.encode_batch(rows)
+            predictions = loaded.predict(matrix)
+            return np.clip(np.asarray(predictions, dtype=np.float64), 0, 1)
+        except Exception as e:
+            logger.exception("Batch prediction failed with error:")
+            raise
 
     def predict(self, model_name: str, input_data: Dict) -> float:
         """Make prediction with specified model"""
         try:
-            model = self.load_model(model_name)
-            processed_data = self._preprocess_input(input_data, model)
-            logger.info(f"Processed data columns: {processed_data.columns.tolist()}")
-            prediction = model.predict(processed_data)
+            loaded = self.get_loaded(model_name)
+            row = loaded.encoder.encode_row(input_data)
+            prediction = loaded.predict(row)
             return float(np.clip(prediction[0], 0, 1))
         except Exception as e:
             logger.exception("Prediction failed with error:")  # Log full traceback
             raise
 
+    def _predict_rows(self, model_name: str, rows: List[Dict]) -> List[Tuple[float, float]]:
+        predictions = self.predict_batch(model_name, rows)
+        variability = self.precision(model_name)
+        return [(prediction, variability) for prediction in predictions.tolist()]
+
+    async def predict_coalesced(
+        self, model_name: str, input_data: Dict, executor: InferenceExecutor
+    ) -> Tuple[Tuple[float, float], InferenceTiming]:
+        """Predict one row as part of a micro-batch; returns (prediction, variability) and timings"""
+        return await self.coalescer.submit(model_name, input_data, executor)
+
     def prediction_variability(self, model_name: str) -> float:
         try:
             variability = self.precision(model_name)
@@ -0,0 +1,74 @@
+"""
+Compiled NumPy tree engine vs each library's own predict.
+
+Usage:
+    python benchmarks/bench_compiled_trees.py [--model ml-models/randomforest_....pkl ...]
+
+Without --model, RandomForest / XGBoost / LightGBM regressors are trained on
+synthetic data with the MODEL_CONFIGS hyperparameters. For every model the
+maximum absolute prediction difference is printed next to per-call latency
+at several batch sizes.
+"""
+import argparse
+import os
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.config.model_config import MODEL_CONFIGS
+from src.inference.compiled_trees import compile_model, max_abs_difference
+from src.utils import load_model_artifact
+
+BATCH_SIZES = [1, 16, 256, 4096]
+
+
+def synthetic_models(n_rows=5000, n_features=26):
+    from lightgbm import LGBMRegressor
+    from sklearn.ensemble import RandomForestRegressor
+    from xgboost import XGBRegressor
+
+    rng = np.random.default_rng(42)
+    X = rng.normal(size=(n_rows, n_features))
+    y = X[:, 0] - 0.5 * X[:, 1] ** 2 + rng.normal(0, 0.1, n_rows)
+    models = {
+        "randomforest": RandomForestRegressor(**MODEL_CONFIGS["randomforest"]).fit(X, y),
+        "xgboost": XGBRegressor(**MODEL_CONFIGS["xgboost"]).fit(X, y),
+        "lightgbm": LGBMRegressor(**MODEL_CONFIGS["lightgbm"], verbose=-1).fit(X, y),
+    }
+    return models, X
+
+
+def time_call(func, X, number):
+    return timeit.timeit(lambda: func(X), number=number) / number * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark compiled tree inference")
+    parser.add_argument("--model", nargs="*", default=None, help="Saved artifacts to benchmark")
+    parser.add_argument("--number", type=int, default=20, help="Calls per measurement")
+    args = parser.parse_args()
+
+    if args.model:
+        models = {os.path.basename(p): load_model_artifact(p)["model"] for p in args.model}
+        X = None
+    else:
+        models, X = synthetic_models()
+
+    for name, model in models.items():
+        compiled = compile_model(model)
+        data = X if X is not None else compiled.probe_inputs(max(BATCH_SIZES))
+        print(f"\n{name}: {compiled.n_trees} trees, depth {compiled.max_depth}, "
+              f"max |native - compiled| = {max_abs_difference(model, compiled, data):.3g}")
+        print(f"{'rows':>6} {'native us':>12} {'compiled us':>12} {'speedup':>8}")
+        for rows in BATCH_SIZES:
+            batch = np.ascontiguousarray(np.resize(data, (rows, data.shape[1])), dtype=compiled.input_dtype)
+            native = time_call(model.predict, batch, args.number)
+            fast = time_call(compiled.predict, batch, args.number)
+            print(f"{rows:>6} {native:>12.0f} {fast:>12.0f} {native / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
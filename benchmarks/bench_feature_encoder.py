@@ -0,0 +1,83 @@
+"""
+Per-request encoding latency: FeatureEncoder vs the previous pandas path.
+
+Usage:
+    python benchmarks/bench_feature_encoder.py [--model ml-models/xgboost_....pkl]
+
+Without --model only the encoding step is timed; with a model the full
+encode + predict round trip is timed as well, plus the saved-preprocessor
+encoder when the artifact carries one.
+"""
+import argparse
+import os
+import sys
+import timeit
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.services.feature_encoder import CATEGORICAL_MAPPINGS, FeatureEncoder, PreprocessorEncoder
+from api.services.model_service import LoadedModel, ModelService
+from src.utils import load_model_artifact
+
+SAMPLE_INPUT = {
+    'elevation': 1250.0, 'slope': 32.5, 'aspect': 180.0, 'rainfall_daily': 85.0,
+    'rainfall_monthly': 640.0, 'distance_to_faults': 3.2, 'soil_depth': 2.1,
+    'vegetation_density': 0.45, 'earthquake_magnitude': 4.1, 'soil_moisture': 62.0,
+    'previous_landslides': 2, 'snow_melt': 0.0, 'landslide_probability': 0.3,
+    'lithology': 'shale', 'land_use': 'forest', 'human_activity': 'medium'
+}
+
+
+def legacy_preprocess(input_data, expected_features):
+    """The per-request DataFrame encoding that FeatureEncoder replaced."""
+    df = pd.DataFrame([input_data])
+    for field, categories in CATEGORICAL_MAPPINGS.items():
+        value = input_data.get(field)
+        for category in categories:
+            df[f"{field}_{category}"] = 1 if value == category else 0
+    for feature in expected_features:
+        if feature not in df.columns:
+            df[feature] = 0
+    return df[expected_features]
+
+
+def report(label, seconds, number):
+    print(f"{label:<32} {seconds / number * 1e6:10.1f} us/request")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark request feature encoding")
+    parser.add_argument("--model", type=str, default=None, help="Optional .pkl model to include predict()")
+    parser.add_argument("--number", type=int, default=2000, help="Requests per measurement")
+    args = parser.parse_args()
+
+    artifact = load_model_artifact(args.model) if args.model else None
+    model = artifact["model"] if artifact else None
+    features = ModelService().expected_features
+    if model is not None and hasattr(model, 'feature_names_in_'):
+        features = model.feature_names_in_.tolist()
+    encoder = FeatureEncoder(features)
+
+    report("legacy DataFrame encode", timeit.timeit(
+        lambda: legacy_preprocess(SAMPLE_INPUT, features), number=args.number), args.number)
+    report("FeatureEncoder.encode_row", timeit.timeit(
+        lambda: encoder.encode_row(SAMPLE_INPUT), number=args.number), args.number)
+    serving_encoder = encoder
+    if artifact is not None and artifact["preprocessor"] is not None:
+        serving_encoder = PreprocessorEncoder(artifact["preprocessor"])
+        report("PreprocessorEncoder.encode_row", timeit.timeit(
+            lambda: serving_encoder.encode_row(SAMPLE_INPUT), number=args.number), args.number)
+
+    if model is not None:
+        # As served: LoadedModel hands native estimators the rows under their fitted column names
+        loaded = LoadedModel(model, serving_encoder)
+        report("legacy encode + predict", timeit.timeit(
+            lambda: model.predict(legacy_preprocess(SAMPLE_INPUT, features)), number=args.number), args.number)
+        report("encode_row + LoadedModel.predict", timeit.timeit(
+            lambda: loaded.predict(serving_encoder.encode_row(SAMPLE_INPUT)), number=args.number), args.number)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Load time and peak memory of IngestData for CSV, Parquet and Arrow/Feather.
+
+Usage:
+    python benchmarks/bench_ingestion.py [--csv datasets/main_dataset.csv] [--repeat 50]
+
+The CSV is converted to Parquet and Feather in a temporary directory. Each
+format is then loaded in a fresh subprocess (so peak RSS is not polluted by
+earlier runs), once with all columns and once projected to --columns.
+Peak memory is the largest growth of resident memory during the load,
+sampled every millisecond (Linux only, as it reads /proc/self/statm).
+Pages of a memory-mapped file count once touched, but are shared
+through the page cache rather than private to the process.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from convert_datasets import convert
+
+CHILD = """
+import json, resource, sys, threading, time
+sys.path.insert(0, {root!r})
+from src.data.data_loader import IngestData
+
+def rss_mb():
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * resource.getpagesize() / 1024 ** 2
+
+# ru_maxrss already holds import-time peaks, so sample resident memory instead
+peak, done = [rss_mb()], threading.Event()
+def sample():
+    while not done.is_set():
+        peak[0] = max(peak[0], rss_mb())
+        time.sleep(0.001)
+
+path, columns = sys.argv[1], json.loads(sys.argv[2])
+baseline = peak[0]
+sampler = threading.Thread(target=sample, daemon=True)
+sampler.start()
+start = time.perf_counter()
+data = IngestData(path, columns).get_data()
+elapsed = time.perf_counter() - start
+# Touch every value so memory-mapped columns are actually read
+data.select_dtypes("number").sum()
+done.set()
+sampler.join()
+peak[0] = max(peak[0], rss_mb())
+print(json.dumps({{"seconds": elapsed, "peak_mb": peak[0] - baseline, "rows": len(data)}}))
+"""
+
+
+def measure(path, columns, repeat):
+    runs = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", CHILD.format(root=ROOT), path, json.dumps(columns)],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        runs.append(json.loads(output.strip().splitlines()[-1]))
+    best = min(runs, key=lambda run: run["seconds"])
+    return best["seconds"], max(run["peak_mb"] for run in runs), best["rows"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--csv", default="datasets/main_dataset.csv")
+    parser.add_argument("--columns", nargs="*", default=None,
+                        help="Columns for the projection run (default: first five)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    header = pd.read_csv(args.csv, nrows=0).columns.tolist()
+    projected = args.columns or header[:5]
+
+    with tempfile.TemporaryDirectory() as directory:
+        convert(args.csv, ["parquet", "feather"], directory)
+        stem = os.path.splitext(os.path.basename(args.csv))[0]
+        paths = {
+            "csv": args.csv,
+            "parquet": os.path.join(directory, f"{stem}.parquet"),
+            "feather (mmap)": os.path.join(directory, f"{stem}.feather"),
+        }
+        print(f"{'format':<16} {'columns':>8} {'size MB':>8} {'load ms':>9} {'peak MB':>8}")
+        for name, path in paths.items():
+            size_mb = os.path.getsize(path) / 1024 ** 2
+            for label, columns in (("all", None), (str(len(projected)), projected)):
+                seconds, peak_mb, rows = measure(path, columns, args.repeat)
+                print(f"{name:<16} {label:>8} {size_mb:>8.1f} {seconds * 1000:>9.1f} {peak_mb:>8.1f}")
+        print(f"({rows:,} rows, best load time and worst peak over {args.repeat} runs)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+ONNX Runtime vs the native serving path, preprocessing included.
+
+Usage:
+    python benchmarks/bench_onnx_runtime.py --model ml-models/randomforest_....pkl [...] \
+        [--data datasets/main_dataset.csv] [--threads 1 0]
+
+Each artifact is converted with convert_to_onnx. The native path is what
+ModelService runs without ONNX (PreprocessorEncoder.encode_batch followed by
+model.predict); the ONNX path is OnnxInputEncoder.encode_batch followed by
+one session run. Request rows are the test split mapped back to raw inputs.
+For every model the maximum absolute prediction difference is printed next
+to per-call latency and throughput at several batch sizes, once per
+intra-op thread setting (0 lets onnxruntime use every core).
+"""
+import argparse
+import os
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.services.feature_encoder import OnnxInputEncoder, PreprocessorEncoder
+from run_pipeline import prepare_data
+from src.inference.onnx_model import convert_to_onnx, raw_inputs
+from src.utils import load_model_artifact, with_feature_names
+
+BATCH_SIZES = [1, 16, 256, 4096]
+
+
+def time_call(func, rows, number):
+    return timeit.timeit(lambda: func(rows), number=number) / number * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark onnxruntime inference against native predict")
+    parser.add_argument("--model", nargs="+", required=True, help="Saved artifacts with a preprocessor")
+    parser.add_argument("--data", type=str, default="datasets/main_dataset.csv",
+                        help="Training data the models were fitted on, for request rows")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 0], help="intra-op thread settings")
+    parser.add_argument("--number", type=int, default=20, help="Calls per measurement")
+    args = parser.parse_args()
+
+    _, x_test, _, _, _ = prepare_data(args.data)
+    for path in args.model:
+        artifact = load_model_artifact(path)
+        model, preprocessor = artifact["model"], artifact["preprocessor"]
+        if preprocessor is None:
+            print(f"\n{os.path.basename(path)}: no saved preprocessor, skipped")
+            continue
+        raw = raw_inputs(preprocessor, x_test)
+        rows = raw.sample(max(BATCH_SIZES), replace=True, random_state=0).to_dict("records")
+
+        native_encoder = PreprocessorEncoder(preprocessor)
+        onnx_model = convert_to_onnx(model, preprocessor)
+        onnx_encoder = OnnxInputEncoder(onnx_model)
+
+        def native(batch):
+            return model.predict(with_feature_names(model, native_encoder.encode_batch(batch)))
+
+        def onnx(batch):
+            return onnx_model.predict(onnx_encoder.encode_batch(batch))
+
+        onnx_model.start(args.threads[0])
+        difference = np.max(np.abs(native(rows) - onnx(rows)))
+        print(f"\n{os.path.basename(path)} ({type(model).__name__}): max |native - onnx| = {difference:.3g}")
+        for threads in args.threads:
+            onnx_model.start(threads)
+            print(f"intra-op threads: {threads or 'all'}")
+            print(f"{'rows':>6} {'native us':>12} {'onnx us':>12} {'speedup':>8} {'onnx rows/s':>12}")
+            for size in BATCH_SIZES:
+                batch = rows[:size]
+                number = max(1, args.number * 16 // size)
+                native_us = time_call(native, batch, number)
+                onnx_us = time_call(onnx, batch, number)
+                print(f"{size:>6} {native_us:>12.0f} {onnx_us:>12.0f} {native_us / onnx_us:>7.1f}x "
+                      f"{size / onnx_us * 1e6:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
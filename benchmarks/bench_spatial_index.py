@@ -0,0 +1,81 @@
+"""
+SpatialIndex build time and per-query latency.
+
+Usage:
+    python benchmarks/bench_spatial_index.py [--points 1000000] [--places grid.parquet]
+
+Without --places, random scored points are spread over India's bounding
+box. Each query type runs at random centres and reports the median and
+99th percentile latency of the lookup alone and with the hits turned into
+records, as the API returns them.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.hazards.spatial import SpatialIndex, load_places
+
+
+def synthetic_places(n_points, seed=42):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "Latitude": rng.uniform(6.0, 37.0, n_points),
+        "Longitude": rng.uniform(68.0, 98.0, n_points),
+        "Prediction": rng.uniform(2.0, 6.0, n_points).astype(np.float32),
+        "Risk_Level": rng.integers(0, 3, n_points).astype(np.int8),
+    })
+
+
+def time_queries(index, query, centres):
+    lookups, with_records = [], []
+    hits = 0
+    for lat, lon in centres:
+        start = time.perf_counter()
+        result = query(lat, lon)
+        looked_up = time.perf_counter()
+        records = index.records(*result) if isinstance(result, tuple) else index.records(result)
+        with_records.append(time.perf_counter() - start)
+        lookups.append(looked_up - start)
+        hits += len(records)
+    lookups, with_records = np.array(lookups) * 1e3, np.array(with_records) * 1e3
+    return (np.median(lookups), np.percentile(lookups, 99),
+            np.median(with_records), np.percentile(with_records, 99), hits / len(centres))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark spatial index queries")
+    parser.add_argument("--points", type=int, default=1_000_000, help="Synthetic points to index")
+    parser.add_argument("--places", type=str, default=None, help="Scored places file to index instead")
+    parser.add_argument("--queries", type=int, default=1000, help="Queries per measurement")
+    args = parser.parse_args()
+
+    places = load_places(args.places) if args.places else synthetic_places(args.points)
+    start = time.perf_counter()
+    index = SpatialIndex(places)
+    print(f"Built index over {len(index):,} points in {time.perf_counter() - start:.2f}s")
+
+    rng = np.random.default_rng(0)
+    centres = np.column_stack([rng.uniform(8.0, 35.0, args.queries), rng.uniform(70.0, 96.0, args.queries)])
+    queries = {
+        "nearest k=1": lambda lat, lon: index.nearest(lat, lon, 1),
+        "nearest k=10": lambda lat, lon: index.nearest(lat, lon, 10),
+        "nearest k=10, High only": lambda lat, lon: index.nearest(lat, lon, 10, min_level=2),
+        "radius 5 km": lambda lat, lon: index.within_radius(lat, lon, 5),
+        "radius 50 km, High only": lambda lat, lon: index.within_radius(lat, lon, 50, min_level=2),
+        "bbox 0.1 deg": lambda lat, lon: index.within_bbox(lat, lat + 0.1, lon, lon + 0.1),
+        "bbox 1 deg": lambda lat, lon: index.within_bbox(lat, lat + 1, lon, lon + 1),
+    }
+    print(f"{'query':<26}{'median ms':>11}{'p99 ms':>9}{'+records':>10}{'p99 ms':>9}{'mean hits':>11}")
+    for name, query in queries.items():
+        median, p99, records_median, records_p99, hits = time_queries(index, query, centres)
+        print(f"{name:<26}{median:>11.3f}{p99:>9.3f}{records_median:>10.3f}{records_p99:>9.3f}{hits:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
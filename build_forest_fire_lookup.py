@@ -0,0 +1,20 @@
+import argparse
+from src.config.logging_config import setup_logging
+from src.hazards.lookup import save_state_lookup
+from src.hazards.risk import load_hazard_encoder, load_hazard_model
+
+logger = setup_logging()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Precompute the forest-fire risk level of every known state")
+    parser.add_argument("--model", type=str, default="hazard-models/forest_fire_model.pkl",
+                        help="Trained forest-fire classifier")
+    parser.add_argument("--encoder", type=str, default=None,
+                        help="State one-hot encoder, for models saved without one")
+    parser.add_argument("--output", type=str, default="hazard-models/forest_fire_lookup.pkl",
+                        help="Where to write the lookup table")
+    args = parser.parse_args()
+
+    model = load_hazard_model(args.model)
+    path = save_state_lookup(model, load_hazard_encoder(args.model, args.encoder), args.model, args.output)
+    logger.info(f"Saved state risk levels from {args.model} to {path}")
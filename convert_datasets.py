@@ -0,0 +1,66 @@
+import argparse
+import glob
+import os
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+from src.config.logging_config import setup_logging
+
+logger = setup_logging()
+
+DEFAULT_INPUTS = [
+    "datasets/*.csv",
+    "Disaster Prediction ML Model/Dataset/*.csv",
+]
+
+
+def to_arrow(data: pd.DataFrame) -> pa.Table:
+    try:
+        return pa.Table.from_pandas(data, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Columns mixing numbers and strings are stored as strings
+        mixed = [c for c in data.columns if data[c].dtype == object]
+        return pa.Table.from_pandas(data.astype({c: str for c in mixed}), preserve_index=False)
+
+
+def convert(csv_path: str, formats, output_dir=None):
+    data = pd.read_csv(csv_path, low_memory=False)
+    table = to_arrow(data)
+    stem = os.path.splitext(os.path.basename(csv_path))[0]
+    directory = output_dir or os.path.dirname(csv_path)
+    os.makedirs(directory, exist_ok=True)
+
+    for fmt in formats:
+        if fmt == "parquet":
+            path = os.path.join(directory, f"{stem}.parquet")
+            pq.write_table(table, path)
+        else:
+            path = os.path.join(directory, f"{stem}.feather")
+            # Uncompressed so readers can memory-map the columns directly
+            feather.write_feather(table, path, compression="uncompressed")
+        logger.info(
+            f"{csv_path} -> {path} ({os.path.getsize(csv_path) / 1024 ** 2:.1f} MB -> "
+            f"{os.path.getsize(path) / 1024 ** 2:.1f} MB)"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert CSV datasets to Parquet and Arrow/Feather")
+    parser.add_argument("inputs", nargs="*", default=DEFAULT_INPUTS,
+                        help="CSV files or glob patterns (default: the repo's datasets)")
+    parser.add_argument("--format", type=str, default="both", choices=["parquet", "feather", "both"],
+                        help="Output format")
+    parser.add_argument("--output-dir", type=str, default=None,
+                        help="Directory for converted files (default: next to each CSV)")
+    args = parser.parse_args()
+
+    formats = ["parquet", "feather"] if args.format == "both" else [args.format]
+    paths = sorted({path for pattern in args.inputs for path in glob.glob(pattern)})
+    if not paths:
+        logger.warning("No CSV files matched")
+    for path in paths:
+        try:
+            convert(path, formats, args.output_dir)
+        except Exception as e:
+            logger.error(f"Error converting {path}: {str(e)}")
@@ -0,0 +1,31 @@
+import argparse
+from run_pipeline import prepare_data
+from src.config.logging_config import setup_logging
+from src.inference.compact import export_compact
+
+logger = setup_logging()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Save float32 / quantized copies of trained tree models and report their drift on the test split"
+    )
+    parser.add_argument("--model", nargs="+", required=True, help="Artifacts saved by run_pipeline.py")
+    parser.add_argument("--value-bits", type=int, default=None, choices=[8, 16],
+                        help="Quantize leaf values to this many bits (default: float32)")
+    parser.add_argument("--max-drift", type=float, default=1e-4,
+                        help="Do not save a compact model whose worst-case test prediction drift exceeds this "
+                             "(8-bit boosted models can drift by 0.01 or more; pass inf to save regardless)")
+    parser.add_argument("--output-dir", type=str, default=None,
+                        help="Directory for the compact artifacts (default: next to each model)")
+    parser.add_argument("--data", type=str, default="datasets/main_dataset.csv",
+                        help="Training data the models were fitted on, for the held-out test split")
+    parser.add_argument("--cache-dir", type=str, default=".cache/splits",
+                        help="Directory of cached preprocessed splits (empty string disables the cache)")
+    args = parser.parse_args()
+
+    _, x_test, _, _, _ = prepare_data(args.data, cache_dir=args.cache_dir or None)
+    for model_path in args.model:
+        try:
+            export_compact(model_path, x_test, args.value_bits, args.output_dir, args.max_drift)
+        except (NotImplementedError, ValueError) as e:
+            logger.warning(f"Skipping {model_path}: {e}")
@@ -0,0 +1,27 @@
+import argparse
+from src.config.logging_config import setup_logging
+from src.hazards.spatial import load_places
+from src.hazards.tiles import export_tiles, write_viewer
+
+logger = setup_logging()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tile scored places (e.g. a score_grid output) for the map viewer")
+    parser.add_argument("--hazard", required=True, choices=["earthquake", "flood", "forestfire"])
+    parser.add_argument("--places", type=str, required=True,
+                        help="Prediction output with Latitude, Longitude and Risk_Level (.csv, .parquet or .feather)")
+    parser.add_argument("--output", type=str, required=True, help="Tile directory")
+    parser.add_argument("--min-zoom", type=int, default=3)
+    parser.add_argument("--max-zoom", type=int, default=10, help="Zoom at which every place is drawn on its own")
+    parser.add_argument("--cluster-px", type=int, default=32, help="Pixel size of the clusters below --max-zoom")
+    parser.add_argument("--viewer", type=str, default=None, help="Also write a map page here")
+    parser.add_argument("--tiles-url", type=str, default=None,
+                        help="Tile directory as the page sees it (default: --output relative to the page)")
+    args = parser.parse_args()
+
+    places = load_places(args.places)
+    export_tiles(places, args.hazard, args.output, args.min_zoom, args.max_zoom, args.cluster_px)
+    if args.viewer:
+        import os
+        tiles_url = args.tiles_url or os.path.relpath(args.output, os.path.dirname(os.path.abspath(args.viewer)))
+        write_viewer(args.viewer, tiles_url.replace(os.sep, "/"), title=f"{args.hazard} risk map")
@@ -0,0 +1,28 @@
+import argparse
+from run_pipeline import prepare_data
+from src.config.logging_config import setup_logging
+from src.inference.onnx_model import export_onnx_artifact
+
+logger = setup_logging()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Convert trained models and their preprocessing to ONNX, checking parity on the test split"
+    )
+    parser.add_argument("--model", nargs="+", required=True, help="Artifacts saved by run_pipeline.py")
+    parser.add_argument("--max-drift", type=float, default=1e-4,
+                        help="Do not save an ONNX model whose worst-case test prediction drift exceeds this")
+    parser.add_argument("--output-dir", type=str, default=None,
+                        help="Directory for the ONNX artifacts (default: next to each model)")
+    parser.add_argument("--data", type=str, default="datasets/main_dataset.csv",
+                        help="Training data the models were fitted on, for the held-out test split")
+    parser.add_argument("--cache-dir", type=str, default=".cache/splits",
+                        help="Directory of cached preprocessed splits (empty string disables the cache)")
+    args = parser.parse_args()
+
+    _, x_test, _, _, _ = prepare_data(args.data, cache_dir=args.cache_dir or None)
+    for model_path in args.model:
+        try:
+            export_onnx_artifact(model_path, x_test, args.output_dir, args.max_drift)
+        except Exception as e:
+            logger.warning(f"Skipping {model_path}: {e}")
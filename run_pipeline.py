@@ -1,12 +1,16 @@
 import argparse
 from src.config.logging_config import setup_logging
 from src.config.model_config import ModelNameConfig, MODEL_CONFIGS
-from src.data.data_loader import ingest_data, clean_data
+from src.data.data_loader import load_splits
 from src.train import train_model
+from src.optimize.tuner import PRUNERS
 from src.evaluation import MSE, R2Score, RMSE
-from src.utils import check_data, save_model
+from src.data.shared_data import share_splits, load_shared_splits
+from src.utils import check_data
+from concurrent.futures import ProcessPoolExecutor
 import json
 import os
+import tempfile
 
 
 logger = setup_logging()
@@ -38,9 +42,17 @@ def save_metrics_to_file(results, file_path="model_metrics.txt"):
             except json.JSONDecodeError:
                 logger.warning(f"Existing metrics file was not valid JSON. Creating new file.")
 
-        # Write metrics to file
-        with open(file_path, "w") as file:
-            file.write(json.dumps(metrics_dict, indent=4))
+        # Write to a temporary file and rename it into place, so the API's
+        # metrics registry never reads a half-written file
+        directory = os.path.dirname(os.path.abspath(file_path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".model_metrics.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as file:
+                file.write(json.dumps(metrics_dict, indent=4))
+            os.replace(tmp_path, file_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
 
         logger.info(f"Model metrics saved successfully to {file_path}")
 
@@ -49,26 +61,40 @@ def save_metrics_to_file(results, file_path="model_metrics.txt"):
         logger.exception("Traceback:")
 
 
-def model_evaluation(model_name, fine_tuning):
-    try:
-        # Load and preprocess data
-        logger.info("Loading and preprocessing data...")
-        raw_data = ingest_data("datasets/main_dataset.csv")
+def prepare_data(data_path="datasets/main_dataset.csv", cache_dir=".cache/splits", chunksize=None):
+    """
+    Ingest and preprocess the dataset once; returns the splits and the fitted preprocessor.
+
+    Splits are cached in cache_dir keyed by the file's contents and the
+    preprocessing config, so repeated runs on unchanged data skip ingestion.
+    With chunksize the file is streamed in chunks of that many rows.
+    """
+    logger.info("Loading and preprocessing data...")
+    x_train, x_test, y_train, y_test, preprocessor = load_splits(data_path, cache_dir, chunksize)
 
-        # Print raw data info
-        logger.info(f"Raw data shape: {raw_data.shape}")
-        logger.info(f"Raw data columns: {raw_data.columns.tolist()}")
-        logger.info(f"Raw data types:\n{raw_data.dtypes}")
+    # Check data for issues
+    check_data(x_train, y_train, "training")
+    check_data(x_test, y_test, "testing")
+    return x_train, x_test, y_train, y_test, preprocessor
 
-        x_train, x_test, y_train, y_test = clean_data(raw_data)
 
-        # Check data for issues
-        check_data(x_train, y_train, "training")
-        check_data(x_test, y_test, "testing")
+def export_onnx_model(model_name, trained_model, preprocessor, x_test):
+    """Save an ONNX copy of a freshly trained model; a failed export is logged, not raised."""
+    try:
+        from src.inference.onnx_model import export_onnx
+        export_onnx(trained_model, preprocessor, model_name, x_test)
+    except Exception as e:
+        logger.error(f"ONNX export failed for {model_name}: {str(e)}")
+
 
+def train_and_evaluate(model_name, fine_tuning, x_train, x_test, y_train, y_test, preprocessor,
+                       n_jobs=None, tuning=None, onnx=False):
+    try:
         # Set up model configuration
         logger.info(f"Setting up {model_name} model with fine_tuning={fine_tuning}")
-        model_config = ModelNameConfig(model_name=model_name, fine_tuning=fine_tuning)
+        model_config = ModelNameConfig(
+            model_name=model_name, fine_tuning=fine_tuning, n_jobs=n_jobs, **(tuning or {})
+        )
 
         # Log the hyperparameters being used from MODEL_CONFIGS
         if model_name in MODEL_CONFIGS:
@@ -78,10 +104,8 @@ def model_evaluation(model_name, fine_tuning):
 
         # Train the model
         logger.info("Training the model...")
-        trained_model = train_model(x_train, x_test, y_train, y_test, model_config)
-
-        # Save the model
-        save_model(trained_model, model_name)
+        # The model is saved by train_model together with its preprocessor
+        trained_model = train_model(x_train, x_test, y_train, y_test, model_config, preprocessor)
 
         # Evaluate the model
         logger.info("Evaluating the model...")
@@ -97,6 +121,9 @@ def model_evaluation(model_name, fine_tuning):
 
         logger.info("Model training and evaluation completed successfully.")
 
+        if onnx:
+            export_onnx_model(model_name, trained_model, preprocessor, x_test)
+
         return {
             "model_name": model_name,
             "fine_tuning": fine_tuning,
@@ -113,6 +140,80 @@ def model_evaluation(model_name, fine_tuning):
         return None
 
 
+def model_evaluation(model_name, fine_tuning, tuning=None, cache_dir=".cache/splits", chunksize=None,
+                     data_path="datasets/main_dataset.csv", onnx=False):
+    try:
+        splits = prepare_data(data_path, cache_dir=cache_dir, chunksize=chunksize)
+    except Exception as e:
+        logger.error(f"Error in model evaluation for {model_name}: {str(e)}")
+        logger.exception("Traceback:")
+        return None
+    return train_and_evaluate(model_name, fine_tuning, *splits, tuning=tuning, onnx=onnx)
+
+
+def thread_budgets(model_names, total_threads):
+    """
+    Split the machine's threads between models training side by side.
+
+    Linear regression gets a single thread; the tree ensembles share the rest.
+    """
+    budgets = {}
+    ensembles = [name for name in model_names if name != "linear_regression"]
+    if "linear_regression" in model_names:
+        budgets["linear_regression"] = 1
+        total_threads -= 1
+    for name in ensembles:
+        budgets[name] = max(1, total_threads // len(ensembles))
+    return budgets
+
+
+def _parallel_worker(model_name, fine_tuning, shared, preprocessor, n_jobs, tuning, onnx=False):
+    from threadpoolctl import threadpool_limits
+
+    x_train, x_test, y_train, y_test = load_shared_splits(shared)
+    # Caps BLAS/OpenMP pools too, so a model cannot take more than its budget
+    with threadpool_limits(limits=n_jobs):
+        return train_and_evaluate(
+            model_name, fine_tuning, x_train, x_test, y_train, y_test, preprocessor,
+            n_jobs=n_jobs, tuning=tuning, onnx=onnx
+        )
+
+
+def train_parallel(model_names, fine_tuning, total_threads=None, data_path="datasets/main_dataset.csv",
+                   tuning=None, cache_dir=".cache/splits", chunksize=None, onnx=False):
+    """
+    Train several models at once in worker processes.
+
+    The data is ingested and preprocessed once here; workers memory-map the
+    resulting splits read-only and each trains with its own thread budget.
+    """
+    total_threads = total_threads or os.cpu_count() or 1
+    budgets = thread_budgets(model_names, total_threads)
+    logger.info(f"Training {len(model_names)} models in parallel with thread budgets {budgets}")
+
+    x_train, x_test, y_train, y_test, preprocessor = prepare_data(data_path, cache_dir, chunksize)
+    results = []
+    with tempfile.TemporaryDirectory(prefix="shared_splits_") as directory:
+        shared = share_splits(x_train, x_test, y_train, y_test, directory)
+        with ProcessPoolExecutor(max_workers=len(model_names)) as pool:
+            futures = {
+                name: pool.submit(
+                    _parallel_worker, name, fine_tuning, shared, preprocessor, budgets[name], tuning, onnx
+                )
+                for name in model_names
+            }
+            # Collect in the requested order so the merged metrics are deterministic
+            for name, future in futures.items():
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.error(f"Worker for {name} failed: {str(e)}")
+                    result = None
+                if result:
+                    results.append(result)
+    return results
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Train a landslide prediction model")
     parser.add_argument("--model", type=str, default="all",
@@ -122,6 +223,33 @@ if __name__ == "__main__":
                         help="Enable hyperparameter fine-tuning (default: use predefined hyperparameters)")
     parser.add_argument("--output", type=str, default="model_metrics.txt",
                         help="Path to save model metrics")
+    parser.add_argument("--data", type=str, default="datasets/main_dataset.csv",
+                        help="Training data as CSV, Parquet (.parquet) or Arrow/Feather (.feather, .arrow)")
+    parser.add_argument("--cache-dir", type=str, default=".cache/splits",
+                        help="Directory of cached preprocessed splits (empty string disables the cache)")
+    parser.add_argument("--chunk-size", type=int, default=None,
+                        help="Stream the dataset in chunks of this many rows instead of loading it whole")
+    parser.add_argument("--parallel", action="store_true",
+                        help="Train all models at the same time in separate processes")
+    parser.add_argument("--threads", type=int, default=None,
+                        help="Total threads shared by parallel training (default: all cores)")
+    parser.add_argument("--trials", type=int, default=100,
+                        help="Number of hyperparameter trials when fine-tuning")
+    parser.add_argument("--tuning-jobs", type=int, default=1,
+                        help="Processes running tuning trials at the same time")
+    parser.add_argument("--tuning-timeout", type=float, default=None,
+                        help="Wall-clock budget for tuning each model, in seconds")
+    parser.add_argument("--pruner", type=str, default="median", choices=PRUNERS,
+                        help="Optuna pruner used to stop unpromising trials early")
+    parser.add_argument("--early-stopping-rounds", type=int, default=50,
+                        help="Stop boosting after this many rounds without validation improvement (0 disables)")
+    parser.add_argument("--refit-after-early-stopping", action="store_true",
+                        help="Refit early-stopped models on all training rows with the best round count "
+                             "(one more full fit; by default the early-stopped model is saved)")
+    parser.add_argument("--study-dir", type=str, default="optuna-studies",
+                        help="Directory of resumable tuning studies (empty string keeps them in memory)")
+    parser.add_argument("--export-onnx", action="store_true",
+                        help="Also save each trained model as <model>_onnx, with its preprocessing, for onnxruntime")
     args = parser.parse_args()
 
     # List of all available models
@@ -129,6 +257,15 @@ if __name__ == "__main__":
 
     # Use fine-tuning only if explicitly specified
     fine_tuning = args.fine_tune
+    tuning = {
+        "n_trials": args.trials,
+        "tuning_jobs": args.tuning_jobs,
+        "tuning_timeout": args.tuning_timeout,
+        "pruner": args.pruner,
+        "study_dir": args.study_dir or None,
+        "early_stopping_rounds": args.early_stopping_rounds,
+        "refit_after_early_stopping": args.refit_after_early_stopping,
+    }
 
     # Log whether we're using fine-tuning or predefined hyperparameters
     if fine_tuning:
@@ -140,11 +277,19 @@ if __name__ == "__main__":
         logger.info(f"Training and evaluating all models with fine_tuning={fine_tuning}")
         results = []
 
-        for model_name in all_models:
-            logger.info(f"Starting evaluation for model: {model_name}")
-            result = model_evaluation(model_name, fine_tuning)
-            if result:
-                results.append(result)
+        if args.parallel:
+            results = train_parallel(
+                all_models, fine_tuning, args.threads, data_path=args.data, tuning=tuning,
+                cache_dir=args.cache_dir or None, chunksize=args.chunk_size, onnx=args.export_onnx
+            )
+        else:
+            # Ingest and preprocess once, then train the models one after another
+            splits = prepare_data(args.data, cache_dir=args.cache_dir or None, chunksize=args.chunk_size)
+            for model_name in all_models:
+                logger.info(f"Starting evaluation for model: {model_name}")
+                result = train_and_evaluate(model_name, fine_tuning, *splits, tuning=tuning, onnx=args.export_onnx)
+                if result:
+                    results.append(result)
 
         # Save metrics to file
         if results:
@@ -168,6 +313,8 @@ if __name__ == "__main__":
             # best_r2_model = max(results, key=lambda x: x["metrics"]["r2"])
             # logger.info(f"Best model based on R2: {best_r2_model['model_name']} with R2: {best_r2_model['metrics']['r2']:.4f}")
     else:
-        result = model_evaluation(args.model, fine_tuning)
+        result = model_evaluation(
+            args.model, fine_tuning, tuning, args.cache_dir or None, args.chunk_size, args.data, args.export_onnx
+        )
         if result:
             save_metrics_to_file([result], args.output)
\ No newline at end of file
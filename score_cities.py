@@ -0,0 +1,17 @@
+import argparse
+from src.config.logging_config import setup_logging
+from src.hazards.cities import score_joined_cities
+
+logger = setup_logging()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Score the earthquake, flood and forest-fire city lists in one pass into one wide table"
+    )
+    parser.add_argument("--output", type=str, default="city_risk.parquet", help="Output .parquet or .csv file")
+    parser.add_argument("--chunk-size", type=int, default=50_000, help="Cities per scoring batch")
+    parser.add_argument("--model-dir", type=str, default=None,
+                        help="Hazard model directory (default: hazard-models, trained there if missing)")
+    args = parser.parse_args()
+
+    score_joined_cities(args.output, chunk_size=args.chunk_size, model_dir=args.model_dir)
@@ -0,0 +1,37 @@
+import argparse
+from src.config.logging_config import setup_logging
+from src.hazards.grid import GridSpec, score_grid
+
+logger = setup_logging()
+
+
+def parse_fill(values):
+    fill = {}
+    for value in values or []:
+        name, _, number = value.partition("=")
+        fill[name] = float(number)
+    return fill
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Score a dense lat/long grid for a hazard model")
+    parser.add_argument("--hazard", required=True, choices=["earthquake", "flood", "forestfire"])
+    parser.add_argument("--model", type=str, help="Trained hazard model (.pkl)")
+    parser.add_argument("--encoder", type=str, help="State one-hot encoder (.pkl) for forest-fire models saved without one")
+    parser.add_argument("--bbox", type=float, nargs=4, default=[6.0, 37.0, 68.0, 98.0],
+                        metavar=("LAT_MIN", "LAT_MAX", "LON_MIN", "LON_MAX"),
+                        help="Grid bounds (default: India)")
+    parser.add_argument("--step", type=float, default=0.05, help="Cell size in degrees")
+    parser.add_argument("--fill", nargs="*", metavar="FEATURE=VALUE",
+                        help="Constant values for non-coordinate features (default: training medians)")
+    parser.add_argument("--chunk-size", type=int, default=500_000, help="Cells per chunk")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--output", type=str, required=True, help="Output .parquet or .csv file")
+    args = parser.parse_args()
+
+    grid = GridSpec(*args.bbox, step=args.step)
+    score_grid(
+        args.hazard, grid, args.output,
+        model_path=args.model, encoder_path=args.encoder, fill=parse_fill(args.fill),
+        chunk_size=args.chunk_size, workers=args.workers,
+    )
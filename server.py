@@ -3,9 +3,14 @@ from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 from pathlib import Path
+import asyncio
 import logging
+import os
 from api.routers.predictions import router as predictions_router
+from api.routers.hazards import router as hazards_router, legacy_router
+from api.services.hazard_service import HazardService
 from api.services.model_service import ModelService
+from api.services.inference_executor import InferenceExecutor
 
 # Configure logging
 logging.basicConfig(
@@ -15,11 +20,47 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+async def watch_model_dir(registries, interval: float):
+    """Pick up artifacts written by save_model without restarting the server"""
+    while True:
+        await asyncio.sleep(interval)
+        for registry in registries:
+            try:
+                await asyncio.to_thread(registry.refresh)
+            except Exception as e:
+                logger.error(f"Model directory refresh failed for {registry.model_dir}: {e}")
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Initialize model service with correct paths
-    app.state.model_service = ModelService()
-    app.state.model_service.model_dir = Path("ml-models")  # Point to outer ml-models
+    # Concurrent single-row requests are micro-batched; BATCH_WINDOW_MS=0 disables it
+    app.state.model_service = ModelService(
+        model_dir=Path("ml-models"),  # Point to outer ml-models
+        batch_window_ms=float(os.getenv("BATCH_WINDOW_MS", 2.0)),
+        max_batch_size=int(os.getenv("MAX_BATCH_SIZE", 64)),
+        metrics_path=os.getenv("MODEL_METRICS_PATH", "model_metrics.txt"),
+        max_cache_bytes=int(float(os.getenv("MODEL_CACHE_MB", 2048)) * 1024 ** 2),
+        # MODEL_MMAP_MODE=r serves tree models from their node arrays mapped read-only,
+        # so uvicorn workers share one copy; unset, the native estimators are served
+        mmap_mode=os.getenv("MODEL_MMAP_MODE") or None,
+        # e.g. COMPILED_MODELS="randomforest,xgboost" or "all"
+        compiled_models=[name.strip() for name in os.getenv("COMPILED_MODELS", "").split(",") if name.strip()],
+        compiled_max_rows=int(os.getenv("COMPILED_MAX_ROWS", 64)),
+        # Threads per onnxruntime session for *_onnx models; requests already run
+        # side by side on the inference pool, so the default is one; 0 uses every core
+        onnx_threads=int(os.getenv("ONNX_INTRA_OP_THREADS", 1)),
+    )
+    # Earthquake, flood and forest-fire models, replacing the Flask backend
+    app.state.hazard_service = HazardService(
+        model_dir=Path(os.getenv("HAZARD_MODEL_DIR", "hazard-models")),
+        max_cache_bytes=int(float(os.getenv("HAZARD_CACHE_MB", 512)) * 1024 ** 2),
+        mmap_mode=os.getenv("MODEL_MMAP_MODE") or None,
+        # Prediction outputs such as score_grid's earthquake.parquet to serve spatial queries from
+        points_dir=os.getenv("HAZARD_POINTS_DIR") or None,
+    )
+    # Inference runs on a bounded pool so slow predictions never block the event loop
+    app.state.inference_executor = InferenceExecutor.from_env()
+    logger.info(f"Inference executor: {app.state.inference_executor.stats()}")
     try:
         # Load default model or handle empty state
         models = app.state.model_service.get_available_models()
@@ -27,15 +68,37 @@ async def lifespan(app: FastAPI):
             logger.info(f"Available models: {models}")
         else:
             logger.warning("No models found in ml-models directory")
+
+        # Warm models named in PRELOAD_MODELS (e.g. "xgboost,randomforest") so
+        # the first request does not pay for joblib.load; base names follow
+        # the newest timestamped artifact
+        preload = [name.strip() for name in os.getenv("PRELOAD_MODELS", "").split(",") if name.strip()]
+        if preload:
+            app.state.model_service.registry.preload(preload)
+
+        hazards = app.state.hazard_service.available()
+        logger.info(f"Hazard models available: {hazards}")
+        # Hazard models are small; load them up front like the Flask backend did
+        app.state.hazard_service.registry.preload(
+            name for name in app.state.hazard_service.registry.available()
+        )
     except Exception as e:
         logger.error(f"Initialization failed: {e}")
+
+    watcher = asyncio.create_task(watch_model_dir(
+        [app.state.model_service.registry, app.state.hazard_service.registry],
+        float(os.getenv("MODEL_WATCH_INTERVAL", 5.0)),
+    ))
     yield
     # Cleanup on shutdown
+    watcher.cancel()
+    app.state.inference_executor.shutdown()
     app.state.model_service = None
+    app.state.hazard_service = None
 
 app = FastAPI(
     title="Landslide Prediction API",
-    description="API for predicting landslide risks using machine learning models",
+    description="API for predicting landslide, earthquake, flood and forest-fire risks using machine learning models",
     version="0.1.0",
     lifespan=lifespan
 )
@@ -50,6 +113,9 @@ app.add_middleware(
 
 # Include routers from API folder
 app.include_router(predictions_router, prefix="/api/v1", tags=["predictions"])
+app.include_router(hazards_router, prefix="/api/v1/hazards", tags=["hazards"])
+# Same request and response shape as the old Flask backend, for the React frontend
+app.include_router(legacy_router, tags=["hazards"])
 
 @app.get("/health")
 async def health_check():
@@ -58,11 +124,17 @@ async def health_check():
 @app.get("/model-health")
 async def model_health(request: Request):
     service = request.app.state.model_service
+    hazard_service = getattr(request.app.state, "hazard_service", None)
+    executor = getattr(request.app.state, "inference_executor", None)
     return {
-        "loaded_models": list(service.models.keys()) if service else [],
-        "available_models": service.get_available_models() if service else []
+        "loaded_models": service.loaded_models() if service else [],
+        "available_models": service.get_available_models() if service else [],
+        "hazards": hazard_service.available() if hazard_service else {},
+        "inference": executor.stats() if executor else {}
     }
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    workers = int(os.getenv("UVICORN_WORKERS", 1))
+    # Multiple workers need the app as an import string so each process imports it
+    uvicorn.run("server:app" if workers > 1 else app, host="0.0.0.0", port=8000, workers=workers)
\ No newline at end of file
@@ -0,0 +1,69 @@
+from pathlib import Path
+
+DISASTER_DATA_DIR = Path(__file__).resolve().parents[2] / "Disaster Prediction ML Model" / "Dataset"
+
+# Flood-Data.csv headers contain units and symbols; the scripts rename them positionally
+FLOOD_COLUMNS = [
+    "Latitude", "Longitude", "Rainfall_mm", "Temperature_C", "Humidity_pct",
+    "River_Discharge_m3_s", "Water_Level_m", "Elevation_m", "Land_Cover",
+    "Soil_Type", "Population_Density", "Infrastructure", "Historical_Floods",
+    "Flood_Occurred"
+]
+
+FOREST_FIRE_PERIODS = [
+    'January 2018 to June 2018',
+    'November 2018 to June 2019',
+    'November 2019 to June 2020',
+    'November 2020 to June 2021',
+    'November 2021 to June 2022',
+    'November 2022 to June 2023'
+]
+
+# Settings shared by the three hazard models, as the scripts trained them
+MODEL_PARAMS = {"n_estimators": 100, "random_state": 42}
+SPLIT_PARAMS = {"test_size": 0.2, "random_state": 42}
+
+HAZARD_CONFIGS = {
+    "earthquake": {
+        "data_path": DISASTER_DATA_DIR / "EarthQuake-Data.csv",
+        "cities_path": DISASTER_DATA_DIR / "EarthQuake-Prediction-Cities.csv",
+        "features": ["Latitude", "Longitude", "Depth"],
+        "target": "Magnitude",
+        "estimator": "RandomForestRegressor",
+        # Artifact name the training scripts save and the API serves
+        "model_name": "earthquake_model",
+        # Predicted magnitude < 3.8 is Low, < 4.3 Medium, otherwise High
+        "risk_thresholds": [3.8, 4.3],
+        "risk_labels": ["Low", "Medium", "High"],
+    },
+    "flood": {
+        "data_path": DISASTER_DATA_DIR / "Flood-Data.csv",
+        "cities_path": DISASTER_DATA_DIR / "Flood-Predicting-Cities.csv",
+        "columns": FLOOD_COLUMNS,
+        "features": ["Latitude", "Longitude", "Rainfall_mm", "Elevation_m", "River_Discharge_m3_s"],
+        "target": "Flood_Occurred",
+        # A regressor on the 0/1 target; its output is used as a flood risk score
+        "estimator": "RandomForestRegressor",
+        "model_name": "flood_model",
+        "risk_thresholds": [0.5, 0.65],
+        "risk_labels": ["Low", "Medium", "High"],
+    },
+    "forestfire": {
+        "data_path": DISASTER_DATA_DIR / "ForestFire-Data.csv",
+        "cities_path": DISASTER_DATA_DIR / "ForestFire-Prediction-Cities.csv",
+        "features": ["State/UT"],
+        "target": "Total_Occurrences",
+        # Occurrences summed over the periods, averaged per state, then binned
+        # into the risk class the classifier predicts
+        "periods": FOREST_FIRE_PERIODS,
+        "estimator": "RandomForestClassifier",
+        "model_name": "forest_fire_model",
+        "encoder_name": "one_hot_encoder",
+        # State -> risk class table from build_forest_fire_lookup.py
+        "lookup_name": "forest_fire_lookup",
+        # Total occurrences <= 5000 is class 0, <= 12000 class 1, otherwise class 2;
+        # the classifier predicts the class directly
+        "risk_thresholds": [5000, 12000],
+        "risk_labels": ["Less Prone", "Medium Prone", "Highly Prone"],
+    },
+}
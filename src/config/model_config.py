@@ -1,7 +1,41 @@
 class ModelNameConfig:
-    def __init__(self, model_name: str, fine_tuning: bool = True):
+    def __init__(
+        self,
+        model_name: str,
+        fine_tuning: bool = True,
+        n_jobs: int = None,
+        n_trials: int = 100,
+        tuning_jobs: int = 1,
+        tuning_timeout: float = None,
+        pruner: str = "median",
+        study_dir: str = "optuna-studies",
+        early_stopping_rounds: int = 50,
+        validation_fraction: float = 0.1,
+        refit_after_early_stopping: bool = False,
+    ):
         self.model_name = model_name
         self.fine_tuning = fine_tuning
+        # Thread budget for the estimator; None keeps the library default
+        self.n_jobs = n_jobs
+        # Hyperparameter search: trial count, worker processes, wall-clock
+        # budget in seconds and Optuna pruner ("median", "hyperband" or "none")
+        self.n_trials = n_trials
+        self.tuning_jobs = tuning_jobs
+        self.tuning_timeout = tuning_timeout
+        self.pruner = pruner
+        # Tuning studies are kept here, one journal per model and dataset
+        # fingerprint, so reruns resume; None keeps them in memory
+        self.study_dir = study_dir
+        # Boosting models stop adding trees once the score on a validation
+        # split held out from the training data has not improved for this
+        # many rounds; None or 0 always trains n_estimators trees
+        self.early_stopping_rounds = early_stopping_rounds
+        self.validation_fraction = validation_fraction
+        # By default the early-stopped model is saved, trimmed to its best
+        # round count. It is trained on the training data minus the validation
+        # split and never sees those rows. Refitting with the best round count
+        # on all of it uses every row but costs a second full fit
+        self.refit_after_early_stopping = refit_after_early_stopping
 
 MODEL_CONFIGS = {
 
@@ -1,20 +1,82 @@
 from src.config.logging_config import setup_logging
 import pandas as pd
-from typing import Tuple
+from sklearn.compose import ColumnTransformer
+import os
+from typing import Iterator, List, Optional, Tuple
 from typing_extensions import Annotated
 
 logger = setup_logging()
 
+CSV_SUFFIXES = (".csv",)
+PARQUET_SUFFIXES = (".parquet", ".pq")
+ARROW_SUFFIXES = (".arrow", ".feather", ".ipc")
+
 class IngestData:
-    def __init__(self, file_path: str):
+    """
+    Reads a dataset from CSV, Parquet or Arrow IPC/Feather, chosen by file
+    suffix. columns limits reading to those columns; Parquet and Arrow skip
+    the others on disk. Arrow files are memory-mapped, so their pages are
+    shared with the OS cache instead of being read into process memory.
+    """
+
+    def __init__(self, file_path: str, columns: Optional[List[str]] = None):
         self.file_path = file_path
+        self.columns = columns
+        self.suffix = os.path.splitext(str(file_path))[1].lower()
+        if self.suffix not in CSV_SUFFIXES + PARQUET_SUFFIXES + ARROW_SUFFIXES:
+            raise ValueError(f"Unsupported data format: {file_path}")
+
+    def column_names(self) -> List[str]:
+        """Columns in the file, from the CSV header or the Parquet/Arrow schema, without reading any rows"""
+        if self.suffix in CSV_SUFFIXES:
+            return pd.read_csv(self.file_path, nrows=0).columns.tolist()
+        if self.suffix in PARQUET_SUFFIXES:
+            import pyarrow.parquet as pq
+            schema = pq.read_schema(self.file_path)
+        else:
+            # Memory-mapped, so only the metadata is read
+            schema = self._arrow_table().schema
+        # A DataFrame index saved by pandas is stored as a column too
+        index = {name for name in (schema.pandas_metadata or {}).get("index_columns", []) if isinstance(name, str)}
+        return [name for name in schema.names if name not in index]
 
     def get_data(self) -> pd.DataFrame:
-        return pd.read_csv(self.file_path)
+        if self.suffix in PARQUET_SUFFIXES:
+            return pd.read_parquet(self.file_path, columns=self.columns)
+        if self.suffix in ARROW_SUFFIXES:
+            return self._arrow_table().to_pandas()
+        return pd.read_csv(self.file_path, usecols=self.columns)
+
+    def sample(self, nrows: int) -> pd.DataFrame:
+        """The first nrows rows, for inferring column types"""
+        if self.suffix == ".csv":
+            return pd.read_csv(self.file_path, nrows=nrows, usecols=self.columns)
+        return next(self.iter_chunks(nrows))
+
+    def iter_chunks(self, chunksize: int, dtype=None, usecols=None) -> Iterator[pd.DataFrame]:
+        """Read the file chunksize rows at a time, so it never has to fit in memory"""
+        usecols = usecols or self.columns
+        if self.suffix in CSV_SUFFIXES:
+            with pd.read_csv(self.file_path, chunksize=chunksize, dtype=dtype, usecols=usecols) as reader:
+                yield from reader
+            return
 
-def ingest_data(file_path: str) -> pd.DataFrame:
+        if self.suffix in PARQUET_SUFFIXES:
+            import pyarrow.parquet as pq
+            batches = pq.ParquetFile(self.file_path).iter_batches(batch_size=chunksize, columns=usecols)
+        else:
+            batches = self._arrow_table(usecols).to_batches(max_chunksize=chunksize)
+        for batch in batches:
+            chunk = batch.to_pandas()
+            yield chunk.astype(dtype) if dtype else chunk
+
+    def _arrow_table(self, columns: Optional[List[str]] = None):
+        import pyarrow.feather as feather
+        return feather.read_table(self.file_path, columns=columns or self.columns, memory_map=True)
+
+def ingest_data(file_path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
     try:
-        ingest_data = IngestData(file_path)
+        ingest_data = IngestData(file_path, columns)
         df = ingest_data.get_data()
         return df
     except Exception as e:
@@ -28,6 +90,7 @@ def clean_data(
     Annotated[pd.DataFrame, "x_test"],
     Annotated[pd.Series, "y_train"],
     Annotated[pd.Series, "y_test"],
+    Annotated[ColumnTransformer, "preprocessor"],
 ]:
     from .data_pipeline import DataCleaning, DataPreprocessStrategy, DataDivideStrategy
 
@@ -39,7 +102,70 @@ def clean_data(
         divide_strategy = DataDivideStrategy()
         data_cleaning = DataCleaning(preprocessed_data, divide_strategy)
         x_train, x_test, y_train, y_test = data_cleaning.handle_data()
-        return x_train, x_test, y_train, y_test
+        return x_train, x_test, y_train, y_test, preprocess_strategy.preprocessor
     except Exception as e:
         logger.error(f"Error cleaning data: {e}")
-        raise e
\ No newline at end of file
+        raise e
+
+def pipeline_columns(file_path: str) -> List[str]:
+    """Columns of the file the training pipeline uses: all but PREPROCESS_CONFIG's drop_columns"""
+    from .data_pipeline import PREPROCESS_CONFIG
+    drop = set(PREPROCESS_CONFIG["drop_columns"])
+    return [column for column in IngestData(file_path).column_names() if column not in drop]
+
+def load_splits(file_path: str, cache_dir: str = ".cache/splits", chunksize: int = None):
+    """
+    ingest_data followed by clean_data, reusing the preprocessed splits and
+    transformer from cache_dir when the file and preprocessing config are
+    unchanged. Pass cache_dir=None to always recompute. Only pipeline_columns
+    are read, so Parquet and Arrow inputs skip dropped columns on disk.
+
+    With chunksize the file is streamed instead of loaded whole (see
+    streaming.stream_clean_data) and the splits come back as float32
+    DataFrames over memory-mapped files.
+    """
+    from .split_cache import SplitCache, cache_key
+
+    try:
+        if chunksize and not cache_dir:
+            return _stream_uncached(file_path, chunksize)
+        if not cache_dir:
+            return clean_data(_ingest_pipeline_columns(file_path))
+
+        cache = SplitCache(cache_dir)
+        key = cache_key(file_path, streaming=bool(chunksize))
+        splits = cache.load(key)
+        if splits is None and chunksize:
+            splits = cache.save_streamed(key, file_path, chunksize)
+            if splits is None:
+                # The entry could not be published; stream without the cache
+                splits = _stream_uncached(file_path, chunksize)
+        elif splits is None:
+            raw_data = _ingest_pipeline_columns(file_path)
+            logger.info(f"Raw data shape: {raw_data.shape}")
+            logger.info(f"Raw data columns: {raw_data.columns.tolist()}")
+            logger.info(f"Raw data types:\n{raw_data.dtypes}")
+            splits = clean_data(raw_data)
+            cache.save(key, *splits)
+        return splits
+    except Exception as e:
+        logger.error(f"Error loading splits: {e}")
+        raise e
+
+def _ingest_pipeline_columns(file_path: str) -> pd.DataFrame:
+    return ingest_data(file_path, columns=pipeline_columns(file_path))
+
+def _stream_uncached(file_path: str, chunksize: int):
+    import shutil
+    import tempfile
+    from .shared_data import load_shared_splits
+    from .streaming import stream_clean_data
+
+    directory = tempfile.mkdtemp(prefix="streamed_splits_")
+    try:
+        shared, preprocessor = stream_clean_data(file_path, directory, chunksize)
+        x_train, x_test, y_train, y_test = load_shared_splits(shared)
+        return x_train, x_test, y_train, y_test, preprocessor
+    finally:
+        # Open memory maps keep the data readable after the files are unlinked
+        shutil.rmtree(directory, ignore_errors=True)
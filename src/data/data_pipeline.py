@@ -1,6 +1,6 @@
 from src.config.logging_config import setup_logging
 from abc import ABC, abstractmethod
-from typing import Union, Tuple
+from typing import List, Union, Tuple
 
 import pandas as pd
 import numpy as np
@@ -22,30 +22,59 @@ EXPECTED_FEATURES = [
     'human_activity_high', 'human_activity_low', 'human_activity_medium'
 ]
 
+# Everything that shapes the preprocessed splits. Cached splits are keyed on
+# this (see split_cache.py), so change it, or bump "version" when changing the
+# preprocessing code itself, to invalidate them.
+PREPROCESS_CONFIG = {
+    "version": 2,
+    "drop_columns": ["date", "latitude", "longitude"],
+    "target_column": "landslide_occurred",
+    "test_size": 0.2,
+    "random_state": 42,
+}
+
+def feature_types(dtypes: pd.Series, target_column: str) -> Tuple[List[str], List[str]]:
+    """
+    Numeric and categorical feature columns, in column order, for a frame's
+    dtypes. Numbers (booleans excepted) are scaled; every other column is
+    one-hot encoded. clean_data and the streaming path both use this, so the
+    same file gives the same features either way.
+    """
+    numeric, categorical = [], []
+    for column, dtype in dtypes.items():
+        if column == target_column:
+            continue
+        if pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype):
+            numeric.append(column)
+        else:
+            categorical.append(column)
+    return numeric, categorical
+
 class DataStrategy(ABC):
     @abstractmethod
     def handle_data(self, data: pd.DataFrame) -> Union[pd.DataFrame, pd.Series]:
         pass
 
 class DataPreprocessStrategy(DataStrategy):
+    def __init__(self) -> None:
+        # Fitted ColumnTransformer, kept so it can be saved next to the model
+        self.preprocessor = None
+
     def handle_data(self, data: pd.DataFrame) -> pd.DataFrame:
         try:
             logger.info(f"Available columns: {data.columns.tolist()}")
             
             # Drop unnecessary columns if they exist
-            columns_to_drop = ["date", "latitude", "longitude"]
+            columns_to_drop = PREPROCESS_CONFIG["drop_columns"]
             data = data.drop([col for col in columns_to_drop if col in data.columns], axis=1)
             
-            # Identify categorical and numeric columns
-            categorical_columns = data.select_dtypes(include=['object', 'category']).columns
-            numeric_columns = data.select_dtypes(include=['float64', 'int64']).columns
-            
-            logger.info(f"Categorical columns: {categorical_columns.tolist()}")
-            logger.info(f"Numeric columns: {numeric_columns.tolist()}")
-            
-            # Identify target variable (assuming it's the last column)
-            target_column = 'landslide_occurred'
+            # Identify target variable, then categorical and numeric columns
+            target_column = PREPROCESS_CONFIG["target_column"]
             logger.info(f"Target variable is: {target_column}")
+            numeric_columns, categorical_columns = feature_types(data.dtypes, target_column)
+            
+            logger.info(f"Categorical columns: {categorical_columns}")
+            logger.info(f"Numeric columns: {numeric_columns}")
             
             # Separate features and target
             X = data.drop(target_column, axis=1)
@@ -54,15 +83,16 @@ class DataPreprocessStrategy(DataStrategy):
             # Create preprocessor
             preprocessor = ColumnTransformer(
                 transformers=[
-                    ('num', StandardScaler(), numeric_columns.drop(target_column)),
+                    ('num', StandardScaler(), numeric_columns),
                     ('cat', OneHotEncoder(handle_unknown='ignore'), categorical_columns)
                 ])
             
             # Fit and transform the data
             X_transformed = preprocessor.fit_transform(X)
+            self.preprocessor = preprocessor
             
             # Get feature names after preprocessing
-            numeric_feature_names = numeric_columns.drop(target_column).tolist()
+            numeric_feature_names = list(numeric_columns)
             categorical_feature_names = preprocessor.named_transformers_['cat'].get_feature_names_out(categorical_columns).tolist()
             feature_names = numeric_feature_names + categorical_feature_names
             
@@ -81,7 +111,9 @@ class DataDivideStrategy(DataStrategy):
     def handle_data(self, data: Tuple[pd.DataFrame, pd.Series]) -> Tuple[pd.DataFrame, pd.DataFrame, pd.Series, pd.Series]:
         try:
             X, y = data
-            X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+            X_train, X_test, y_train, y_test = train_test_split(
+                X, y, test_size=PREPROCESS_CONFIG["test_size"], random_state=PREPROCESS_CONFIG["random_state"]
+            )
             return X_train, X_test, y_train, y_test
         except Exception as e:
             logger.error(f"Error in dividing data: {e}")
@@ -0,0 +1,55 @@
+from src.config.logging_config import setup_logging
+import os
+from typing import Dict, NamedTuple, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = setup_logging()
+
+SPLIT_NAMES = ("x_train", "x_test", "y_train", "y_test")
+
+
+class SharedSplits(NamedTuple):
+    """Picklable handle to train/test splits written as .npy files."""
+    directory: str
+    feature_names: Tuple[str, ...]
+    target_name: str
+
+
+def share_splits(x_train, x_test, y_train, y_test, directory: str) -> SharedSplits:
+    """
+    Write the splits to directory so worker processes can memory-map them
+    instead of each receiving a pickled copy.
+    """
+    try:
+        os.makedirs(directory, exist_ok=True)
+        arrays = {
+            "x_train": x_train.to_numpy(),
+            "x_test": x_test.to_numpy(),
+            "y_train": y_train.to_numpy(),
+            "y_test": y_test.to_numpy(),
+        }
+        for name, array in arrays.items():
+            np.save(os.path.join(directory, f"{name}.npy"), np.ascontiguousarray(array))
+        size_mb = sum(array.nbytes for array in arrays.values()) / 1024 ** 2
+        logger.info(f"Wrote {size_mb:.1f} MB of preprocessed splits to {directory}")
+        return SharedSplits(directory, tuple(x_train.columns), y_train.name)
+    except Exception as e:
+        logger.error(f"Error sharing splits: {e}")
+        raise e
+
+
+def load_shared_splits(shared: SharedSplits) -> Tuple[pd.DataFrame, pd.DataFrame, pd.Series, pd.Series]:
+    """Open the splits read-only; pages are shared between all processes that map them."""
+    arrays: Dict[str, np.ndarray] = {
+        name: np.load(os.path.join(shared.directory, f"{name}.npy"), mmap_mode="r")
+        for name in SPLIT_NAMES
+    }
+    columns = list(shared.feature_names)
+    return (
+        pd.DataFrame(arrays["x_train"], columns=columns, copy=False),
+        pd.DataFrame(arrays["x_test"], columns=columns, copy=False),
+        pd.Series(arrays["y_train"], name=shared.target_name, copy=False),
+        pd.Series(arrays["y_test"], name=shared.target_name, copy=False),
+    )
@@ -0,0 +1,110 @@
+from src.config.logging_config import setup_logging
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from typing import Optional
+
+import joblib
+import sklearn
+
+from src.data.data_pipeline import PREPROCESS_CONFIG
+from src.data.shared_data import SharedSplits, share_splits, load_shared_splits
+
+logger = setup_logging()
+
+# Bump when the layout of a cache entry changes
+CACHE_FORMAT = 1
+
+
+def file_digest(file_path: str, block_size: int = 1 << 20) -> str:
+    """SHA-256 of a file's contents, read in blocks"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        for block in iter(lambda: file.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def cache_key(file_path: str, streaming: bool = False) -> str:
+    """
+    Key for the preprocessed splits of file_path: changes when the file's
+    contents, PREPROCESS_CONFIG or the scikit-learn version (which the pickled
+    transformer depends on) change. Streamed splits are float32 and keyed
+    separately from in-memory ones.
+    """
+    digest = hashlib.sha256()
+    digest.update(file_digest(file_path).encode())
+    digest.update(json.dumps(PREPROCESS_CONFIG, sort_keys=True).encode())
+    digest.update(f"{CACHE_FORMAT}:{sklearn.__version__}:{'stream' if streaming else 'memory'}".encode())
+    return digest.hexdigest()[:32]
+
+
+class SplitCache:
+    """
+    Preprocessed train/test splits and fitted transformer on local disk.
+
+    Each entry is a directory of .npy matrices, loaded memory-mapped, plus
+    the pickled ColumnTransformer. Entries are written to a temporary
+    directory and renamed into place, so a crashed run never leaves a
+    partial entry behind.
+    """
+
+    def __init__(self, cache_dir: str = ".cache/splits"):
+        self.cache_dir = cache_dir
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key)
+
+    def load(self, key: str) -> Optional[tuple]:
+        directory = self.path(key)
+        meta_path = os.path.join(directory, "meta.json")
+        if not os.path.exists(meta_path):
+            return None
+        try:
+            with open(meta_path, "r") as file:
+                meta = json.load(file)
+            shared = SharedSplits(directory, tuple(meta["feature_names"]), meta["target_name"])
+            x_train, x_test, y_train, y_test = load_shared_splits(shared)
+            preprocessor = joblib.load(os.path.join(directory, "preprocessor.joblib"))
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable split cache entry {directory}: {e}")
+            return None
+        logger.info(f"Loaded preprocessed splits from cache {directory}")
+        return x_train, x_test, y_train, y_test, preprocessor
+
+    def save(self, key: str, x_train, x_test, y_train, y_test, preprocessor):
+        self._write(key, lambda directory: (
+            share_splits(x_train, x_test, y_train, y_test, directory), preprocessor
+        ))
+
+    def save_streamed(self, key: str, file_path: str, chunksize: int) -> Optional[tuple]:
+        """Preprocess file_path chunk by chunk straight into a new entry and load it"""
+        from src.data.streaming import stream_clean_data
+
+        self._write(key, lambda directory: stream_clean_data(file_path, directory, chunksize))
+        return self.load(key)
+
+    def _write(self, key: str, build):
+        """Run build(directory) -> (SharedSplits, preprocessor) in a temporary directory and publish it"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(dir=self.cache_dir, prefix=".tmp-")
+        try:
+            shared, preprocessor = build(tmp_dir)
+            joblib.dump(preprocessor, os.path.join(tmp_dir, "preprocessor.joblib"))
+            with open(os.path.join(tmp_dir, "meta.json"), "w") as file:
+                json.dump({
+                    "feature_names": list(shared.feature_names),
+                    "target_name": shared.target_name,
+                    "preprocess_config": PREPROCESS_CONFIG,
+                }, file, indent=4)
+            os.rename(tmp_dir, self.path(key))
+            logger.info(f"Cached preprocessed splits in {self.path(key)}")
+        except OSError as e:
+            # Another run cached the same key first, or the disk is read-only
+            logger.warning(f"Could not cache preprocessed splits: {e}")
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
@@ -0,0 +1,145 @@
+from src.config.logging_config import setup_logging
+import os
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+from numpy.lib.format import open_memmap
+from sklearn.compose import ColumnTransformer
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+from src.data.data_loader import IngestData, pipeline_columns
+from src.data.data_pipeline import PREPROCESS_CONFIG, feature_types
+from src.data.shared_data import SharedSplits
+
+logger = setup_logging()
+
+# Rows sampled to infer column types before streaming the whole file
+DTYPE_SAMPLE_ROWS = 10_000
+
+
+def compact_dtypes(sample: pd.DataFrame, target_column: str) -> Dict[str, str]:
+    """
+    float32 for the numeric features feature_types picks and category for the
+    rest. The target keeps its inferred type so integer labels stay integers.
+    """
+    numeric, categorical = feature_types(sample.dtypes, target_column)
+    dtypes = {column: "float32" for column in numeric}
+    dtypes.update({column: "category" for column in categorical})
+    return {column: dtypes[column] for column in sample.columns if column in dtypes}
+
+
+def _moment_rows(scaler: StandardScaler, numeric_columns: List[str], categories: Dict[str, List]) -> pd.DataFrame:
+    """
+    Two rows per numeric column at mean - std and mean + std: their mean and
+    (population) variance are the scaler's, so a StandardScaler fitted on
+    them has the whole file's statistics. Categorical columns take their
+    first category; the encoder's categories are given up front anyway.
+    """
+    std = np.sqrt(scaler.var_)
+    rows = pd.DataFrame(np.vstack([scaler.mean_ - std, scaler.mean_ + std]), columns=numeric_columns)
+    for column, values in categories.items():
+        rows[column] = values[0]
+    return rows
+
+
+def _gather(source: np.ndarray, rows: np.ndarray, path: str, block_rows: int) -> None:
+    """Write source[rows] to a .npy file block by block"""
+    out = open_memmap(path, mode="w+", dtype=source.dtype, shape=(len(rows),) + source.shape[1:])
+    for start in range(0, len(rows), block_rows):
+        block = rows[start:start + block_rows]
+        out[start:start + len(block)] = source[block]
+    out.flush()
+    del out
+
+
+def stream_clean_data(file_path: str, directory: str, chunksize: int = 100_000) -> Tuple[SharedSplits, ColumnTransformer]:
+    """
+    Out-of-core equivalent of clean_data for files larger than memory.
+
+    The file is read twice, chunk by chunk, with compact dtypes:
+      1. StandardScaler statistics are accumulated with partial_fit and the
+         categories of every string column are collected.
+      2. Each chunk is transformed and written to an on-disk matrix.
+    The train/test split (same rows as DataDivideStrategy) is then gathered
+    into x_train.npy, x_test.npy, y_train.npy and y_test.npy in directory,
+    so peak memory is bounded by the chunk size, not the file size.
+    """
+    try:
+        ingest = IngestData(file_path)
+        target_column = PREPROCESS_CONFIG["target_column"]
+        sample = ingest.sample(DTYPE_SAMPLE_ROWS)
+        usecols = pipeline_columns(file_path)
+        dtypes = compact_dtypes(sample[usecols], target_column)
+        numeric_columns: List[str] = [c for c, d in dtypes.items() if d == "float32"]
+        categorical_columns: List[str] = [c for c, d in dtypes.items() if d == "category"]
+        logger.info(f"Streaming {file_path} in chunks of {chunksize:,} rows")
+        logger.info(f"Numeric columns: {numeric_columns}")
+        logger.info(f"Categorical columns: {categorical_columns}")
+
+        def chunks():
+            return ingest.iter_chunks(chunksize, dtype=dtypes, usecols=usecols)
+
+        # Pass 1: statistics
+        scaler = StandardScaler()
+        categories = {column: set() for column in categorical_columns}
+        first_chunk = None
+        n_rows = 0
+        for chunk in chunks():
+            if first_chunk is None:
+                first_chunk = chunk
+            scaler.partial_fit(chunk[numeric_columns])
+            for column in categorical_columns:
+                categories[column].update(chunk[column].dropna().unique().tolist())
+            n_rows += len(chunk)
+
+        # Fit the transformer on rows carrying the whole file's statistics.
+        # Categories are fixed up front so every value seen in any chunk gets its column.
+        categories = {column: sorted(categories[column]) for column in categorical_columns}
+        preprocessor = ColumnTransformer(
+            transformers=[
+                ('num', StandardScaler(), numeric_columns),
+                ('cat', OneHotEncoder(
+                    categories=[categories[column] for column in categorical_columns],
+                    handle_unknown='ignore',
+                ), categorical_columns),
+            ])
+        preprocessor.fit(_moment_rows(scaler, numeric_columns, categories)[numeric_columns + categorical_columns])
+
+        feature_names = numeric_columns + preprocessor.named_transformers_['cat'].get_feature_names_out(
+            categorical_columns
+        ).tolist()
+        logger.info(f"Preprocessed data shape: ({n_rows}, {len(feature_names)})")
+
+        # Pass 2: transform into on-disk matrices
+        os.makedirs(directory, exist_ok=True)
+        x_all_path = os.path.join(directory, "_x_all.npy")
+        y_all_path = os.path.join(directory, "_y_all.npy")
+        x_all = open_memmap(x_all_path, mode="w+", dtype=np.float32, shape=(n_rows, len(feature_names)))
+        y_all = open_memmap(y_all_path, mode="w+", dtype=first_chunk[target_column].dtype, shape=(n_rows,))
+        start = 0
+        for chunk in chunks():
+            transformed = preprocessor.transform(chunk.drop(columns=target_column))
+            if hasattr(transformed, "toarray"):
+                transformed = transformed.toarray()
+            x_all[start:start + len(chunk)] = transformed
+            y_all[start:start + len(chunk)] = chunk[target_column].to_numpy()
+            start += len(chunk)
+        x_all.flush()
+        y_all.flush()
+
+        train_rows, test_rows = train_test_split(
+            np.arange(n_rows), test_size=PREPROCESS_CONFIG["test_size"], random_state=PREPROCESS_CONFIG["random_state"]
+        )
+        for name, rows in (("train", train_rows), ("test", test_rows)):
+            _gather(x_all, rows, os.path.join(directory, f"x_{name}.npy"), chunksize)
+            _gather(y_all, rows, os.path.join(directory, f"y_{name}.npy"), chunksize)
+        del x_all, y_all
+        os.remove(x_all_path)
+        os.remove(y_all_path)
+
+        return SharedSplits(directory, tuple(feature_names), target_column), preprocessor
+    except Exception as e:
+        logger.error(f"Error in streaming preprocessing: {e}")
+        raise e
@@ -0,0 +1,115 @@
+"""
+One scoring job for the earthquake, flood and forest-fire city lists.
+
+joined_cities reads the earthquake and flood city files once, outer-joining
+them by city and state; forest-fire risk comes from the city's state via
+the state lookup table. score_joined_cities then runs every hazard model on
+each chunk of that table and appends one wide row per city to the output.
+"""
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.config.hazard_config import HAZARD_CONFIGS
+from src.config.logging_config import setup_logging
+from src.hazards.grid import ChunkWriter, training_medians
+from src.hazards.lookup import build_state_lookup
+from src.hazards.risk import risk_labels
+from src.hazards.spatial import city_places
+from src.hazards.training import get_hazard_artifact, predict_hazard
+
+logger = setup_logging()
+
+# Column of the joined table holding each model feature; flood keeps the
+# coordinates of its own city file, which it was scored with before
+HAZARD_INPUTS = {
+    "earthquake": {"Latitude": "Latitude", "Longitude": "Longitude", "Depth": "Depth"},
+    "flood": {
+        "Latitude": "Latitude_flood",
+        "Longitude": "Longitude_flood",
+        "Rainfall_mm": "Rainfall_mm",
+        "Elevation_m": "Elevation_m",
+        "River_Discharge_m3_s": "River_Discharge_m3_s",
+    },
+}
+
+# Name of each hazard's prediction in the wide table; its label goes in <Hazard>_Risk
+PREDICTION_COLUMNS = {
+    "earthquake": "Earthquake_Magnitude",
+    "flood": "Flood_Risk_Score",
+    "forestfire": "ForestFire_Risk_Level",
+}
+RISK_COLUMNS = {"earthquake": "Earthquake_Risk", "flood": "Flood_Risk", "forestfire": "ForestFire_Risk"}
+
+
+def _join_key(frame: pd.DataFrame) -> pd.Series:
+    return frame["Name"].str.casefold() + "|" + frame["State"].str.casefold()
+
+
+def joined_cities() -> pd.DataFrame:
+    """
+    Every city from the earthquake and flood lists, one row each.
+
+    Cities only in the flood list take its coordinates and the training
+    median depth, as earthquake cities do. Cities only in the earthquake
+    list have no flood inputs and are left unscored for flood.
+    """
+    earthquake = city_places("earthquake")[["Name", "State", "Latitude", "Longitude", "Depth"]]
+    flood = city_places("flood")[["Name", "State", *HAZARD_CONFIGS["flood"]["features"]]]
+    # Some state names carry trailing spaces ("Tamil Nadu ") and would miss the forest-fire table
+    for frame in (earthquake, flood):
+        frame[["Name", "State"]] = frame[["Name", "State"]].apply(lambda names: names.str.strip())
+    joined = earthquake.assign(_key=_join_key(earthquake)).merge(
+        flood.assign(_key=_join_key(flood)), on="_key", how="outer", suffixes=("", "_flood"), sort=False,
+    )
+    for column in ("Name", "State", "Latitude", "Longitude"):
+        joined[column] = joined[column].fillna(joined[f"{column}_flood"])
+    joined["Depth"] = joined["Depth"].fillna(training_medians("earthquake")["Depth"])
+    return joined.drop(columns=["_key", "Name_flood", "State_flood"]).reset_index(drop=True)
+
+
+def score_chunk(chunk: pd.DataFrame, artifacts: Dict[str, Dict], state_levels: Dict[str, int]) -> pd.DataFrame:
+    """Wide risk row per city: each hazard's model runs once over the rows that have its inputs."""
+    scored = pd.DataFrame({
+        "City": chunk["Name"].to_numpy(),
+        "State": chunk["State"].to_numpy(),
+        "Latitude": chunk["Latitude"].to_numpy(),
+        "Longitude": chunk["Longitude"].to_numpy(),
+    })
+    for hazard, inputs in HAZARD_INPUTS.items():
+        frame = pd.DataFrame({feature: chunk[column].to_numpy() for feature, column in inputs.items()})
+        complete = frame.notna().all(axis=1).to_numpy()
+        predictions = np.full(len(chunk), np.nan)
+        levels = np.full(len(chunk), -1, dtype=np.int64)
+        if complete.any():
+            predictions[complete], levels[complete] = predict_hazard(hazard, artifacts[hazard], frame[complete])
+        scored[PREDICTION_COLUMNS[hazard]] = predictions
+        scored[RISK_COLUMNS[hazard]] = risk_labels(hazard, levels)
+
+    # A forest-fire prediction depends only on the state, so it is a table lookup
+    levels = chunk["State"].map(state_levels).fillna(-1).to_numpy(dtype=np.int64)
+    scored[PREDICTION_COLUMNS["forestfire"]] = pd.array(np.where(levels >= 0, levels, None), dtype="Int8")
+    scored[RISK_COLUMNS["forestfire"]] = risk_labels("forestfire", levels)
+    return scored
+
+
+def score_joined_cities(output: str, chunk_size: int = 50_000, model_dir: Optional[str] = None) -> int:
+    """Score every joined city for all hazards into one .parquet or .csv table; returns the row count."""
+    artifacts = {hazard: get_hazard_artifact(hazard, model_dir) for hazard in HAZARD_CONFIGS}
+    forest_fire = artifacts["forestfire"]
+    state_levels = build_state_lookup(forest_fire["model"], forest_fire["preprocessor"])
+
+    cities = joined_cities()
+    logger.info(f"Scoring {len(cities):,} cities for {', '.join(HAZARD_CONFIGS)} in chunks of {chunk_size:,}")
+    writer = ChunkWriter(output)
+    written = 0
+    try:
+        for start in range(0, len(cities), chunk_size):
+            scored = score_chunk(cities.iloc[start:start + chunk_size], artifacts, state_levels)
+            writer.write(scored)
+            written += len(scored)
+    finally:
+        writer.close()
+    logger.info(f"Wrote {written:,} city risk rows to {output}")
+    return written
@@ -0,0 +1,205 @@
+"""
+Dense lat/long grid scoring for the earthquake, flood and forest-fire models.
+
+The grid is never materialised: each chunk is a range of flat cell indices
+that workers turn into coordinates, score and return. The parent process
+keeps at most a few chunks in flight and appends each result to the output
+file in grid order, so memory stays bounded regardless of grid size.
+"""
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.config.hazard_config import FLOOD_COLUMNS, HAZARD_CONFIGS
+from src.config.logging_config import setup_logging
+from src.data.data_loader import ingest_data
+from src.hazards.risk import classify_risk, load_hazard_encoder, load_hazard_model, risk_labels
+
+logger = setup_logging()
+
+
+class GridSpec:
+    """Regular grid of cell centres over a bounding box, row-major by latitude."""
+
+    def __init__(self, lat_min: float, lat_max: float, lon_min: float, lon_max: float, step: float):
+        if step <= 0:
+            raise ValueError("step must be positive")
+        self.lat_min, self.lat_max = lat_min, lat_max
+        self.lon_min, self.lon_max = lon_min, lon_max
+        self.step = step
+        self.n_lat = int(math.floor((lat_max - lat_min) / step)) + 1
+        self.n_lon = int(math.floor((lon_max - lon_min) / step)) + 1
+
+    @property
+    def size(self) -> int:
+        return self.n_lat * self.n_lon
+
+    def cells(self, start: int, stop: int) -> Tuple[np.ndarray, np.ndarray]:
+        index = np.arange(start, min(stop, self.size), dtype=np.int64)
+        lat_index, lon_index = np.divmod(index, self.n_lon)
+        return self.lat_min + lat_index * self.step, self.lon_min + lon_index * self.step
+
+    def chunks(self, chunk_size: int) -> Iterator[Tuple[int, int]]:
+        for start in range(0, self.size, chunk_size):
+            yield start, min(start + chunk_size, self.size)
+
+
+def training_medians(hazard: str) -> Dict[str, float]:
+    """Median of each non-coordinate feature in the hazard's training data."""
+    config = HAZARD_CONFIGS[hazard]
+    data = ingest_data(config["data_path"])
+    if hazard == "flood":
+        data.columns = FLOOD_COLUMNS
+    return {
+        feature: float(data[feature].median())
+        for feature in config["features"]
+        if feature not in ("Latitude", "Longitude") and pd.api.types.is_numeric_dtype(data[feature])
+    }
+
+
+def forest_fire_state_risk(model, encoder) -> pd.DataFrame:
+    """Risk level per state centroid; a forest-fire prediction depends only on the state."""
+    states = ingest_data(HAZARD_CONFIGS["forestfire"]["cities_path"])
+    states["Predicted_Risk_Level"] = model.predict(encoder.transform(states[["State/UT"]]))
+    return states
+
+
+# Per-process state set by the pool initializer, so the model is loaded once per worker
+_worker = {}
+
+
+def _init_worker(hazard: str, grid: GridSpec, model_path: Optional[str], fill: Dict[str, float],
+                 state_table: Optional[pd.DataFrame]):
+    _worker.clear()
+    _worker.update(hazard=hazard, grid=grid, fill=fill, state_table=state_table)
+    if model_path is not None:
+        model = load_hazard_model(model_path)
+        if hasattr(model, "n_jobs"):
+            # Parallelism comes from the chunk pool; avoid nested thread pools
+            model.n_jobs = 1
+        _worker["model"] = model
+
+
+def _score_chunk(bounds: Tuple[int, int]) -> pd.DataFrame:
+    hazard, grid = _worker["hazard"], _worker["grid"]
+    lat, lon = grid.cells(*bounds)
+
+    if hazard == "forestfire":
+        states = _worker["state_table"]
+        # Nearest state centroid on an equirectangular projection
+        lat_c = states["Latitude"].to_numpy()
+        lon_c = states["Longitude"].to_numpy()
+        dx = (lon[:, None] - lon_c[None, :]) * np.cos(np.radians(lat))[:, None]
+        nearest = np.argmin(dx ** 2 + (lat[:, None] - lat_c[None, :]) ** 2, axis=1)
+        levels = states["Predicted_Risk_Level"].to_numpy()[nearest]
+        return pd.DataFrame({
+            "Latitude": lat, "Longitude": lon,
+            "State/UT": states["State/UT"].to_numpy()[nearest],
+            "Risk_Level": levels.astype(np.int8),
+            "Risk": risk_labels(hazard, levels),
+        })
+
+    features = HAZARD_CONFIGS[hazard]["features"]
+    columns = {"Latitude": lat, "Longitude": lon}
+    matrix = np.empty((lat.size, len(features)), dtype=np.float64)
+    for i, feature in enumerate(features):
+        matrix[:, i] = columns[feature] if feature in columns else _worker["fill"][feature]
+
+    score = _worker["model"].predict(pd.DataFrame(matrix, columns=features))
+    levels = classify_risk(hazard, score)
+    return pd.DataFrame({
+        "Latitude": lat, "Longitude": lon,
+        "Score": score.astype(np.float32),
+        "Risk_Level": levels.astype(np.int8),
+        "Risk": risk_labels(hazard, levels),
+    })
+
+
+class ChunkWriter:
+    """Appends DataFrame chunks to a Parquet or CSV file."""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.format = "parquet" if self.path.suffix == ".parquet" else "csv"
+        self._parquet = None
+        self._header = True
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.path.exists():
+            self.path.unlink()
+
+    def write(self, frame: pd.DataFrame):
+        if self.format == "parquet":
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if self._parquet is None:
+                self._parquet = pq.ParquetWriter(self.path, table.schema)
+            self._parquet.write_table(table)
+        else:
+            frame.to_csv(self.path, mode="a", header=self._header, index=False)
+            self._header = False
+
+    def close(self):
+        if self._parquet is not None:
+            self._parquet.close()
+
+
+def score_grid(
+    hazard: str,
+    grid: GridSpec,
+    output: str,
+    model_path: Optional[str] = None,
+    encoder_path: Optional[str] = None,
+    fill: Optional[Dict[str, float]] = None,
+    chunk_size: int = 500_000,
+    workers: Optional[int] = None,
+) -> int:
+    """Score every grid cell and stream the results to output; returns the cell count."""
+    if hazard not in HAZARD_CONFIGS:
+        raise ValueError(f"Unknown hazard: {hazard}")
+    workers = workers or os.cpu_count() or 1
+
+    state_table = None
+    worker_model_path = model_path
+    if hazard == "forestfire":
+        if model_path is None:
+            raise ValueError("Forest-fire grid scoring needs --model")
+        state_table = forest_fire_state_risk(
+            load_hazard_model(model_path), load_hazard_encoder(model_path, encoder_path)
+        )
+        worker_model_path = None
+    elif model_path is None:
+        raise ValueError(f"{hazard} grid scoring needs --model")
+
+    fill = {**(training_medians(hazard) if hazard != "forestfire" else {}), **(fill or {})}
+    logger.info(f"Scoring {grid.size:,} {hazard} cells in chunks of {chunk_size:,} on {workers} workers")
+
+    writer = ChunkWriter(output)
+    pending = []
+    written = 0
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker,
+            initargs=(hazard, grid, worker_model_path, fill, state_table),
+        ) as pool:
+            for bounds in grid.chunks(chunk_size):
+                pending.append(pool.submit(_score_chunk, bounds))
+                # Bound memory: write the oldest chunk before queueing too many
+                if len(pending) >= 2 * workers:
+                    frame = pending.pop(0).result()
+                    writer.write(frame)
+                    written += len(frame)
+            for future in pending:
+                frame = future.result()
+                writer.write(frame)
+                written += len(frame)
+    finally:
+        writer.close()
+
+    logger.info(f"Wrote {written:,} scored cells to {output}")
+    return written
@@ -0,0 +1,34 @@
+import os
+from typing import Dict
+
+import pandas as pd
+
+from src.data.split_cache import file_digest
+from src.utils import save_model
+
+
+def build_state_lookup(model, encoder) -> Dict[str, int]:
+    """
+    Risk class of every state the forest-fire encoder knows.
+
+    The forest-fire model's only input is the one-hot encoded State/UT, so
+    its output for those states is the whole function; serving answers from
+    this table instead of running the encoder and forest per request.
+    """
+    states = encoder.categories_[0]
+    levels = model.predict(encoder.transform(pd.DataFrame({"State/UT": states})))
+    return {str(state): int(level) for state, level in zip(states.tolist(), levels.tolist())}
+
+
+def save_state_lookup(model, encoder, model_path: str, output: str) -> str:
+    """
+    Save build_state_lookup's table through save_model at output.
+
+    The metadata records the model file the table was built from and its
+    SHA-256, so a server can tell when the table no longer matches the
+    model it serves.
+    """
+    lookup = build_state_lookup(model, encoder)
+    metadata = {"source_model": os.path.basename(model_path), "model_digest": file_digest(model_path)}
+    name = os.path.splitext(os.path.basename(output))[0]
+    return save_model(lookup, name, metadata=metadata, save_dir=os.path.dirname(output) or ".", timestamped=False)
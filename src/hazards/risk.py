@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+
+from src.config.hazard_config import HAZARD_CONFIGS
+from src.utils import load_model_artifact
+
+
+def classify_risk(hazard: str, values) -> np.ndarray:
+    """
+    Vectorized version of the scripts' classify_risk: index into risk_labels.
+
+    Earthquake and flood use half-open bins (value < threshold); forest fire
+    occurrence counts use closed upper bounds (count <= threshold).
+    """
+    thresholds = HAZARD_CONFIGS[hazard]["risk_thresholds"]
+    return np.digitize(np.asarray(values, dtype=np.float64), thresholds, right=(hazard == "forestfire"))
+
+
+def risk_labels(hazard: str, levels) -> pd.Categorical:
+    labels = HAZARD_CONFIGS[hazard]["risk_labels"]
+    return pd.Categorical.from_codes(np.asarray(levels, dtype=np.int64), categories=labels)
+
+
+def load_hazard_model(path):
+    """Load a hazard model saved with joblib.dump or save_model."""
+    return load_model_artifact(path)["model"]
+
+
+def load_hazard_encoder(model_path, encoder_path=None):
+    """Forest-fire state encoder: a separate encoder file if given, else the one saved in the model artifact."""
+    if encoder_path is not None:
+        return load_hazard_model(encoder_path)
+    encoder = load_model_artifact(model_path)["preprocessor"]
+    if encoder is None:
+        raise ValueError(f"{model_path} holds no encoder; pass the encoder file")
+    return encoder
@@ -0,0 +1,159 @@
+"""
+Nearest-neighbour, radius and bounding-box queries over scored places.
+
+Places are the cities (state centroids for forest fire) the prediction
+scripts score, or any scored table with Latitude/Longitude columns such as
+a score_grid output. Distances are great-circle (haversine) distances.
+"""
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.config.hazard_config import HAZARD_CONFIGS
+from src.data.data_loader import ingest_data
+from src.hazards.grid import training_medians
+
+EARTH_RADIUS_KM = 6371.0088
+
+# Column names used by the city datasets and score_grid, mapped to one layout
+PLACE_COLUMNS = {
+    "City": "Name",
+    "State/UT": "State",
+    "Lat": "Latitude",
+    "Long": "Longitude",
+    "Score": "Prediction",
+}
+
+
+def city_places(hazard: str) -> pd.DataFrame:
+    """
+    The hazard's prediction cities with every model feature filled in.
+
+    Features a city file lacks (earthquake depth) get the training median,
+    as in the prediction scripts. Forest-fire places are state centroids and
+    are named after the state.
+    """
+    config = HAZARD_CONFIGS[hazard]
+    places = ingest_data(config["cities_path"]).rename(columns=PLACE_COLUMNS)
+    if hazard != "forestfire":
+        for feature, value in training_medians(hazard).items():
+            if feature not in places:
+                places[feature] = value
+    if "Name" not in places:
+        places["Name"] = places["State"]
+    return places
+
+
+def load_places(path) -> pd.DataFrame:
+    """Scored places from a prediction output file (csv, parquet or feather)."""
+    places = ingest_data(path).rename(columns=PLACE_COLUMNS)
+    missing = {"Latitude", "Longitude", "Risk_Level"} - set(places.columns)
+    if missing:
+        raise ValueError(f"{path} is missing columns: {sorted(missing)}")
+    return places
+
+
+def unit_vectors(lat, lon) -> np.ndarray:
+    """Points on the unit sphere; straight-line (chord) distance between them grows with great-circle distance."""
+    lat, lon = np.radians(lat), np.radians(lon)
+    cos_lat = np.cos(lat)
+    return np.column_stack([cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)])
+
+
+def chord_to_km(chord):
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.clip(np.asarray(chord) / 2, 0, 1))
+
+
+def km_to_chord(km: float) -> float:
+    return 2 * np.sin(min(km / EARTH_RADIUS_KM, np.pi) / 2)
+
+
+class SpatialIndex:
+    """
+    Immutable index over a DataFrame of places with Latitude and Longitude.
+
+    A KD-tree over unit vectors answers nearest and radius queries: chord
+    length is monotonic in great-circle distance, so the neighbours are the
+    haversine ones and distances convert back exactly. Bounding boxes
+    binary-search a latitude-sorted order, then filter longitude.
+
+    Queries return positions into places and, for nearest and radius,
+    distances in km ordered nearest first; records() turns them into rows.
+    min_level keeps places whose Risk_Level is at least that index into the
+    hazard's risk_labels.
+    """
+
+    def __init__(self, places: pd.DataFrame):
+        from scipy.spatial import cKDTree
+
+        self.places = places.reset_index(drop=True)
+        lat = self.places["Latitude"].to_numpy(dtype=np.float64)
+        lon = self.places["Longitude"].to_numpy(dtype=np.float64)
+        # Unbalanced, non-compact nodes build several times faster and query as fast
+        self._tree = cKDTree(unit_vectors(lat, lon), balanced_tree=False, compact_nodes=False)
+        self._levels = (
+            self.places["Risk_Level"].to_numpy(dtype=np.int64) if "Risk_Level" in self.places else None
+        )
+        self._by_lat = np.argsort(lat, kind="stable")
+        self._sorted_lat = lat[self._by_lat]
+        self._lon = lon
+        # Column arrays for records(); building a DataFrame per query costs more than the query
+        self._columns = {column: self.places[column].to_numpy() for column in self.places.columns}
+
+    def __len__(self) -> int:
+        return len(self.places)
+
+    def nearest(
+        self, lat: float, lon: float, k: int = 1, min_level: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        point = unit_vectors(lat, lon)[0]
+        if len(self) == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        fetch = min(k, len(self))
+        while True:
+            chord, index = self._tree.query(point, k=np.arange(1, fetch + 1))
+            if min_level is None:
+                return index, chord_to_km(chord)
+            keep = self._levels[index] >= min_level
+            # Widen the search until k places pass the risk filter or every place was seen
+            if keep.sum() >= k or fetch == len(self):
+                return index[keep][:k], chord_to_km(chord[keep][:k])
+            fetch = min(fetch * 4, len(self))
+
+    def within_radius(
+        self, lat: float, lon: float, radius_km: float,
+        min_level: Optional[int] = None, limit: Optional[int] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        point = unit_vectors(lat, lon)[0]
+        index = np.asarray(self._tree.query_ball_point(point, km_to_chord(radius_km)), dtype=np.int64)
+        if min_level is not None:
+            index = index[self._levels[index] >= min_level]
+        vectors = self._tree.data[index]
+        distance = chord_to_km(np.linalg.norm(vectors - point, axis=1))
+        order = np.argsort(distance, kind="stable")[:limit]
+        return index[order], distance[order]
+
+    def within_bbox(
+        self, lat_min: float, lat_max: float, lon_min: float, lon_max: float,
+        min_level: Optional[int] = None, limit: Optional[int] = None,
+    ) -> np.ndarray:
+        """Positions inside the box in places order; lon_min > lon_max crosses the antimeridian."""
+        start = np.searchsorted(self._sorted_lat, lat_min, side="left")
+        stop = np.searchsorted(self._sorted_lat, lat_max, side="right")
+        candidates = self._by_lat[start:stop]
+        lon = self._lon[candidates]
+        if lon_min <= lon_max:
+            keep = (lon >= lon_min) & (lon <= lon_max)
+        else:
+            keep = (lon >= lon_min) | (lon <= lon_max)
+        if min_level is not None:
+            keep &= self._levels[candidates] >= min_level
+        return np.sort(candidates[keep])[:limit]
+
+    def records(self, index: np.ndarray, distance: Optional[np.ndarray] = None) -> List[Dict]:
+        """Rows at the given positions as dictionaries, with Distance_km when distances are given."""
+        columns = {column: values[index].tolist() for column, values in self._columns.items()}
+        if distance is not None:
+            columns["Distance_km"] = np.asarray(distance).tolist()
+        return [dict(zip(columns, row)) for row in zip(*columns.values())]
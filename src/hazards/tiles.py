@@ -0,0 +1,201 @@
+"""
+Zoom-level tiled GeoJSON for hazard risk maps.
+
+Scored places are projected to Web Mercator pixels once. Below max_zoom,
+places that fall in the same cluster_px square of a tile are merged into
+one feature (count, highest risk level, mean prediction, count per level).
+At max_zoom every place is its own feature. Each zoom's features are written
+as {z}/{x}/{y}.geojson under the output directory, next to a
+metadata.json that the viewer from write_viewer reads, so a map page loads
+only the tiles in view however many places were scored.
+"""
+import json
+import math
+import shutil
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.config.hazard_config import HAZARD_CONFIGS
+from src.config.logging_config import setup_logging
+
+logger = setup_logging()
+
+TILE_SIZE = 256
+# Marker colour per risk level, as on the folium maps
+RISK_COLORS = ["green", "orange", "red"]
+VIEWER_TEMPLATE = Path(__file__).parent / "templates" / "risk_map.html"
+
+
+def mercator_pixels(lat, lon, zoom: int):
+    """Global Web Mercator pixel coordinates of lat/long at a zoom level."""
+    world = TILE_SIZE * 2 ** zoom
+    sin_lat = np.clip(np.sin(np.radians(lat)), -0.9999, 0.9999)
+    x = (np.asarray(lon, dtype=np.float64) + 180.0) / 360.0 * world
+    y = (0.5 - np.log((1 + sin_lat) / (1 - sin_lat)) / (4 * math.pi)) * world
+    return x, y
+
+
+def _cluster(places: pd.DataFrame, cell_x: np.ndarray, cell_y: np.ndarray, n_levels: int) -> pd.DataFrame:
+    """Merge places sharing a pixel cell; all aggregates are bincounts over the cell ids."""
+    keys = cell_x * (int(cell_y.max()) + 1) + cell_y
+    _, first, inverse, counts = np.unique(keys, return_index=True, return_inverse=True, return_counts=True)
+    levels = places["Risk_Level"].to_numpy(dtype=np.int64)
+    highest = np.full(counts.size, -1, dtype=np.int64)
+    np.maximum.at(highest, inverse, levels)
+    clusters = pd.DataFrame({
+        "Latitude": np.bincount(inverse, places["Latitude"].to_numpy()) / counts,
+        "Longitude": np.bincount(inverse, places["Longitude"].to_numpy()) / counts,
+        "Count": counts,
+        "Risk_Level": highest,
+    })
+    level_counts = np.zeros((counts.size, n_levels), dtype=np.int64)
+    np.add.at(level_counts, (inverse, levels), 1)
+    clusters["Levels"] = level_counts.tolist()
+    if "Prediction" in places:
+        clusters["Prediction"] = np.bincount(inverse, places["Prediction"].to_numpy(dtype=np.float64)) / counts
+    # A cluster of one keeps the place's name
+    for column in ("Name", "State"):
+        if column in places:
+            names = places[column].to_numpy()[first]
+            clusters[column] = np.where(counts == 1, names, None)
+    clusters["Cell_X"], clusters["Cell_Y"] = cell_x[first], cell_y[first]
+    return clusters
+
+
+def _feature(row: Dict) -> Dict:
+    properties = {"risk_level": int(row["Risk_Level"]), "count": int(row.get("Count", 1))}
+    if "Levels" in row:
+        properties["levels"] = row["Levels"]
+    if row.get("Prediction") is not None and not pd.isna(row["Prediction"]):
+        properties["prediction"] = round(float(row["Prediction"]), 4)
+    for column in ("Name", "State"):
+        if isinstance(row.get(column), str):
+            properties[column.lower()] = row[column]
+    return {
+        "type": "Feature",
+        "geometry": {"type": "Point", "coordinates": [round(row["Longitude"], 5), round(row["Latitude"], 5)]},
+        "properties": properties,
+    }
+
+
+def _write_tiles(features: pd.DataFrame, tile_x: np.ndarray, tile_y: np.ndarray, zoom_dir: Path) -> int:
+    order = np.lexsort((tile_y, tile_x))
+    features = features.iloc[order].reset_index(drop=True)
+    tile_x, tile_y = tile_x[order], tile_y[order]
+    starts = np.flatnonzero(np.r_[True, (np.diff(tile_x) != 0) | (np.diff(tile_y) != 0)])
+    ends = np.r_[starts[1:], len(features)]
+    columns = [c for c in ("Latitude", "Longitude", "Risk_Level", "Count", "Levels", "Prediction", "Name", "State")
+               if c in features]
+    records = features[columns].to_dict("records")
+    for start, end in zip(starts, ends):
+        path = zoom_dir / str(tile_x[start]) / f"{tile_y[start]}.geojson"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        collection = {"type": "FeatureCollection", "features": [_feature(row) for row in records[start:end]]}
+        with open(path, "w") as file:
+            json.dump(collection, file, separators=(",", ":"))
+    return len(starts)
+
+
+def export_tiles(
+    places: pd.DataFrame,
+    hazard: str,
+    output_dir: str,
+    min_zoom: int = 3,
+    max_zoom: int = 10,
+    cluster_px: int = 32,
+    prediction_label: str = "Prediction",
+) -> Dict[int, int]:
+    """
+    Write tiled GeoJSON for scored places; returns the tile count per zoom.
+
+    places needs Latitude, Longitude and Risk_Level (index into the
+    hazard's risk_labels); Prediction, Name and State are carried into the
+    features when present. cluster_px must divide the 256-pixel tile so
+    clusters never straddle two tiles.
+    """
+    if TILE_SIZE % cluster_px:
+        raise ValueError(f"cluster_px must divide {TILE_SIZE}")
+    if not 0 <= min_zoom <= max_zoom:
+        raise ValueError("Need 0 <= min_zoom <= max_zoom")
+
+    labels = HAZARD_CONFIGS[hazard]["risk_labels"]
+    places = places.reset_index(drop=True)
+    output = Path(output_dir)
+    output.mkdir(parents=True, exist_ok=True)
+    # Project once at max_zoom; lower zooms halve the pixel coordinates per level
+    x, y = mercator_pixels(places["Latitude"].to_numpy(), places["Longitude"].to_numpy(), max_zoom)
+
+    tiles = {}
+    for zoom in range(min_zoom, max_zoom + 1):
+        scale = 2.0 ** (max_zoom - zoom)
+        px, py = x / scale, y / scale
+        if zoom < max_zoom:
+            features = _cluster(
+                places, (px // cluster_px).astype(np.int64), (py // cluster_px).astype(np.int64), len(labels)
+            )
+            tile_x = features["Cell_X"].to_numpy() * cluster_px // TILE_SIZE
+            tile_y = features["Cell_Y"].to_numpy() * cluster_px // TILE_SIZE
+        else:
+            features = places
+            tile_x = (px // TILE_SIZE).astype(np.int64)
+            tile_y = (py // TILE_SIZE).astype(np.int64)
+        tiles[zoom] = _write_tiles(features, tile_x, tile_y, output / str(zoom))
+        logger.info(f"Zoom {zoom}: {len(features):,} features in {tiles[zoom]:,} tiles")
+
+    metadata = {
+        "hazard": hazard,
+        "min_zoom": min_zoom,
+        "max_zoom": max_zoom,
+        "bounds": [
+            float(places["Latitude"].min()), float(places["Longitude"].min()),
+            float(places["Latitude"].max()), float(places["Longitude"].max()),
+        ],
+        "risk_labels": labels,
+        "colors": RISK_COLORS[:len(labels)],
+        "prediction_label": prediction_label,
+        "places": len(places),
+    }
+    with open(output / "metadata.json", "w") as file:
+        json.dump(metadata, file, indent=4)
+    logger.info(f"Wrote {sum(tiles.values()):,} {hazard} tiles to {output}")
+    return tiles
+
+
+def write_viewer(path: str, tiles_url: str, title: Optional[str] = None):
+    """
+    Write the Leaflet page that shows tiles from export_tiles.
+
+    tiles_url is the tile directory relative to the page (or an absolute
+    URL). Browsers do not fetch local files from a file:// page, so serve
+    both over HTTP, e.g. python -m http.server.
+    """
+    page = VIEWER_TEMPLATE.read_text()
+    page = page.replace("__TILES_URL__", json.dumps(tiles_url.rstrip("/")))
+    page = page.replace("__TITLE__", title or "Risk map")
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    Path(path).write_text(page)
+    logger.info(f"Map viewer saved to {path}")
+
+
+def publish_map(tiles_dir: str, site_dir: str, page_name: str, title: Optional[str] = None) -> Path:
+    """
+    Write the viewer of export_tiles output into a static site.
+
+    The page goes to <site_dir>/<page_name> and loads its tiles from
+    Map-Tiles/<tile directory name>. The tiles themselves are not copied:
+    the React frontend serves "Disaster Prediction ML Model/Map-Tiles" under
+    /Map-Tiles and copies it into its build (see its vite.config.js), so
+    they are generated and kept in one place. Its pages embed /<page_name>.
+    """
+    source = Path(tiles_dir)
+    stale = Path(site_dir) / "Map-Tiles" / source.name
+    if stale.exists():
+        # Copy left by versions that published the tiles with the page
+        shutil.rmtree(stale)
+    page = Path(site_dir) / page_name
+    write_viewer(str(page), f"Map-Tiles/{source.name}", title)
+    logger.info(f"Published the {source.name} map to {page}")
+    return page
@@ -0,0 +1,168 @@
+"""
+Train-once pipeline for the earthquake, flood and forest-fire models.
+
+The per-hazard scripts used to reload their CSV and refit a 100-tree forest
+on every run. get_hazard_artifact fits each model once and keeps it in
+model_dir as <model_name>.pkl (the file HazardService serves), refitting
+only when the training data, the model settings or scikit-learn change.
+The prediction scripts, Report.py, grid scoring and the API all use that
+artifact.
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn.metrics import accuracy_score, mean_squared_error
+from sklearn.model_selection import train_test_split
+
+from src.config.hazard_config import HAZARD_CONFIGS, MODEL_PARAMS, SPLIT_PARAMS
+from src.config.logging_config import setup_logging
+from src.data.data_loader import ingest_data
+from src.data.split_cache import file_digest
+from src.hazards.risk import classify_risk, risk_labels
+from src.hazards.spatial import city_places
+from src.utils import load_model_artifact, save_model
+
+logger = setup_logging()
+
+# The directory the API serves hazard models from; HAZARD_MODEL_DIR overrides it for both
+HAZARD_MODEL_DIR = Path(os.getenv("HAZARD_MODEL_DIR") or Path(__file__).resolve().parents[2] / "hazard-models")
+
+# Bump when training changes in a way the settings below do not capture
+TRAINING_FORMAT = 1
+
+
+def load_training_data(hazard: str) -> Tuple[pd.DataFrame, pd.Series]:
+    """Features and target as the hazard's script prepared them."""
+    config = HAZARD_CONFIGS[hazard]
+    data = ingest_data(config["data_path"])
+    if "columns" in config:
+        # Flood-Data.csv headers carry units; rename positionally
+        data.columns = config["columns"]
+
+    if hazard == "forestfire":
+        data.columns = data.columns.str.strip()
+        data[config["target"]] = data[config["periods"]].sum(axis=1)
+        # One row per state: its mean occurrences, binned into the risk class
+        states = data.groupby("State/UT")[config["target"]].mean().reset_index()
+        return states[config["features"]], pd.Series(classify_risk(hazard, states[config["target"]]), name="Risk_Level")
+
+    return data[config["features"]], data[config["target"]]
+
+
+def training_splits(hazard: str):
+    """The scripts' 80/20 split; deterministic, so reports can rebuild the test set without retraining."""
+    X, y = load_training_data(hazard)
+    return train_test_split(X, y, **SPLIT_PARAMS)
+
+
+def hazard_fingerprint(hazard: str) -> str:
+    """Changes when the training data file, the model settings or scikit-learn change."""
+    config = HAZARD_CONFIGS[hazard]
+    settings = {
+        key: config.get(key)
+        for key in ("features", "target", "columns", "periods", "estimator", "risk_thresholds")
+    }
+    digest = hashlib.sha256()
+    digest.update(file_digest(config["data_path"]).encode())
+    digest.update(json.dumps([settings, MODEL_PARAMS, SPLIT_PARAMS], sort_keys=True, default=str).encode())
+    digest.update(f"{TRAINING_FORMAT}:{sklearn.__version__}".encode())
+    return digest.hexdigest()[:32]
+
+
+def _make_estimator(name: str):
+    from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
+    estimators = {
+        "RandomForestRegressor": RandomForestRegressor,
+        "RandomForestClassifier": RandomForestClassifier,
+    }
+    if name not in estimators:
+        raise ValueError(f"Unknown estimator: {name}")
+    return estimators[name](**MODEL_PARAMS)
+
+
+def _transform(frame: pd.DataFrame, encoder):
+    return encoder.transform(frame) if encoder is not None else frame
+
+
+def evaluate_hazard(hazard: str, model, encoder, X_test: pd.DataFrame, y_test: pd.Series) -> Dict[str, float]:
+    """The metrics each script printed: MSE, plus accuracy for flood (at 0.5) and forest fire."""
+    y_pred = model.predict(_transform(X_test, encoder))
+    metrics = {"mse": float(mean_squared_error(y_test, y_pred))}
+    if hazard == "flood":
+        metrics["accuracy"] = float(accuracy_score(y_test, (y_pred >= 0.5).astype(int)))
+    elif hazard == "forestfire":
+        metrics["accuracy"] = float(accuracy_score(y_test, y_pred))
+    return metrics
+
+
+def train_hazard(hazard: str):
+    """Fit the hazard's model; returns (model, encoder or None, test metrics)."""
+    config = HAZARD_CONFIGS[hazard]
+    X_train, X_test, y_train, y_test = training_splits(hazard)
+    encoder = None
+    if hazard == "forestfire":
+        from sklearn.preprocessing import OneHotEncoder
+        # Fitted on every state, as the script encoded before splitting
+        X, _ = load_training_data(hazard)
+        encoder = OneHotEncoder().fit(X)
+
+    logger.info(f"Training {config['estimator']} for {hazard} on {len(X_train)} rows")
+    model = _make_estimator(config["estimator"]).fit(_transform(X_train, encoder), y_train)
+    metrics = evaluate_hazard(hazard, model, encoder, X_test, y_test)
+    logger.info(f"{hazard} test metrics: {metrics}")
+    return model, encoder, metrics
+
+
+def get_hazard_artifact(hazard: str, model_dir: Optional[str] = None, retrain: bool = False) -> Dict:
+    """
+    The hazard's trained artifact, fitting and saving it only when needed.
+
+    The artifact is the save_model dictionary: the model, its encoder as
+    the preprocessor (forest fire) and metadata holding the fingerprint and
+    test metrics. The forest-fire state lookup table is rebuilt with it.
+    """
+    config = HAZARD_CONFIGS[hazard]
+    model_dir = str(model_dir or HAZARD_MODEL_DIR)
+    path = os.path.join(model_dir, f"{config['model_name']}.pkl")
+    fingerprint = hazard_fingerprint(hazard)
+
+    if not retrain and os.path.exists(path):
+        artifact = load_model_artifact(path)
+        if artifact["metadata"].get("fingerprint") == fingerprint:
+            logger.info(f"Using cached {hazard} model {path}")
+            return artifact
+        logger.info(f"{path} was trained on other data or settings; retraining")
+
+    model, encoder, metrics = train_hazard(hazard)
+    metadata = {"hazard": hazard, "fingerprint": fingerprint, "metrics": metrics}
+    save_model(model, config["model_name"], preprocessor=encoder, metadata=metadata,
+               save_dir=model_dir, timestamped=False)
+    if hazard == "forestfire":
+        from src.hazards.lookup import save_state_lookup
+        save_state_lookup(model, encoder, path, os.path.join(model_dir, f"{config['lookup_name']}.pkl"))
+    return load_model_artifact(path)
+
+
+def predict_hazard(hazard: str, artifact: Dict, frame: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    """Model output and risk level (index into risk_labels) for rows holding the hazard's features."""
+    features = HAZARD_CONFIGS[hazard]["features"]
+    predictions = artifact["model"].predict(_transform(frame[features], artifact["preprocessor"]))
+    if hazard == "forestfire":
+        # The classifier predicts the risk class itself
+        return predictions, np.asarray(predictions, dtype=np.int64)
+    return predictions, classify_risk(hazard, predictions)
+
+
+def score_cities(hazard: str, artifact: Dict) -> pd.DataFrame:
+    """The hazard's prediction cities with Prediction, Risk_Level and the Risk label added."""
+    places = city_places(hazard)
+    if hazard == "forestfire":
+        places = places.assign(**{"State/UT": places["State"]})
+    predictions, levels = predict_hazard(hazard, artifact, places)
+    return places.assign(Prediction=predictions, Risk_Level=levels, Risk=risk_labels(hazard, levels))
@@ -0,0 +1,62 @@
+"""
+Compact artifacts for tree models saved by save_model.
+
+A compact artifact holds the model as a reduced-precision CompiledEnsemble
+(see compact_ensemble) next to the original preprocessor. It is plain NumPy
+arrays, so it loads without unpickling library tree objects and is shared
+between processes when memory-mapped. It is saved as
+"<model_name>_compact_<timestamp>.pkl", so the registry serves the newest
+under "<model_name>_compact". Its metadata records the prediction drift
+against the original model on the held-out test set.
+"""
+import os
+from typing import Dict, Optional, Tuple
+
+from src.config.logging_config import setup_logging
+from src.inference.compiled_trees import compact_ensemble, compile_model, prediction_drift
+from src.utils import load_model_artifact, save_model
+
+logger = setup_logging()
+
+COMPACT_SUFFIX = "_compact"
+
+
+def export_compact(
+    artifact_path: str,
+    x_test,
+    value_bits: Optional[int] = None,
+    save_dir: Optional[str] = None,
+    max_drift: Optional[float] = 1e-4,
+) -> Tuple[str, Dict[str, float]]:
+    """
+    Save a compact copy of the artifact; returns its path and the drift on x_test.
+
+    x_test is the preprocessed test split the model was evaluated on. Raises
+    NotImplementedError for models compile_model does not support and
+    ValueError, without saving, when the worst-case drift exceeds max_drift
+    (None disables the check). Quantized boosted models usually need a
+    larger max_drift than the default; see compact_ensemble.
+    """
+    artifact = load_model_artifact(artifact_path)
+    model = artifact["model"]
+    compact = compact_ensemble(compile_model(model), value_bits)
+    drift = prediction_drift(model, compact, x_test)
+    logger.info(
+        f"{os.path.basename(artifact_path)} compact drift on {drift['rows']} test rows: "
+        f"max {drift['max_abs']:.3g}, mean {drift['mean_abs']:.3g}"
+    )
+    if max_drift is not None and drift["max_abs"] > max_drift:
+        raise ValueError(f"Compact model drifts by {drift['max_abs']:.3g}, more than the allowed {max_drift:.3g}")
+
+    model_name = artifact.get("model_name") or os.path.splitext(os.path.basename(artifact_path))[0]
+    metadata = dict(artifact["metadata"])
+    metadata["compact"] = {
+        "source": os.path.basename(artifact_path),
+        "value_bits": value_bits,
+        "drift": drift,
+    }
+    path = save_model(
+        compact, f"{model_name}{COMPACT_SUFFIX}", preprocessor=artifact["preprocessor"], metadata=metadata,
+        save_dir=save_dir or os.path.dirname(artifact_path) or ".",
+    )
+    return path, drift
@@ -0,0 +1,258 @@
+"""
+ONNX export of trained regressors and an onnxruntime inference backend.
+
+convert_to_onnx turns a RandomForest, XGBoost, LightGBM or linear regressor
+and its fitted ColumnTransformer into one ONNX graph that takes the raw
+request columns (one [n, 1] tensor each) and applies the scaling, one-hot
+encoding and model in a single onnxruntime call. Numeric columns enter as
+doubles and are scaled before the cast to float32, as on the native path;
+scaling in float32 moves values across tree thresholds. Without a
+preprocessor the graph takes the encoded float32 matrix as its "input"
+tensor.
+
+export_onnx saves the graph as "<model_name>_onnx_<timestamp>.pkl" through
+save_model, after checking its predictions against the native model on the
+held-out test split; ModelService serves such artifacts with onnxruntime.
+"""
+import os
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.config.logging_config import setup_logging
+from src.utils import save_model
+
+logger = setup_logging()
+
+ONNX_SUFFIX = "_onnx"
+TARGET_OPSET = {"": 17, "ai.onnx.ml": 3}
+
+
+class OnnxRegressor:
+    """
+    Serialized ONNX graph with a lazily created onnxruntime session.
+
+    predict takes the feed from feed() (raw columns) or, for graphs built
+    without a preprocessor, the encoded matrix. Only the graph bytes are
+    pickled; the session is rebuilt by start() after loading.
+    """
+
+    def __init__(self, onnx_bytes: bytes, numeric_columns: List[str], categorical_columns: List[str],
+                 n_features: Optional[int] = None, source: str = ""):
+        self.onnx_bytes = onnx_bytes
+        self.numeric_columns = list(numeric_columns)
+        self.categorical_columns = list(categorical_columns)
+        self.input_columns = self.numeric_columns + self.categorical_columns
+        self.n_features_in_ = n_features
+        self.source = source
+        self.intra_op_threads = None
+        self._session = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_session"] = None
+        return state
+
+    def start(self, intra_op_threads: Optional[int] = None) -> "OnnxRegressor":
+        """Create the CPU session; intra_op_threads of None or 0 lets onnxruntime use every core."""
+        import onnxruntime
+
+        options = onnxruntime.SessionOptions()
+        if intra_op_threads:
+            options.intra_op_num_threads = intra_op_threads
+        # One request batch runs at a time per call, so parallelism is within operators only
+        options.inter_op_num_threads = 1
+        options.execution_mode = onnxruntime.ExecutionMode.ORT_SEQUENTIAL
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self._session = onnxruntime.InferenceSession(
+            self.onnx_bytes, sess_options=options, providers=["CPUExecutionProvider"]
+        )
+        self.intra_op_threads = intra_op_threads
+        self._output_name = self._session.get_outputs()[0].name
+        return self
+
+    def feed(self, rows: List[Dict]) -> Dict[str, np.ndarray]:
+        """Input tensors for request rows holding the raw input columns."""
+        n_rows = len(rows)
+        feed = {
+            column: np.array([row[column] for row in rows], dtype=np.float64).reshape(n_rows, 1)
+            for column in self.numeric_columns
+        }
+        for column in self.categorical_columns:
+            feed[column] = np.array([str(row[column]) for row in rows], dtype=object).reshape(n_rows, 1)
+        return feed
+
+    def feed_frame(self, frame: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """Input tensors for a DataFrame of raw input columns."""
+        feed = {
+            column: frame[column].to_numpy(dtype=np.float64).reshape(-1, 1)
+            for column in self.numeric_columns
+        }
+        for column in self.categorical_columns:
+            feed[column] = frame[column].astype(str).to_numpy(dtype=object).reshape(-1, 1)
+        return feed
+
+    def predict(self, X) -> np.ndarray:
+        if self._session is None:
+            self.start()
+        if not isinstance(X, dict):
+            X = {"input": np.asarray(X, dtype=np.float32)}
+        output = self._session.run([self._output_name], X)[0]
+        return np.asarray(output, dtype=np.float64).ravel()
+
+
+def _register_converters():
+    """Let skl2onnx convert XGBoost and LightGBM estimators inside a pipeline via onnxmltools."""
+    from skl2onnx import update_registered_converter
+    from skl2onnx.common.shape_calculator import calculate_linear_regressor_output_shapes
+
+    try:
+        from xgboost import XGBRegressor
+        from onnxmltools.convert.xgboost.operator_converters.XGBoost import convert_xgboost
+        update_registered_converter(
+            XGBRegressor, "XGBoostXGBRegressor", calculate_linear_regressor_output_shapes, convert_xgboost
+        )
+    except ImportError:
+        pass
+    try:
+        from lightgbm import LGBMRegressor
+        from onnxmltools.convert.lightgbm.operator_converters.LightGbm import convert_lightgbm
+        update_registered_converter(
+            LGBMRegressor, "LightGbmLGBMRegressor", calculate_linear_regressor_output_shapes, convert_lightgbm,
+            options={"split": None},
+        )
+    except ImportError:
+        pass
+
+
+def _input_columns(preprocessor) -> Tuple[List[str], List[str]]:
+    from sklearn.preprocessing import OneHotEncoder
+
+    input_columns = list(preprocessor.feature_names_in_)
+    numeric, categorical = [], []
+    for _, transformer, columns in preprocessor.transformers_:
+        if isinstance(transformer, str):
+            continue
+        columns = [input_columns[c] if isinstance(c, (int, np.integer)) else c for c in columns]
+        (categorical if isinstance(transformer, OneHotEncoder) else numeric).extend(columns)
+    return numeric, categorical
+
+
+def _without_feature_names(model):
+    """
+    XGBoost's ONNX converter only understands f0, f1, ... feature names, so
+    convert a copy whose booster has none; the graph feeds features by position.
+    """
+    if not hasattr(model, "get_booster"):
+        return model
+    import copy
+    model = copy.deepcopy(model)
+    model.get_booster().feature_names = None
+    return model
+
+
+def convert_to_onnx(model, preprocessor=None) -> OnnxRegressor:
+    """One ONNX graph for the preprocessor (if any) and the regressor."""
+    from skl2onnx import convert_sklearn
+    from skl2onnx.common.data_types import DoubleTensorType, FloatTensorType, StringTensorType
+    from skl2onnx.sklapi import CastTransformer
+    from sklearn.pipeline import Pipeline
+
+    _register_converters()
+    name = type(model).__name__
+    estimator = _without_feature_names(model)
+    if preprocessor is None:
+        n_features = int(model.n_features_in_)
+        initial_types = [("input", FloatTensorType([None, n_features]))]
+        graph, numeric, categorical = estimator, [], []
+    else:
+        n_features = None
+        numeric, categorical = _input_columns(preprocessor)
+        initial_types = [(column, DoubleTensorType([None, 1])) for column in numeric]
+        initial_types += [(column, StringTensorType([None, 1])) for column in categorical]
+        cast = CastTransformer(dtype=np.float32).fit(np.zeros((1, 1)))
+        graph = Pipeline([("preprocessor", preprocessor), ("cast", cast), ("model", estimator)])
+
+    onnx_model = convert_sklearn(graph, initial_types=initial_types, target_opset=TARGET_OPSET)
+    logger.info(f"Converted {name} to ONNX ({len(onnx_model.graph.node)} nodes)")
+    converted = OnnxRegressor(onnx_model.SerializeToString(), numeric, categorical, n_features, source=name)
+    if preprocessor is None and hasattr(model, "feature_names_in_"):
+        # Column order of the "input" matrix, for FeatureEncoder.from_model
+        converted.feature_names_in_ = np.asarray(model.feature_names_in_, dtype=object)
+    return converted
+
+
+def raw_inputs(preprocessor, X) -> pd.DataFrame:
+    """
+    Undo a fitted ColumnTransformer: the raw input columns behind transformed
+    rows such as x_test, so the ONNX graph can be checked on the test split.
+    """
+    X = np.asarray(X, dtype=np.float64)
+    frame = {}
+    for name, transformer, columns in preprocessor.transformers_:
+        if isinstance(transformer, str):
+            continue
+        part = X[:, preprocessor.output_indices_[name]]
+        restored = transformer.inverse_transform(part)
+        for i, column in enumerate(columns):
+            frame[column] = restored[:, i]
+    return pd.DataFrame(frame)[list(preprocessor.feature_names_in_)]
+
+
+def onnx_drift(model, preprocessor, onnx_model: OnnxRegressor, x_test) -> Dict[str, float]:
+    """Worst-case and mean absolute gap between the ONNX graph and the native model on x_test."""
+    expected = np.asarray(model.predict(x_test), dtype=np.float64)
+    if preprocessor is None:
+        actual = onnx_model.predict(np.asarray(x_test, dtype=np.float32))
+    else:
+        actual = onnx_model.predict(onnx_model.feed_frame(raw_inputs(preprocessor, x_test)))
+    difference = np.abs(expected - actual)
+    if not len(difference):
+        return {"max_abs": 0.0, "mean_abs": 0.0, "rows": 0}
+    return {"max_abs": float(difference.max()), "mean_abs": float(difference.mean()), "rows": int(len(difference))}
+
+
+def export_onnx(
+    model,
+    preprocessor,
+    model_name: str,
+    x_test,
+    save_dir: str = "ml-models",
+    max_drift: Optional[float] = 1e-4,
+    metadata: Optional[Dict] = None,
+) -> Tuple[str, Dict[str, float]]:
+    """
+    Convert, check parity on x_test and save; returns the artifact path and the drift.
+
+    Raises ValueError, without saving, when the worst-case prediction drift
+    exceeds max_drift (None disables the check).
+    """
+    onnx_model = convert_to_onnx(model, preprocessor)
+    drift = onnx_drift(model, preprocessor, onnx_model, x_test)
+    logger.info(
+        f"{model_name} ONNX drift on {drift['rows']} test rows: "
+        f"max {drift['max_abs']:.3g}, mean {drift['mean_abs']:.3g}"
+    )
+    if max_drift is not None and drift["max_abs"] > max_drift:
+        raise ValueError(f"ONNX model drifts by {drift['max_abs']:.3g}, more than the allowed {max_drift:.3g}")
+
+    metadata = dict(metadata or {})
+    metadata["onnx"] = {"source": model_name, "opset": TARGET_OPSET, "drift": drift}
+    # The preprocessor is part of the graph, so the artifact carries none
+    path = save_model(onnx_model, f"{model_name}{ONNX_SUFFIX}", metadata=metadata, save_dir=save_dir)
+    return path, drift
+
+
+def export_onnx_artifact(artifact_path: str, x_test, save_dir: Optional[str] = None,
+                         max_drift: Optional[float] = 1e-4) -> Tuple[str, Dict[str, float]]:
+    """export_onnx for a model saved by save_model."""
+    from src.utils import load_model_artifact
+
+    artifact = load_model_artifact(artifact_path)
+    model_name = artifact.get("model_name") or os.path.splitext(os.path.basename(artifact_path))[0]
+    metadata = dict(artifact["metadata"], source_artifact=os.path.basename(artifact_path))
+    return export_onnx(
+        artifact["model"], artifact["preprocessor"], model_name, x_test,
+        save_dir=save_dir or os.path.dirname(artifact_path) or ".", max_drift=max_drift, metadata=metadata,
+    )
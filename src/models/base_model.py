@@ -11,4 +11,12 @@ class Model(ABC):
 
     @abstractmethod
     def optimize(self, trial, x_train, y_train, x_test, y_test):
-        pass
\ No newline at end of file
+        pass
+
+    def fit_early_stopping(self, x_train, y_train, x_valid, y_valid, early_stopping_rounds):
+        """
+        Fit until the validation score stops improving. Returns the fitted
+        estimator, which predicts with its best iteration, and the number of
+        boosting rounds up to it; None for models without early stopping.
+        """
+        return None
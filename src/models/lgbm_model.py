@@ -1,20 +1,34 @@
+import lightgbm as lgb
 from lightgbm import LGBMRegressor
 import numpy as np
 from src.config.logging_config import setup_logging
 from src.models.base_model import Model
+from src.optimize.pruning import IntermediateScore
+import optuna
 from typing import Dict, Any
 
 logger = setup_logging()
 
+def pruning_callback(score: IntermediateScore):
+    """LightGBM callback reporting validation R2 to an Optuna trial after each iteration"""
+    def _callback(env):
+        for _, metric, value, _ in env.evaluation_result_list:
+            if metric == "l2":
+                score(env.iteration - env.begin_iteration, value)
+    return _callback
+
 class LightGBMModel(Model):
     def __init__(self, config: Dict[str, Any]):
         self.config = config
 
-    def train(self, x_train, y_train, **kwargs):
+    def train(self, x_train, y_train, eval_set=None, callbacks=None, **kwargs):
         logger.info("Training LightGBM model...")
         train_config = {**self.config, **kwargs}
         reg = LGBMRegressor(**train_config)
-        reg.fit(x_train, y_train)
+        if eval_set is not None:
+            reg.fit(x_train, y_train, eval_set=eval_set, eval_metric="l2", callbacks=callbacks)
+        else:
+            reg.fit(x_train, y_train)
         return reg
 
     def optimize(self, trial, x_train, y_train, x_test, y_test):
@@ -25,6 +39,8 @@ class LightGBMModel(Model):
         
         try:
             reg = self.train(x_train, y_train, 
+                            eval_set=[(x_test, y_test)],
+                            callbacks=[pruning_callback(IntermediateScore(trial, y_test))],
                             n_estimators=n_estimators, 
                             max_depth=max_depth, 
                             learning_rate=learning_rate)
@@ -34,6 +50,20 @@ class LightGBMModel(Model):
             if not np.isfinite(score):
                 return float('-inf')
             return score
+        except optuna.TrialPruned:
+            raise
         except Exception as e:
             logger.error(f"Error during LightGBM optimization: {e}")
-            return float('-inf')
\ No newline at end of file
+            return float('-inf')
+
+    def fit_early_stopping(self, x_train, y_train, x_valid, y_valid, early_stopping_rounds):
+        reg = self.train(x_train, y_train,
+                         eval_set=[(x_valid, y_valid)],
+                         callbacks=[lgb.early_stopping(early_stopping_rounds, verbose=False)])
+        # best_iteration_ is 0 when the validation score never improved
+        n_rounds = reg.best_iteration_ or reg.n_estimators
+        # Re-dump the booster with only the rounds up to the best one, so the
+        # saved model holds no rounds past it
+        reg.booster_.model_from_string(reg.booster_.model_to_string(num_iteration=n_rounds))
+        reg.set_params(n_estimators=n_rounds)
+        return reg, n_rounds
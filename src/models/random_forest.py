@@ -1,11 +1,18 @@
 from src.config.logging_config import setup_logging
 from sklearn.ensemble import RandomForestRegressor
 from src.models.base_model import Model
+from src.optimize.pruning import IntermediateScore
+import math
 import numpy as np
+import optuna
 from typing import Dict, Any
 
 logger = setup_logging()
 
+# A forest is grown in this many warm-started stages during tuning, with the
+# validation score reported after each so poor trials can be pruned
+PRUNING_STAGES = 4
+
 class RandomForestModel(Model):
     def __init__(self, config: Dict[str, Any]):
         self.config = config
@@ -26,17 +33,27 @@ class RandomForestModel(Model):
         min_samples_leaf = trial.suggest_int("min_samples_leaf", 1, 20)
         
         try:
-            reg = self.train(x_train, y_train, 
-                        n_estimators=n_estimators, 
-                        max_depth=max_depth, 
-                        min_samples_split=min_samples_split, 
-                        min_samples_leaf=min_samples_leaf)
-            
+            train_config = {**self.config,
+                            "max_depth": max_depth,
+                            "min_samples_split": min_samples_split,
+                            "min_samples_leaf": min_samples_leaf,
+                            "warm_start": True}
+            reg = RandomForestRegressor(**train_config)
+            intermediate = IntermediateScore(trial, y_test)
+            stages = min(PRUNING_STAGES, n_estimators)
+            for stage in range(1, stages + 1):
+                reg.set_params(n_estimators=math.ceil(n_estimators * stage / stages))
+                reg.fit(x_train, y_train)
+                if stage < stages:
+                    intermediate.report(stage, reg.score(x_test, y_test))
+
             score = reg.score(x_test, y_test)
             
             if not np.isfinite(score):
                 return float('-inf')
             return score
+        except optuna.TrialPruned:
+            raise
         except Exception as e:
             logger.error(f"Error during RandomForest optimization: {e}")
             return float('-inf')
\ No newline at end of file
@@ -1,21 +1,37 @@
 from src.config.logging_config import setup_logging
 import xgboost as xgb
 from src.models.base_model import Model
+from src.optimize.pruning import IntermediateScore
 import numpy as np
+import optuna
 from typing import Dict, Any
 
 logger = setup_logging()
 
+class PruningCallback(xgb.callback.TrainingCallback):
+    """Reports validation R2 to an Optuna trial after each boosting round"""
+
+    def __init__(self, score: IntermediateScore):
+        self.score = score
+
+    def after_iteration(self, model, epoch, evals_log):
+        rmse = evals_log["validation_0"]["rmse"][-1]
+        self.score(epoch, rmse ** 2)
+        return False
+
 class XGBoostModel(Model):
     def __init__(self, config: Dict[str, Any]):
         self.config = config
 
-    def train(self, x_train, y_train, **kwargs):
+    def train(self, x_train, y_train, eval_set=None, **kwargs):
         logger.info("Training XGBoost model...")
         # Merge the initial config with any additional kwargs
         train_config = {**self.config, **kwargs}
         reg = xgb.XGBRegressor(**train_config, enable_categorical=True)
-        reg.fit(x_train, y_train)
+        if eval_set is not None:
+            reg.fit(x_train, y_train, eval_set=eval_set, verbose=False)
+        else:
+            reg.fit(x_train, y_train)
         return reg
 
     def optimize(self, trial, x_train, y_train, x_test, y_test):
@@ -26,6 +42,9 @@ class XGBoostModel(Model):
 
         try:
             reg = self.train(x_train, y_train, 
+                            eval_set=[(x_test, y_test)],
+                            eval_metric="rmse",
+                            callbacks=[PruningCallback(IntermediateScore(trial, y_test))],
                             n_estimators=n_estimators, 
                             max_depth=max_depth, 
                             learning_rate=learning_rate)
@@ -33,6 +52,20 @@ class XGBoostModel(Model):
             if not np.isfinite(score):
                 return float('-inf')
             return score
+        except optuna.TrialPruned:
+            raise
         except Exception as e:
             logger.error(f"Error during XGBoost optimization: {e}")
-            return float('-inf')
\ No newline at end of file
+            return float('-inf')
+
+    def fit_early_stopping(self, x_train, y_train, x_valid, y_valid, early_stopping_rounds):
+        reg = self.train(x_train, y_train,
+                         eval_set=[(x_valid, y_valid)],
+                         eval_metric="rmse",
+                         early_stopping_rounds=early_stopping_rounds)
+        n_rounds = reg.best_iteration + 1
+        # Keep only the rounds up to the best one, so the saved booster (and the
+        # node arrays compiled from it) holds no rounds past it
+        trimmed = xgb.XGBRegressor(**{**reg.get_params(), "n_estimators": n_rounds, "early_stopping_rounds": None})
+        trimmed.load_model(reg.get_booster()[:n_rounds].save_raw("json"))
+        return trimmed, n_rounds
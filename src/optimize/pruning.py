@@ -0,0 +1,35 @@
+import numpy as np
+import optuna
+
+
+class IntermediateScore:
+    """
+    Reports a trial's validation score while it trains, so the study's
+    pruner can stop it early.
+
+    Boosting libraries report validation MSE per iteration; it is turned
+    into R2, the score the tuner maximizes, so intermediate values are on
+    the same scale as the final objective.
+    """
+
+    def __init__(self, trial, y_valid, report_every: int = 10):
+        self.trial = trial
+        self.report_every = report_every
+        self.variance = float(np.var(np.asarray(y_valid, dtype=np.float64)))
+
+    def r2(self, mse: float) -> float:
+        if self.variance == 0:
+            return float("-inf")
+        return 1.0 - mse / self.variance
+
+    def __call__(self, step: int, mse: float):
+        if (step + 1) % self.report_every:
+            return
+        self.report(step, self.r2(mse))
+
+    def report(self, step: int, score: float):
+        if not np.isfinite(score):
+            return
+        self.trial.report(score, step)
+        if self.trial.should_prune():
+            raise optuna.TrialPruned(f"Pruned at step {step} with score {score:.4f}")
@@ -1,29 +1,188 @@
 from src.config.logging_config import setup_logging
+from concurrent.futures import ProcessPoolExecutor
+import json
+import os
+import tempfile
 import optuna
 
 logger = setup_logging()
 
+PRUNERS = ("median", "hyperband", "none")
+FINISHED_STATES = (optuna.trial.TrialState.COMPLETE, optuna.trial.TrialState.PRUNED)
+
+
+def make_pruner(name: str) -> optuna.pruners.BasePruner:
+    if name == "median":
+        # Let a few trials finish before judging, and never prune on the first report
+        return optuna.pruners.MedianPruner(n_startup_trials=5, n_warmup_steps=1)
+    if name == "hyperband":
+        return optuna.pruners.HyperbandPruner()
+    if name == "none":
+        return optuna.pruners.NopPruner()
+    raise ValueError(f"Unknown pruner: {name}")
+
+
+def make_storage(storage: str):
+    """
+    Optuna storage shared by worker processes.
+
+    Database URLs (sqlite:///tuning.db) are passed through; any other value
+    is a journal file path, which needs no database and is safe for several
+    processes on one machine.
+    """
+    if "://" in storage:
+        return storage
+    try:
+        from optuna.storages.journal import JournalFileBackend
+    except ImportError:
+        # Optuna < 4.0
+        from optuna.storages import JournalFileStorage as JournalFileBackend
+    return optuna.storages.JournalStorage(JournalFileBackend(storage))
+
+
+def load_best_params(study_dir: str, model_name: str):
+    """Best parameters from the last tuning run of model_name, on any dataset"""
+    path = os.path.join(study_dir, f"{model_name}.best.json")
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r") as file:
+            return json.load(file)
+    except json.JSONDecodeError:
+        logger.warning(f"Ignoring unreadable best parameters in {path}")
+        return None
+
+
+def save_best_params(study_dir: str, model_name: str, params):
+    os.makedirs(study_dir, exist_ok=True)
+    path = os.path.join(study_dir, f"{model_name}.best.json")
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as file:
+        json.dump(params, file, indent=4)
+    os.replace(tmp_path, path)
+
+
+def _tuning_worker(model, shared, study_name, storage, pruner, n_trials, timeout, n_threads):
+    from threadpoolctl import threadpool_limits
+    from src.data.shared_data import load_shared_splits
+
+    x_train, x_test, y_train, y_test = load_shared_splits(shared)
+    model.config = {**model.config, "n_jobs": n_threads}
+    tuner = HyperparameterTuner(model, x_train, y_train, x_test, y_test, pruner=pruner)
+    study = optuna.load_study(
+        study_name=study_name, storage=make_storage(storage), pruner=make_pruner(pruner)
+    )
+    # Stop every worker once the study as a whole has run n_trials
+    stop = optuna.study.MaxTrialsCallback(n_trials, states=FINISHED_STATES)
+    with threadpool_limits(limits=n_threads):
+        study.optimize(tuner.objective, timeout=timeout, callbacks=[stop])
+
+
 class HyperparameterTuner:
-    def __init__(self, model, x_train, y_train, x_test, y_test):
+    def __init__(self, model, x_train, y_train, x_test, y_test, pruner: str = "median", n_threads=None):
         logger.info(f"Initializing HyperparameterTuner for {model.__class__.__name__}")
         self.model = model
         self.x_train = x_train
         self.y_train = y_train
         self.x_test = x_test
         self.y_test = y_test
+        self.pruner = pruner
+        # Threads the whole search may use, split between parallel tuning
+        # workers; None means every core
+        self.n_threads = n_threads
+
+    def worker_threads(self, n_jobs):
+        """Threads each of n_jobs tuning workers gets out of the search's budget"""
+        budget = self.n_threads or os.cpu_count() or 1
+        return max(1, budget // n_jobs)
 
     def objective(self, trial):
         try:
             return self.model.optimize(trial, self.x_train, self.y_train, self.x_test, self.y_test)
+        except optuna.TrialPruned:
+            raise
         except Exception as e:
             logger.error(f"Error in optimization trial: {e}")
             return float('-inf')
 
-    def optimize(self, n_trials=100):
-        logger.info(f"Starting hyperparameter optimization for {n_trials} trials.")
-        study = optuna.create_study(direction="maximize")
-        study.optimize(self.objective, n_trials=n_trials)
-        logger.info("Optimization completed.")
+    def optimize(self, n_trials=100, n_jobs=1, timeout=None, storage=None, study_name=None, warm_start=None):
+        """
+        Search hyperparameters and return the best ones.
+
+        Args:
+            n_trials: Total number of trials in the study, counting trials
+                finished by earlier runs of the same persistent study
+            n_jobs: Worker processes running trials at the same time
+            timeout: Wall-clock budget in seconds; running trials finish, no new ones start
+            storage: Journal file path or database URL for the study; a
+                temporary journal is used when n_jobs > 1 and none is given
+            study_name: Name of a persistent study to resume from storage
+            warm_start: Parameters tried first when the study is new
+        """
+        logger.info(
+            f"Starting hyperparameter optimization for {n_trials} trials "
+            f"({n_jobs} workers, timeout={timeout}, pruner={self.pruner})."
+        )
+        if n_jobs <= 1:
+            study = self._open_study(make_storage(storage) if storage else None, study_name, warm_start)
+            remaining = n_trials - self._finished(study)
+            if remaining > 0:
+                study.optimize(self.objective, n_trials=remaining, timeout=timeout)
+            return self._best_params(study)
+
+        with tempfile.TemporaryDirectory(prefix="tuning_") as directory:
+            storage = storage or os.path.join(directory, "study.log")
+            study = self._optimize_parallel(
+                n_trials, n_jobs, timeout, storage, study_name, warm_start, directory
+            )
+            return self._best_params(study)
+
+    def _open_study(self, storage, study_name, warm_start):
+        study = optuna.create_study(
+            direction="maximize",
+            storage=storage,
+            study_name=study_name,
+            pruner=make_pruner(self.pruner),
+            load_if_exists=True,
+        )
+        finished = self._finished(study)
+        if finished:
+            logger.info(f"Resuming study {study.study_name} with {finished} finished trials.")
+        elif warm_start and not study.trials:
+            logger.info(f"Seeding study {study.study_name} with previous best parameters {warm_start}")
+            study.enqueue_trial(warm_start, skip_if_exists=True)
+        return study
+
+    @staticmethod
+    def _finished(study):
+        return len(study.get_trials(deepcopy=False, states=FINISHED_STATES))
+
+    def _best_params(self, study):
+        pruned = len(study.get_trials(deepcopy=False, states=(optuna.trial.TrialState.PRUNED,)))
+        logger.info(f"Optimization completed: {len(study.trials)} trials, {pruned} pruned.")
         best_params = study.best_params
         logger.info(f"Best parameters: {best_params}")
-        return best_params
\ No newline at end of file
+        return best_params
+
+    def _optimize_parallel(self, n_trials, n_jobs, timeout, storage, study_name, warm_start, directory):
+        from src.data.shared_data import share_splits
+
+        study = self._open_study(make_storage(storage), study_name, warm_start)
+        if self._finished(study) >= n_trials:
+            return study
+        # Workers memory-map the data instead of each receiving a pickled copy
+        shared = share_splits(
+            self.x_train, self.x_test, self.y_train, self.y_test, os.path.join(directory, "splits")
+        )
+        n_threads = self.worker_threads(n_jobs)
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            futures = [
+                pool.submit(
+                    _tuning_worker, self.model, shared, study.study_name, storage,
+                    self.pruner, n_trials, timeout, n_threads,
+                )
+                for _ in range(n_jobs)
+            ]
+            for future in futures:
+                future.result()
+        return optuna.load_study(study_name=study.study_name, storage=make_storage(storage))
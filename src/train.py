@@ -3,38 +3,105 @@ import mlflow
 from sklearn.base import RegressorMixin
 import pandas as pd
 import numpy as np
+from sklearn.model_selection import train_test_split
 from src.config.logging_config import setup_logging
 from src.config.model_config import ModelNameConfig
 from src.data.data_loader import ingest_data, clean_data
 from src.models.model_factory import get_model
-from src.optimize.tuner import HyperparameterTuner
+from src.optimize.tuner import HyperparameterTuner, load_best_params, save_best_params
 import logging
+import os
 from src.config.model_config import ModelNameConfig, MODEL_CONFIGS
-from src.utils import save_model
+from src.utils import save_model, dataset_fingerprint
 
 logger = setup_logging()
 
+def tune(tuner, config, x_train, x_test, y_train, y_test):
+    """
+    Run the hyperparameter search for config.model_name.
+
+    With a study_dir the study is stored there under the model name and the
+    dataset fingerprint, so an interrupted or repeated run on the same data
+    resumes it. A study for new data starts from the previous best parameters.
+    """
+    if not config.study_dir:
+        return tuner.optimize(
+            n_trials=config.n_trials, n_jobs=config.tuning_jobs, timeout=config.tuning_timeout
+        )
+
+    study_name = f"{config.model_name}-{dataset_fingerprint(x_train, x_test, y_train, y_test)}"
+    os.makedirs(config.study_dir, exist_ok=True)
+    best_params = tuner.optimize(
+        n_trials=config.n_trials,
+        n_jobs=config.tuning_jobs,
+        timeout=config.tuning_timeout,
+        storage=os.path.join(config.study_dir, f"{study_name}.log"),
+        study_name=study_name,
+        warm_start=load_best_params(config.study_dir, config.model_name),
+    )
+    save_best_params(config.study_dir, config.model_name, best_params)
+    return best_params
+
+def early_stopping(model, config, x_train, y_train):
+    """
+    Fit with early stopping on a validation split held out from the
+    training data, so the test set stays unseen.
+
+    Returns the early-stopped estimator, trimmed to its best number of
+    boosting rounds, and that number, or None for models that do not support
+    early stopping.
+    """
+    x_fit, x_valid, y_fit, y_valid = train_test_split(
+        x_train, y_train, test_size=config.validation_fraction, random_state=42
+    )
+    stopped = model.fit_early_stopping(x_fit, y_fit, x_valid, y_valid, config.early_stopping_rounds)
+    if stopped is not None:
+        logger.info(
+            f"Early stopping: best iteration for {config.model_name} is {stopped[1]} "
+            f"of {model.config.get('n_estimators')}"
+        )
+    return stopped
+
 def train_model(
     x_train: pd.DataFrame,
     x_test: pd.DataFrame,
     y_train: pd.Series,
     y_test: pd.Series,
     config: ModelNameConfig,
+    preprocessor=None,
 ) -> RegressorMixin:
     try:
-        model_config = MODEL_CONFIGS[config.model_name]
         model = get_model(config.model_name)
+        # Work on a copy so neither the thread budget nor tuned parameters
+        # leak into MODEL_CONFIGS for later models
+        model.config = dict(model.config)
+        if config.n_jobs is not None:
+            model.config["n_jobs"] = config.n_jobs
 
-        tuner = HyperparameterTuner(model, x_train, y_train, x_test, y_test)
+        tuner = HyperparameterTuner(
+            model, x_train, y_train, x_test, y_test, pruner=config.pruner, n_threads=config.n_jobs
+        )
 
         if config.fine_tuning:
-            best_params = tuner.optimize()
-            model_config.update(best_params)
-            trained_model = model.train(x_train, y_train)
-        else:
+            best_params = tune(tuner, config, x_train, x_test, y_train, y_test)
+            model.config.update(best_params)
+            logger.info(f"Training final {config.model_name} model with {model.config}")
+
+        metadata = {}
+        trained_model = None
+        if config.early_stopping_rounds:
+            stopped = early_stopping(model, config, x_train, y_train)
+            if stopped is not None:
+                trained_model, n_estimators = stopped
+                metadata["best_iteration"] = n_estimators
+                if config.refit_after_early_stopping:
+                    logger.info(f"Refitting {config.model_name} with {n_estimators} rounds on all training rows")
+                    model.config["n_estimators"] = n_estimators
+                    trained_model = None
+        if trained_model is None:
             trained_model = model.train(x_train, y_train)
 
-        save_model(trained_model, config.model_name)
+        save_model(trained_model, config.model_name, preprocessor, metadata=metadata)
         return trained_model
     except Exception as e:
         logger.error(f"Error in train_model: {e}")
@@ -44,13 +111,13 @@ if __name__ == "__main__":
     try:
         # Load and preprocess data
         raw_data = ingest_data("/datasets/main_dataset_2.csv")
-        x_train, x_test, y_train, y_test = clean_data(raw_data)
+        x_train, x_test, y_train, y_test, preprocessor = clean_data(raw_data)
 
         # Set up model configuration
         model_config = ModelNameConfig(model_name="xgboost", fine_tuning=True)
 
         # Train the model
-        trained_model = train_model(x_train, x_test, y_train, y_test, model_config)
+        trained_model = train_model(x_train, x_test, y_train, y_test, model_config, preprocessor)
 
         # Here you can add code to save the model, evaluate it, etc.
         logging.info("Model training completed successfully.")
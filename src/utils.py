@@ -1,5 +1,6 @@
 from datetime import datetime
 import os
+import pickle
 import numpy as np
 from src.config.logging_config import setup_logging
 logger = setup_logging()
@@ -13,16 +14,157 @@ def log_exception(func):
             raise
     return wrapper
 
-def save_model(model, model_name):
-    save_dir = "ml-models"
+# Bump when the layout of the saved artifact dictionary changes
+ARTIFACT_VERSION = 2
+# Version 1 artifacts always held the estimator itself under "model"
+SUPPORTED_ARTIFACT_VERSIONS = (1, ARTIFACT_VERSION)
+
+def save_model(model, model_name, preprocessor=None, metadata=None, save_dir="ml-models", timestamped=True):
+    """
+    Save a trained model as a versioned artifact.
+
+    The artifact bundles the estimator with the fitted preprocessor it was
+    trained behind, so serving can apply exactly the same transform. Files
+    are named <model_name>_<timestamp>.pkl, or <model_name>.pkl when
+    timestamped is False, and are renamed into place once fully written so
+    a server watching save_dir never loads a partial file.
+
+    Tree ensembles that compile_model supports also get their node arrays
+    stored under "compiled" (see CompiledEnsemble.to_arrays), with their
+    largest gap to native predict under "compiled_difference". Those are the
+    arrays a server loading with mmap_mode='r' can serve from the page cache.
+    Their estimator is stored pickled, as a byte array under "model_pickle",
+    so such a server never has to unpickle it (see load_model_artifact).
+    """
     os.makedirs(save_dir, exist_ok=True)
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"{model_name}_{timestamp}.pkl"
+    filename = f"{model_name}_{timestamp}.pkl" if timestamped else f"{model_name}.pkl"
     filepath = os.path.join(save_dir, filename)
 
+    artifact = {
+        "artifact_version": ARTIFACT_VERSION,
+        "model_name": model_name,
+        "created_at": timestamp,
+        "model": model,
+        "preprocessor": preprocessor,
+        # Training details such as the early-stopping best iteration
+        "metadata": metadata or {},
+    }
+    compiled = _compiled(model)
+    if compiled is not None:
+        from src.inference.compiled_trees import max_abs_difference
+        artifact["compiled"] = compiled.to_arrays()
+        artifact["compiled_difference"] = max_abs_difference(model, compiled)
+        artifact["model"] = None
+        artifact["model_pickle"] = np.frombuffer(
+            pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL), dtype=np.uint8
+        )
+
     import joblib
-    joblib.dump(model, filepath)
+    tmp_path = f"{filepath}.tmp"
+    joblib.dump(artifact, tmp_path, compress=0)
+    os.replace(tmp_path, filepath)
     logger.info(f"Model saved to {filepath}")
+    return filepath
+
+def _compiled(model):
+    """CompiledEnsemble of a supported tree ensemble, or None."""
+    from src.inference.compiled_trees import CompiledEnsemble, compile_model
+    if isinstance(model, CompiledEnsemble):
+        # Compact artifacts already are node arrays
+        return None
+    try:
+        return compile_model(model)
+    except NotImplementedError:
+        return None
+
+def load_estimator(artifact):
+    """The artifact's estimator, unpickling it from "model_pickle" if it was left pickled"""
+    if artifact["model"] is None and artifact.get("model_pickle") is not None:
+        return pickle.loads(memoryview(artifact["model_pickle"]))
+    return artifact["model"]
+
+def load_model_artifact(filepath, mmap_mode=None, load_model=True):
+    """
+    Load an artifact written by save_model.
+
+    With mmap_mode='r' plain NumPy arrays in the artifact, such as the
+    "compiled" node arrays, are mapped read-only from the file, so several
+    server processes share them through the page cache. Estimators copy
+    their buffers while unpickling (sklearn trees, XGBoost and LightGBM
+    boosters), so each process that unpickles one holds its own copy.
+    With load_model=False an estimator stored under "model_pickle" is left
+    pickled and "model" is None; load_estimator unpickles it when needed.
+
+    Older files that hold a bare estimator are wrapped so callers always get
+    the same dictionary layout back.
+    """
+    import joblib
+    artifact = joblib.load(filepath, mmap_mode=mmap_mode)
+    if isinstance(artifact, dict) and "model" in artifact:
+        version = artifact.get("artifact_version")
+        if version not in SUPPORTED_ARTIFACT_VERSIONS:
+            raise ValueError(f"Unsupported artifact version {version} in {filepath}")
+        if load_model:
+            artifact["model"] = load_estimator(artifact)
+        return artifact
+    return {
+        "artifact_version": None,
+        "model": artifact,
+        "preprocessor": None,
+        "metadata": {},
+    }
+
+def with_feature_names(model, X):
+    """
+    X as a DataFrame with the columns the estimator was fitted with.
+
+    Serving encodes requests into plain arrays already in the model's feature
+    order; naming the columns keeps scikit-learn's feature-name check quiet
+    without silencing the warning for real mismatches. X is returned as is
+    for estimators fitted without names or inputs that are not matrices.
+    """
+    names = getattr(model, "feature_names_in_", None)
+    if names is None or not isinstance(X, np.ndarray) or X.ndim != 2 or X.shape[1] != len(names):
+        return X
+    import pandas as pd
+    return pd.DataFrame(X, columns=names, copy=False)
+
+def _has_byte_view(dtype):
+    """Whether a column's values are a fixed-width NumPy buffer"""
+    return isinstance(dtype, np.dtype) and dtype.kind in "biufcmM"
+
+def dataset_fingerprint(*frames, length=16):
+    """
+    Short content hash of one or more DataFrames/Series.
+
+    Column names, dtypes, shapes and values all contribute, so any change to
+    the data or to the preprocessing that produced it gives a new fingerprint.
+    Numeric data is hashed as raw bytes. Frames holding object, string or
+    categorical columns, which have no fixed-width buffer, are hashed column
+    by column, those columns through pd.util.hash_pandas_object.
+    """
+    import hashlib
+    import pandas as pd
+    digest = hashlib.sha256()
+    for frame in frames:
+        names = frame.columns if hasattr(frame, "columns") else [frame.name]
+        digest.update(repr([str(name) for name in names]).encode())
+        dtypes = frame.dtypes if hasattr(frame, "columns") else [frame.dtype]
+        if all(_has_byte_view(dtype) for dtype in dtypes):
+            values = np.ascontiguousarray(frame.to_numpy())
+            digest.update(f"{values.dtype}{values.shape}".encode())
+            digest.update(values.view(np.uint8).reshape(-1))
+            continue
+        frame = frame.to_frame() if isinstance(frame, pd.Series) else frame
+        digest.update(f"{[str(dtype) for dtype in frame.dtypes]}{frame.shape}".encode())
+        for _, column in frame.items():
+            if _has_byte_view(column.dtype):
+                values = np.ascontiguousarray(column.to_numpy())
+            else:
+                values = pd.util.hash_pandas_object(column, index=False).to_numpy()
+            digest.update(values.view(np.uint8).reshape(-1))
+    return digest.hexdigest()[:length]
 
 def check_data(X, y, dataset_name):
     logger.info(f"Checking {dataset_name} dataset...")
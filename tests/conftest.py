@@ -0,0 +1,29 @@
+import os
+import sys
+
+# Tests import the api and src packages from the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+
+def _regressor(name):
+    if name == "randomforest":
+        from sklearn.ensemble import RandomForestRegressor
+        return RandomForestRegressor(n_estimators=20, max_depth=6, random_state=0)
+    if name == "xgboost":
+        from xgboost import XGBRegressor
+        return XGBRegressor(n_estimators=30, max_depth=4)
+    if name == "lightgbm":
+        from lightgbm import LGBMRegressor
+        return LGBMRegressor(n_estimators=30, num_leaves=15, verbose=-1)
+    if name == "linear_regression":
+        from sklearn.linear_model import LinearRegression
+        return LinearRegression()
+    raise ValueError(f"Unknown regressor {name}")
+
+
+@pytest.fixture
+def make_regressor():
+    """Builds the small unfitted regressor tests parametrize over, by model name"""
+    return _regressor
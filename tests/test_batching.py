@@ -0,0 +1,76 @@
+import asyncio
+
+import pytest
+
+from api.services.batching import RequestCoalescer
+from api.services.inference_executor import InferenceExecutor
+
+
+class RecordingScorer:
+    """score_batch that doubles each row's x and records the batches it was called with"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, model_name, rows):
+        self.calls.append((model_name, [row["x"] for row in rows]))
+        if any(row["x"] < 0 for row in rows):
+            raise ValueError("negative x")
+        return [row["x"] * 2 for row in rows]
+
+
+def _submit_all(coalescer, requests):
+    """Submit (model_name, x) requests concurrently; returns results or exceptions, in order."""
+    async def scenario():
+        executor = InferenceExecutor(max_workers=1, max_queue_depth=8)
+        try:
+            return await asyncio.gather(
+                *(coalescer.submit(model, {"x": x}, executor) for model, x in requests),
+                return_exceptions=True,
+            )
+        finally:
+            executor.shutdown()
+
+    return [r if isinstance(r, Exception) else r[0] for r in asyncio.run(scenario())]
+
+
+def test_concurrent_requests_share_one_batch_in_order():
+    scorer = RecordingScorer()
+    coalescer = RequestCoalescer(scorer, max_batch_size=64, max_wait_ms=50)
+    results = _submit_all(coalescer, [("m", x) for x in range(10)])
+    assert results == [x * 2 for x in range(10)]
+    assert scorer.calls == [("m", list(range(10)))]
+
+
+def test_full_batch_is_dispatched_without_waiting_for_the_window():
+    scorer = RecordingScorer()
+    # A window no test would wait out: only the size limit can dispatch these
+    coalescer = RequestCoalescer(scorer, max_batch_size=4, max_wait_ms=60_000)
+    results = _submit_all(coalescer, [("m", x) for x in range(8)])
+    assert results == [x * 2 for x in range(8)]
+    assert scorer.calls == [("m", [0, 1, 2, 3]), ("m", [4, 5, 6, 7])]
+
+
+def test_models_are_batched_separately():
+    scorer = RecordingScorer()
+    coalescer = RequestCoalescer(scorer, max_batch_size=64, max_wait_ms=50)
+    results = _submit_all(coalescer, [("a", 1), ("b", 2), ("a", 3), ("b", 4)])
+    assert results == [2, 4, 6, 8]
+    assert sorted(scorer.calls) == [("a", [1, 3]), ("b", [2, 4])]
+
+
+def test_a_failing_row_only_fails_its_own_request():
+    scorer = RecordingScorer()
+    coalescer = RequestCoalescer(scorer, max_batch_size=64, max_wait_ms=50)
+    results = _submit_all(coalescer, [("m", 1), ("m", -1), ("m", 3)])
+    assert results[0] == 2 and results[2] == 6
+    assert isinstance(results[1], ValueError)
+    # The shared batch failed, then each row was scored on its own
+    assert scorer.calls[0] == ("m", [1, -1, 3])
+    assert scorer.calls[1:] == [("m", [1]), ("m", [-1]), ("m", [3])]
+
+
+def test_zero_window_disables_coalescing():
+    assert not RequestCoalescer(RecordingScorer(), max_wait_ms=0).enabled
+    with pytest.raises(ValueError):
+        RequestCoalescer(RecordingScorer(), max_batch_size=0)
@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from api.services.model_service import ModelService
+from src.inference.compact import COMPACT_SUFFIX, export_compact
+from src.utils import load_model_artifact, save_model
+
+FEATURES = ["elevation", "slope", "rainfall_daily", "soil_moisture"]
+
+
+@pytest.fixture(scope="module")
+def data():
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(600, len(FEATURES))), columns=FEATURES)
+    y = 1 / (1 + np.exp(-(X["elevation"] - X["slope"] ** 2 + X["rainfall_daily"] * X["soil_moisture"])))
+    return X[:500], y[:500], X[500:]
+
+
+@pytest.mark.parametrize("value_bits", [None, 16, 8])
+@pytest.mark.parametrize("name", ["randomforest", "xgboost", "lightgbm"])
+def test_served_compact_model_stays_within_its_reported_drift(tmp_path, data, make_regressor, name, value_bits):
+    x_train, y_train, x_test = data
+    model = make_regressor(name).fit(x_train, y_train)
+    source = save_model(model, name, save_dir=str(tmp_path), timestamped=False)
+    path, drift = export_compact(source, x_test, value_bits, max_drift=None)
+    assert load_model_artifact(path)["metadata"]["compact"]["drift"] == drift
+    if value_bits is None:
+        # float32 leaves only round the last digits
+        assert drift["max_abs"] <= 1e-4
+
+    service = ModelService(tmp_path, metrics_path=str(tmp_path / "metrics.txt"))
+    loaded = service.get_loaded(f"{name}{COMPACT_SUFFIX}")
+    assert loaded.backend == "compact"
+    served = loaded.predict(x_test.to_numpy(np.float32))
+    gap = np.abs(served - model.predict(x_test))
+    assert gap.max() <= drift["max_abs"] + 1e-6
+    assert gap.mean() == pytest.approx(drift["mean_abs"], abs=1e-6)
+
+
+def test_export_refuses_a_drifting_compact_model(tmp_path, data, make_regressor):
+    x_train, y_train, x_test = data
+    source = save_model(make_regressor("lightgbm").fit(x_train, y_train), "lightgbm",
+                        save_dir=str(tmp_path), timestamped=False)
+    with pytest.raises(ValueError, match="drifts"):
+        export_compact(source, x_test, value_bits=8, max_drift=1e-9)
+    assert [p.name for p in tmp_path.glob("*.pkl")] == ["lightgbm.pkl"]
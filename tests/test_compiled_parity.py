@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.inference.compiled_trees import HybridEnsemble, compile_model
+
+TOLERANCE = 1e-4
+
+
+@pytest.fixture(scope="module")
+def data():
+    """Landslide-like features with missing values in training and test rows."""
+    rng = np.random.default_rng(0)
+    n_rows = 1200
+    X = pd.DataFrame({
+        "elevation": rng.uniform(-1, 1, n_rows),
+        "slope": rng.uniform(-1, 1, n_rows),
+        "rainfall_daily": rng.normal(size=n_rows),
+        "soil_moisture": rng.normal(size=n_rows),
+        "lithology_shale": rng.integers(0, 2, n_rows).astype(np.float64),
+    })
+    y = 1 / (1 + np.exp(-(2 * X["slope"] - X["elevation"] + X["rainfall_daily"] * X["lithology_shale"])))
+    X = X.mask(rng.random(X.shape) < 0.15)
+    return X[:1000], y[:1000], X[1000:].to_numpy(dtype=np.float32)
+
+
+@pytest.mark.parametrize("name", ["randomforest", "xgboost", "lightgbm"])
+def test_compiled_matches_native_with_missing_values(data, make_regressor, name):
+    x_train, y_train, x_test = data
+    model = make_regressor(name).fit(x_train, y_train)
+    compiled = compile_model(model)
+    expected = model.predict(pd.DataFrame(x_test, columns=x_train.columns))
+    assert np.isnan(x_test).any(axis=1).sum() > 50
+    np.testing.assert_allclose(compiled.predict(x_test), expected, atol=TOLERANCE, rtol=0)
+    # Rows that are entirely missing follow every default branch
+    empty = np.full((3, x_test.shape[1]), np.nan, dtype=np.float32)
+    np.testing.assert_allclose(
+        compiled.predict(empty), model.predict(pd.DataFrame(empty, columns=x_train.columns)),
+        atol=TOLERANCE, rtol=0,
+    )
+
+
+@pytest.mark.parametrize("name", ["randomforest", "xgboost", "lightgbm"])
+def test_hybrid_ensemble_matches_native_on_both_paths(data, make_regressor, name):
+    x_train, y_train, x_test = data
+    model = make_regressor(name).fit(x_train, y_train)
+    hybrid = HybridEnsemble(model, compile_model(model), max_compiled_rows=16)
+    expected = model.predict(pd.DataFrame(x_test, columns=x_train.columns))
+    # Small batches go through the compiled trees, large ones through the library
+    np.testing.assert_allclose(hybrid.predict(x_test[:8]), expected[:8], atol=TOLERANCE, rtol=0)
+    np.testing.assert_allclose(hybrid.predict(x_test), expected, atol=TOLERANCE, rtol=0)
+
+
+def test_compact_copy_round_trips_through_arrays(data, make_regressor):
+    from src.inference.compiled_trees import CompiledEnsemble, compact_ensemble
+
+    x_train, y_train, x_test = data
+    model = make_regressor("xgboost").fit(x_train, y_train)
+    compact = compact_ensemble(compile_model(model))
+    restored = CompiledEnsemble.from_arrays(compact.to_arrays())
+    np.testing.assert_array_equal(restored.predict(x_test), compact.predict(x_test))
@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.data_loader import IngestData, ingest_data, pipeline_columns
+
+pytest.importorskip("pyarrow")
+
+
+def _frame():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        "date": pd.date_range("2024-01-01", periods=10).astype(str),
+        "latitude": rng.uniform(size=10),
+        "slope": rng.uniform(size=10),
+        "new_feature": rng.uniform(size=10),
+        "lithology": rng.choice(["basalt", "shale"], 10),
+        "landslide_occurred": rng.integers(0, 2, 10),
+    })
+
+
+@pytest.fixture(params=["csv", "parquet", "feather"])
+def data_file(request, tmp_path):
+    path = tmp_path / f"data.{request.param}"
+    frame = _frame()
+    if request.param == "csv":
+        frame.to_csv(path, index=False)
+    elif request.param == "parquet":
+        frame.to_parquet(path)
+    else:
+        frame.to_feather(path)
+    return str(path)
+
+
+def test_column_names_come_from_the_file(data_file):
+    assert IngestData(data_file).column_names() == _frame().columns.tolist()
+
+
+def test_pipeline_reads_every_column_but_the_dropped_ones(data_file):
+    columns = pipeline_columns(data_file)
+    assert columns == ["slope", "new_feature", "lithology", "landslide_occurred"]
+    frame = ingest_data(data_file, columns=columns)
+    assert frame.columns.tolist() == columns
+    np.testing.assert_allclose(frame["new_feature"], _frame()["new_feature"])
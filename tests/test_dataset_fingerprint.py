@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+
+from src.utils import dataset_fingerprint
+
+
+def _frame():
+    return pd.DataFrame({
+        "slope": np.linspace(0, 60, 6),
+        "previous_landslides": np.arange(6),
+        "lithology": ["basalt", "granite", "shale", "basalt", "granite", "shale"],
+        "land_use": pd.Categorical(["forest", "urban", "forest", "barren", "urban", "forest"]),
+        "human_activity": pd.array(["low", "high", None, "medium", "low", "high"], dtype="string"),
+    })
+
+
+def test_object_and_categorical_columns_are_fingerprinted():
+    frame = _frame()
+    fingerprint = dataset_fingerprint(frame, frame["lithology"])
+    assert fingerprint == dataset_fingerprint(_frame(), _frame()["lithology"])
+    assert len(fingerprint) == 16
+
+
+def test_fingerprint_changes_with_string_values():
+    frame = _frame()
+    changed = _frame()
+    changed.loc[2, "lithology"] = "limestone"
+    assert dataset_fingerprint(frame) != dataset_fingerprint(changed)
+    changed = _frame()
+    changed["land_use"] = changed["land_use"].astype(object)
+    assert dataset_fingerprint(frame) != dataset_fingerprint(changed)
+
+
+def test_numeric_frames_keep_their_byte_fingerprint():
+    frame = _frame()[["slope", "previous_landslides"]]
+    assert dataset_fingerprint(frame) != dataset_fingerprint(frame.assign(slope=frame["slope"] + 1e-9))
+    assert dataset_fingerprint(frame) != dataset_fingerprint(frame.astype(np.float32))
@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.models.lgbm_model import LightGBMModel
+from src.models.xgboost_model import XGBoostModel
+
+
+@pytest.fixture(scope="module")
+def splits():
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(600, 4)), columns=["elevation", "slope", "rainfall_daily", "soil_moisture"])
+    # Noisy target, so validation loss turns well before the round limit
+    y = X["elevation"] + rng.normal(scale=1.0, size=len(X))
+    return X[:480], y[:480], X[480:], y[480:]
+
+
+def _rounds(reg):
+    if hasattr(reg, "get_booster"):
+        return reg.get_booster().num_boosted_rounds()
+    return reg.booster_.num_trees()
+
+
+@pytest.mark.parametrize("model", [
+    XGBoostModel({"n_estimators": 400, "learning_rate": 0.3, "max_depth": 4}),
+    LightGBMModel({"n_estimators": 400, "learning_rate": 0.3, "num_leaves": 15, "verbose": -1}),
+], ids=["xgboost", "lightgbm"])
+def test_early_stopped_model_is_trimmed_to_its_best_round(splits, model):
+    x_fit, y_fit, x_valid, y_valid = splits
+    reg, n_rounds = model.fit_early_stopping(x_fit, y_fit, x_valid, y_valid, early_stopping_rounds=10)
+    assert n_rounds < 400
+    assert _rounds(reg) == n_rounds
+
+    # Same predictions as a model trained for exactly that many rounds
+    full = model.train(x_fit, y_fit, n_estimators=n_rounds)
+    np.testing.assert_allclose(reg.predict(x_valid), full.predict(x_valid), rtol=1e-5, atol=1e-6)
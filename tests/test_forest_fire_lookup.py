@@ -0,0 +1,70 @@
+import joblib
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.preprocessing import OneHotEncoder
+
+from api.models.schemas import HazardType
+from api.services.hazard_service import HazardService
+from src.hazards.lookup import build_state_lookup, save_state_lookup
+from src.utils import save_model
+
+STATES = ["Assam", "Goa", "Kerala", "Odisha"]
+
+
+def _fit(levels):
+    encoder = OneHotEncoder(handle_unknown="ignore").fit(pd.DataFrame({"State/UT": STATES}))
+    model = RandomForestClassifier(n_estimators=5, bootstrap=False, random_state=0)
+    model.fit(encoder.transform(pd.DataFrame({"State/UT": STATES})), levels)
+    return model, encoder
+
+
+def _save(tmp_path, model, encoder):
+    return save_model(model, "forest_fire_model", preprocessor=encoder, save_dir=str(tmp_path), timestamped=False)
+
+
+def _predict(service):
+    rows = [{"state": state} for state in STATES]
+    _, levels, errors = service.predict_batch(HazardType.forestfire, rows)
+    assert not errors
+    return levels.tolist()
+
+
+def test_lookup_built_from_the_served_model_is_used(tmp_path, monkeypatch):
+    model, encoder = _fit([0, 1, 2, 0])
+    model_path = _save(tmp_path, model, encoder)
+    save_state_lookup(model, encoder, model_path, str(tmp_path / "forest_fire_lookup.pkl"))
+
+    service = HazardService(model_dir=tmp_path)
+    assert service._state_lookup({"model_name": "forest_fire_model", "lookup_name": "forest_fire_lookup"})
+    # Answers come from the table alone
+    monkeypatch.setattr(HazardService, "_get_model_and_encoder", lambda *args: (_ for _ in ()).throw(AssertionError))
+    assert _predict(service) == [0, 1, 2, 0]
+
+
+def test_stale_lookup_falls_back_to_the_model(tmp_path):
+    old_model, old_encoder = _fit([0, 1, 2, 0])
+    old_path = _save(tmp_path, old_model, old_encoder)
+    save_state_lookup(old_model, old_encoder, old_path, str(tmp_path / "forest_fire_lookup.pkl"))
+
+    # The model is retrained without rebuilding the table
+    model, encoder = _fit([2, 2, 0, 1])
+    _save(tmp_path, model, encoder)
+    service = HazardService(model_dir=tmp_path)
+    assert _predict(service) == [2, 2, 0, 1]
+
+
+def test_lookup_without_provenance_falls_back_to_the_model(tmp_path):
+    model, encoder = _fit([1, 0, 0, 2])
+    _save(tmp_path, model, encoder)
+    # Tables written before provenance was recorded were bare dictionaries
+    stale = {state: 0 for state in STATES}
+    joblib.dump(stale, tmp_path / "forest_fire_lookup.pkl")
+    service = HazardService(model_dir=tmp_path)
+    assert _predict(service) == [1, 0, 0, 2]
+
+
+def test_lookup_alone_is_served_without_a_model(tmp_path):
+    model, encoder = _fit([0, 1, 2, 0])
+    joblib.dump(build_state_lookup(model, encoder), tmp_path / "forest_fire_lookup.pkl")
+    service = HazardService(model_dir=tmp_path)
+    assert _predict(service) == [0, 1, 2, 0]
@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
+from sklearn.preprocessing import OneHotEncoder
+
+from src.config.hazard_config import HAZARD_CONFIGS
+from src.hazards.cities import joined_cities, score_joined_cities
+from src.hazards.spatial import city_places
+from src.hazards.training import hazard_fingerprint
+from src.utils import save_model
+
+pytest.importorskip("pyarrow")
+
+
+def _save(model, hazard, model_dir, encoder=None):
+    # The current fingerprint makes get_hazard_artifact use these instead of retraining
+    metadata = {"hazard": hazard, "fingerprint": hazard_fingerprint(hazard)}
+    save_model(model, HAZARD_CONFIGS[hazard]["model_name"], preprocessor=encoder, metadata=metadata,
+               save_dir=str(model_dir), timestamped=False)
+
+
+def _keys(places):
+    """City and state, as joined_cities matches them"""
+    return set(places["Name"].str.strip().str.casefold() + "|" + places["State"].str.strip().str.casefold())
+
+
+@pytest.fixture(scope="module")
+def models(tmp_path_factory):
+    model_dir = tmp_path_factory.mktemp("hazard-models")
+    rng = np.random.default_rng(0)
+    fitted = {}
+    for hazard in ("earthquake", "flood"):
+        features = HAZARD_CONFIGS[hazard]["features"]
+        X = pd.DataFrame(rng.uniform(0, 100, (200, len(features))), columns=features)
+        y = X[features[0]] / 10 + X[features[-1]] / 50
+        fitted[hazard] = RandomForestRegressor(n_estimators=5, random_state=0).fit(X, y)
+        _save(fitted[hazard], hazard, model_dir)
+
+    states = city_places("forestfire")[["State"]].rename(columns={"State": "State/UT"})
+    encoder = OneHotEncoder(handle_unknown="ignore").fit(states)
+    classes = np.arange(len(states)) % 3
+    fitted["forestfire"] = RandomForestClassifier(n_estimators=5, bootstrap=False, random_state=0).fit(
+        encoder.transform(states), classes
+    )
+    _save(fitted["forestfire"], "forestfire", model_dir, encoder)
+    fitted["state_levels"] = dict(zip(states["State/UT"], classes))
+    return model_dir, fitted
+
+
+def test_city_files_are_joined_once_per_city(models, tmp_path):
+    model_dir, fitted = models
+    output = str(tmp_path / "city_risk.parquet")
+    # Chunks smaller than the table, so rows from several chunks are appended
+    written = score_joined_cities(output, chunk_size=64, model_dir=str(model_dir))
+    scored = pd.read_parquet(output)
+
+    earthquake, flood = city_places("earthquake"), city_places("flood")
+    assert written == len(scored) == len(_keys(earthquake) | _keys(flood))
+    assert not (scored["City"].str.casefold() + "|" + scored["State"].str.casefold()).duplicated().any()
+
+    cities = joined_cities()
+    assert scored["City"].tolist() == cities["Name"].tolist()
+    np.testing.assert_allclose(
+        scored["Earthquake_Magnitude"], fitted["earthquake"].predict(cities[["Latitude", "Longitude", "Depth"]])
+    )
+
+    # Only cities from the flood list have flood inputs
+    has_flood = cities["Rainfall_mm"].notna().to_numpy()
+    assert has_flood.sum() == len(flood)
+    assert scored.loc[~has_flood, "Flood_Risk_Score"].isna().all()
+    inputs = cities.loc[has_flood, ["Latitude_flood", "Longitude_flood", "Rainfall_mm", "Elevation_m",
+                                     "River_Discharge_m3_s"]]
+    inputs.columns = HAZARD_CONFIGS["flood"]["features"]
+    np.testing.assert_allclose(scored.loc[has_flood, "Flood_Risk_Score"], fitted["flood"].predict(inputs))
+
+    # Forest-fire risk follows the city's state
+    expected_levels = cities["State"].map(fitted["state_levels"])
+    assert expected_levels.notna().all()
+    assert scored["ForestFire_Risk_Level"].astype(int).tolist() == expected_levels.astype(int).tolist()
@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+
+from src.config.hazard_config import HAZARD_CONFIGS
+from src.hazards.grid import GridSpec, score_grid
+from src.hazards.risk import classify_risk
+from src.utils import save_model
+
+pytest.importorskip("pyarrow")
+
+
+@pytest.fixture(scope="module")
+def earthquake_model(tmp_path_factory):
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame({
+        "Latitude": rng.uniform(5, 15, 300),
+        "Longitude": rng.uniform(65, 80, 300),
+        "Depth": rng.uniform(0, 60, 300),
+    })
+    y = 3.5 + (X["Latitude"] - 10) / 5 + X["Depth"] / 100
+    model = RandomForestRegressor(n_estimators=10, random_state=0).fit(X, y)
+    path = save_model(model, "earthquake_model", save_dir=str(tmp_path_factory.mktemp("models")), timestamped=False)
+    return model, path
+
+
+def _read(path):
+    return pd.read_parquet(path) if path.endswith(".parquet") else pd.read_csv(path)
+
+
+@pytest.mark.parametrize("suffix", [".parquet", ".csv"])
+def test_chunked_grid_matches_one_unchunked_predict(tmp_path, earthquake_model, suffix):
+    model, model_path = earthquake_model
+    grid = GridSpec(8.0, 10.0, 70.0, 72.5, 0.25)
+    output = str(tmp_path / f"earthquake{suffix}")
+    # 16 does not divide the 99 cells, so the last chunk is a partial one
+    written = score_grid("earthquake", grid, output, model_path=model_path, fill={"Depth": 20.0},
+                         chunk_size=16, workers=2)
+    assert written == grid.size == 99
+
+    scored = _read(output)
+    assert len(scored) == grid.size
+    lat, lon = grid.cells(0, grid.size)
+    np.testing.assert_allclose(scored["Latitude"], lat)
+    np.testing.assert_allclose(scored["Longitude"], lon)
+
+    cells = pd.DataFrame({"Latitude": lat, "Longitude": lon, "Depth": 20.0})
+    expected = model.predict(cells)
+    np.testing.assert_allclose(scored["Score"], expected.astype(np.float32), rtol=1e-6)
+    np.testing.assert_array_equal(scored["Risk_Level"], classify_risk("earthquake", expected))
+    labels = HAZARD_CONFIGS["earthquake"]["risk_labels"]
+    assert scored["Risk"].astype(str).tolist() == [labels[level] for level in scored["Risk_Level"]]
@@ -0,0 +1,117 @@
+import asyncio
+
+import httpx
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi import FastAPI
+from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
+from sklearn.preprocessing import OneHotEncoder
+
+from api.routers.hazards import legacy_router, router
+from api.services.hazard_service import HazardService
+from api.services.inference_executor import InferenceExecutor
+from src.config.hazard_config import HAZARD_CONFIGS
+from src.hazards.risk import classify_risk
+from src.utils import save_model
+
+STATES = ["Assam", "Goa", "Kerala"]
+
+
+def _regressor(hazard, target, n_rows=60):
+    features = HAZARD_CONFIGS[hazard]["features"]
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.uniform(0, 50, (n_rows, len(features))), columns=features)
+    return RandomForestRegressor(n_estimators=5, random_state=0).fit(X, target(X))
+
+
+@pytest.fixture(scope="module")
+def models(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("hazard-models")
+    earthquake = _regressor("earthquake", lambda X: 3 + X["Depth"] / 25)
+    flood = _regressor("flood", lambda X: (X["Rainfall_mm"] > 25).astype(float))
+    encoder = OneHotEncoder(handle_unknown="ignore").fit(pd.DataFrame({"State/UT": STATES}))
+    forest_fire = RandomForestClassifier(n_estimators=5, bootstrap=False, random_state=0)
+    forest_fire.fit(encoder.transform(pd.DataFrame({"State/UT": STATES})), [0, 1, 2])
+
+    save_model(earthquake, "earthquake_model", save_dir=str(directory), timestamped=False)
+    save_model(flood, "flood_model", save_dir=str(directory), timestamped=False)
+    save_model(forest_fire, "forest_fire_model", preprocessor=encoder, save_dir=str(directory), timestamped=False)
+    return directory, {"earthquake": earthquake, "flood": flood}
+
+
+@pytest.fixture
+def app(models):
+    app = FastAPI()
+    app.include_router(router, prefix="/api/v1/hazards")
+    app.include_router(legacy_router)
+    app.state.hazard_service = HazardService(model_dir=models[0])
+    app.state.inference_executor = InferenceExecutor(max_workers=1, max_queue_depth=8)
+    yield app
+    app.state.inference_executor.shutdown()
+
+
+def _post(app, path, body):
+    async def send():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.post(path, json=body)
+
+    return asyncio.run(send())
+
+
+def _expected(models, hazard, rows):
+    features = HAZARD_CONFIGS[hazard]["features"]
+    X = pd.DataFrame([[row[feature.lower()] for feature in features] for row in rows], columns=features)
+    predictions = models[1][hazard].predict(X)
+    labels = [HAZARD_CONFIGS[hazard]["risk_labels"][level] for level in classify_risk(hazard, predictions)]
+    return predictions, labels
+
+
+def test_earthquake_batch_keeps_order_and_reports_errors_per_row(app, models):
+    rows = [
+        {"latitude": 10.0, "longitude": 20.0, "depth": 5.0},
+        {"latitude": 100.0, "longitude": 20.0, "depth": 5.0},
+        {"latitude": 12.0, "longitude": 22.0, "depth": 45.0},
+        {"latitude": 12.0, "longitude": 22.0},
+        {"latitude": 30.0, "longitude": 40.0, "depth": 25.0},
+    ]
+    response = _post(app, "/api/v1/hazards/earthquake/predict/batch", {"inputs": rows})
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [result["index"] for result in results] == list(range(len(rows)))
+    assert results[1]["error"].startswith("latitude") and results[1]["prediction"] is None
+    assert results[3]["error"].startswith("depth") and results[3]["prediction"] is None
+
+    valid = [0, 2, 4]
+    predictions, labels = _expected(models, "earthquake", [rows[i] for i in valid])
+    np.testing.assert_allclose([results[i]["prediction"] for i in valid], predictions)
+    assert [results[i]["risk_level"] for i in valid] == labels
+
+
+def test_forest_fire_batch_reports_unknown_states_per_row(app):
+    columns = {"state": ["Goa", "Atlantis", "Assam"]}
+    results = _post(app, "/api/v1/hazards/forestfire/predict/batch", {"columns": columns}).json()["results"]
+    assert [result["risk_level"] for result in results] == ["Medium Prone", None, "Less Prone"]
+    assert results[1]["error"] == "Unknown state: Atlantis"
+
+
+def test_legacy_predict_keeps_the_flask_response_keys(app, models):
+    earthquake = {"latitude": 12.0, "longitude": 22.0, "depth": 45.0}
+    flood = {"latitude": 12.0, "longitude": 22.0, "rainfall_mm": 40.0, "elevation_m": 5.0,
+             "river_discharge_m3_s": 10.0}
+
+    response = _post(app, "/predict", {"model_type": "earthquake", **earthquake}).json()
+    assert response == {"model_type": "earthquake",
+                        "predicted_magnitude": pytest.approx(_expected(models, "earthquake", [earthquake])[0][0])}
+    response = _post(app, "/predict", {"model_type": "flood", **flood}).json()
+    assert response == {"model_type": "flood",
+                        "predicted_flood_risk": pytest.approx(_expected(models, "flood", [flood])[0][0])}
+    response = _post(app, "/predict", {"model_type": "forestfire", "state": "Kerala"}).json()
+    assert response == {"model_type": "forestfire", "predicted_risk_level": "High"}
+
+
+def test_legacy_predict_rejects_missing_inputs(app):
+    response = _post(app, "/predict", {"model_type": "flood", "latitude": 12.0})
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("Missing input data for flood model")
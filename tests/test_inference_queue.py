@@ -0,0 +1,110 @@
+import asyncio
+import threading
+
+import httpx
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi import FastAPI
+from sklearn.compose import ColumnTransformer
+from sklearn.linear_model import LinearRegression
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+from api.models.schemas import PredictionFeatures
+from api.routers.predictions import router
+from api.services.inference_executor import InferenceExecutor, QueueFullError
+from api.services.model_service import ModelService
+from src.utils import save_model
+
+CATEGORIES = {"lithology": ["basalt", "shale"], "land_use": ["forest", "urban"], "human_activity": ["low", "high"]}
+
+
+def _rows(n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    numeric = [name for name, field in PredictionFeatures.model_fields.items() if field.annotation is not str]
+    rows = pd.DataFrame({name: rng.uniform(0, 1, n_rows) for name in numeric})
+    rows["previous_landslides"] = rng.integers(0, 3, n_rows)
+    for name, values in CATEGORIES.items():
+        rows[name] = rng.choice(values, n_rows)
+    return rows
+
+
+@pytest.fixture
+def app(tmp_path):
+    rows = _rows(200)
+    numeric = [column for column in rows.columns if column not in CATEGORIES]
+    preprocessor = ColumnTransformer([
+        ("num", StandardScaler(), numeric),
+        ("cat", OneHotEncoder(handle_unknown="ignore"), list(CATEGORIES)),
+    ])
+    model = LinearRegression().fit(preprocessor.fit_transform(rows), rows["slope"])
+    save_model(model, "linear_regression", preprocessor=preprocessor, save_dir=str(tmp_path), timestamped=False)
+
+    app = FastAPI()
+    app.include_router(router, prefix="/api/v1")
+    app.state.model_service = ModelService(tmp_path, metrics_path=str(tmp_path / "metrics.txt"))
+    # One worker and no waiting room: a second request while one runs is rejected
+    app.state.inference_executor = InferenceExecutor(max_workers=1, max_queue_depth=0)
+    yield app
+    app.state.inference_executor.shutdown()
+
+
+def _request():
+    row = _rows(1, seed=1).iloc[0].to_dict()
+    row["previous_landslides"] = int(row["previous_landslides"])
+    return {**row, "model_name": "linear_regression"}
+
+
+async def _while_busy(app, send):
+    """Occupy the only inference worker, call send(client) and free the worker again."""
+    executor = app.state.inference_executor
+    release = threading.Event()
+    busy = asyncio.ensure_future(executor.run(release.wait))
+    await asyncio.sleep(0)
+    assert executor.in_flight == executor.capacity
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        try:
+            response = await send(client)
+        finally:
+            release.set()
+            await busy
+        after = await send(client)
+    return response, after
+
+
+def test_predict_returns_503_when_the_queue_is_full(app):
+    response, after = asyncio.run(_while_busy(app, lambda client: client.post("/api/v1/predict", json=_request())))
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    assert "queue is full" in response.json()["detail"]
+    assert after.status_code == 200
+    assert app.state.inference_executor.in_flight == 0
+
+
+def test_batch_predict_returns_503_when_the_queue_is_full(app):
+    request = _request()
+    body = {"model_name": request.pop("model_name"), "inputs": [request, request]}
+    response, after = asyncio.run(_while_busy(app, lambda client: client.post("/api/v1/predict/batch", json=body)))
+    assert response.status_code == 503
+    assert after.status_code == 200
+    assert len(after.json()["results"]) == 2
+
+
+def test_executor_rejects_beyond_capacity_and_recovers():
+    async def scenario():
+        executor = InferenceExecutor(max_workers=1, max_queue_depth=1)
+        release = threading.Event()
+        running = [asyncio.ensure_future(executor.run(release.wait)) for _ in range(executor.capacity)]
+        await asyncio.sleep(0)
+        with pytest.raises(QueueFullError):
+            await executor.run(lambda: None)
+        release.set()
+        await asyncio.gather(*running)
+        result, timing = await executor.run(lambda: 42)
+        executor.shutdown()
+        return result, timing, executor.in_flight
+
+    result, timing, in_flight = asyncio.run(scenario())
+    assert result == 42 and in_flight == 0
+    assert timing.queue_wait_ms >= 0 and timing.execution_ms >= 0
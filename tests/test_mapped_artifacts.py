@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+
+from api.services.model_service import ModelService
+from src.utils import load_model_artifact, save_model
+
+FEATURES = ["elevation", "slope", "rainfall_daily", "soil_moisture"]
+
+
+@pytest.fixture(scope="module")
+def training_frame():
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(400, len(FEATURES))), columns=FEATURES)
+    y = 1 / (1 + np.exp(-(X["elevation"] - X["slope"] ** 2)))
+    return X, y
+
+
+@pytest.mark.parametrize("name", ["randomforest", "xgboost", "lightgbm"])
+def test_served_node_arrays_are_memory_mapped(tmp_path, training_frame, make_regressor, name):
+    X, y = training_frame
+    model = make_regressor(name).fit(X, y)
+    save_model(model, name, save_dir=str(tmp_path), timestamped=False)
+
+    service = ModelService(tmp_path, mmap_mode="r", metrics_path=str(tmp_path / "metrics.txt"))
+    loaded = service.get_loaded(name)
+    assert loaded.backend == "mapped"
+    assert loaded.model.is_memory_mapped
+    assert isinstance(loaded.model.threshold, np.memmap)
+    assert isinstance(loaded.model.left, np.memmap)
+
+    expected = model.predict(X)
+    np.testing.assert_allclose(loaded.model.predict(X.to_numpy(np.float32)), expected, atol=1e-5)
+
+
+def test_mapped_serving_never_unpickles_the_estimator(tmp_path, training_frame, monkeypatch):
+    X, y = training_frame
+    save_model(RandomForestRegressor(n_estimators=5, random_state=0).fit(X, y), "randomforest",
+               save_dir=str(tmp_path), timestamped=False)
+    artifact = load_model_artifact(tmp_path / "randomforest.pkl", mmap_mode="r", load_model=False)
+    assert artifact["model"] is None
+    assert isinstance(artifact["model_pickle"], np.memmap)
+    assert isinstance(artifact["compiled"]["threshold"], np.memmap)
+
+    def unpickle(artifact):
+        raise AssertionError("estimator unpickled")
+
+    monkeypatch.setattr("api.services.model_service.load_estimator", unpickle)
+    service = ModelService(tmp_path, mmap_mode="r", metrics_path=str(tmp_path / "metrics.txt"))
+    assert service.get_loaded("randomforest").backend == "mapped"
+
+
+def test_estimator_is_unpickled_by_default(tmp_path, training_frame):
+    X, y = training_frame
+    model = RandomForestRegressor(n_estimators=5, random_state=0).fit(X, y)
+    save_model(model, "randomforest", save_dir=str(tmp_path), timestamped=False)
+    artifact = load_model_artifact(tmp_path / "randomforest.pkl", mmap_mode="r")
+    # Estimators copy their nodes while unpickling, mapped or not
+    assert not isinstance(artifact["model"].estimators_[0].tree_.threshold, np.memmap)
+    np.testing.assert_array_equal(artifact["model"].predict(X), model.predict(X))
+
+
+def test_mapped_arrays_off_by_more_than_the_tolerance_are_not_served(tmp_path, training_frame):
+    X, y = training_frame
+    save_model(RandomForestRegressor(n_estimators=5, random_state=0).fit(X, y), "randomforest",
+               save_dir=str(tmp_path), timestamped=False)
+    service = ModelService(tmp_path, mmap_mode="r", compiled_tolerance=-1.0,
+                           metrics_path=str(tmp_path / "metrics.txt"))
+    assert service.get_loaded("randomforest").backend == "native"
+
+
+def test_without_mmap_the_native_model_is_served(tmp_path, training_frame):
+    X, y = training_frame
+    save_model(RandomForestRegressor(n_estimators=5, random_state=0).fit(X, y), "randomforest",
+               save_dir=str(tmp_path), timestamped=False)
+    service = ModelService(tmp_path, mmap_mode=None, metrics_path=str(tmp_path / "metrics.txt"))
+    assert service.get_loaded("randomforest").backend == "native"
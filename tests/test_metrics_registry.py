@@ -0,0 +1,50 @@
+import json
+import os
+
+from api.services.metrics_registry import MetricsRegistry
+
+
+def _write(path, metrics):
+    # Replaced atomically, as run_pipeline.py does
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as file:
+        json.dump(metrics, file)
+    os.replace(tmp, path)
+
+
+def test_metrics_are_served_from_cache(tmp_path, monkeypatch):
+    path = tmp_path / "model_metrics.txt"
+    _write(path, {"xgboost": {"mse": 0.1}})
+    registry = MetricsRegistry(str(path))
+    assert registry.get("xgboost") == {"mse": 0.1}
+
+    reads = []
+    real_load = json.load
+    monkeypatch.setattr(json, "load", lambda file: reads.append(file) or real_load(file))
+    for _ in range(5):
+        assert registry.get("xgboost_20250306_193033") == {"mse": 0.1}
+    assert reads == []
+
+
+def test_metrics_are_reloaded_when_the_file_changes(tmp_path):
+    path = tmp_path / "model_metrics.txt"
+    _write(path, {"xgboost": {"mse": 0.1}})
+    registry = MetricsRegistry(str(path))
+    assert registry.get("xgboost")["mse"] == 0.1
+
+    _write(path, {"xgboost": {"mse": 0.2}, "lightgbm": {"mse": 0.3}})
+    assert registry.get("xgboost")["mse"] == 0.2
+    assert registry.get("lightgbm_compact")["mse"] == 0.3
+
+    os.remove(path)
+    assert registry.get("xgboost") is None
+
+
+def test_unreadable_update_keeps_the_last_metrics(tmp_path):
+    path = tmp_path / "model_metrics.txt"
+    _write(path, {"xgboost": {"mse": 0.1}})
+    registry = MetricsRegistry(str(path))
+    registry.get("xgboost")
+
+    path.write_text("{not json")
+    assert registry.get("xgboost") == {"mse": 0.1}
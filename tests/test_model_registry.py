@@ -0,0 +1,86 @@
+import os
+
+import pytest
+
+from api.services.model_registry import ModelRegistry
+
+
+class CountingLoader:
+    """Loads an artifact as its text and counts loads per file name"""
+
+    def __init__(self):
+        self.loads = []
+
+    def __call__(self, path):
+        self.loads.append(path.name)
+        return path.read_text()
+
+
+def _write(directory, name, content, size=100, tick=0):
+    """Write name.pkl padded to size bytes, renamed into place like save_model does."""
+    path = directory / f"{name}.pkl"
+    tmp = directory / f"{name}.pkl.tmp"
+    tmp.write_text(content.ljust(size))
+    os.replace(tmp, path)
+    # Distinct mtimes for the file and its directory, however coarse the filesystem clock
+    stamp = 1_700_000_000_000_000_000 + tick * 1_000_000_000
+    os.utime(path, ns=(stamp, stamp))
+    os.utime(directory, ns=(stamp, stamp))
+    return path
+
+
+@pytest.fixture
+def loader():
+    return CountingLoader()
+
+
+def test_least_recently_used_model_is_evicted_at_the_byte_limit(tmp_path, loader):
+    for tick, name in enumerate(["a", "b", "c"]):
+        _write(tmp_path, name, name, tick=tick)
+    registry = ModelRegistry(tmp_path, loader, max_cache_bytes=250)
+
+    registry.get("a")
+    registry.get("b")
+    registry.get("a")
+    assert registry.loaded() == ["b", "a"]
+    # 300 bytes would exceed the limit: b was used least recently
+    registry.get("c")
+    assert registry.loaded() == ["a", "c"]
+    registry.get("a")
+    assert loader.loads == ["a.pkl", "b.pkl", "c.pkl"]
+    registry.get("b")
+    assert loader.loads[-1] == "b.pkl"
+
+
+def test_pinned_models_are_not_evicted(tmp_path, loader):
+    for tick, name in enumerate(["a", "b", "c"]):
+        _write(tmp_path, name, name, tick=tick)
+    registry = ModelRegistry(tmp_path, loader, max_cache_bytes=250)
+    registry.preload(["a"])
+    registry.get("b")
+    # a is the least recently used, but pinned: b goes instead
+    registry.get("c")
+    assert registry.loaded() == ["a", "c"]
+
+
+def test_hot_reload_serves_a_replaced_file(tmp_path, loader):
+    _write(tmp_path, "xgboost", "v1", tick=0)
+    registry = ModelRegistry(tmp_path, loader)
+    assert registry.get("xgboost").strip() == "v1"
+
+    _write(tmp_path, "xgboost", "v2", tick=1)
+    assert registry.refresh()
+    assert registry.get("xgboost").strip() == "v2"
+    assert loader.loads == ["xgboost.pkl", "xgboost.pkl"]
+
+
+def test_base_name_follows_the_newest_timestamped_artifact(tmp_path, loader):
+    _write(tmp_path, "xgboost_20250101_000000", "old", tick=0)
+    registry = ModelRegistry(tmp_path, loader)
+    registry.preload(["xgboost"])
+
+    _write(tmp_path, "xgboost_20250102_000000", "new", tick=1)
+    registry.refresh()
+    # The pinned alias was warmed during the refresh, before the first request
+    assert loader.loads == ["xgboost_20250101_000000.pkl", "xgboost_20250102_000000.pkl"]
+    assert registry.get("xgboost").strip() == "new"
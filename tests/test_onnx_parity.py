@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.compose import ColumnTransformer
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+pytest.importorskip("onnxruntime")
+pytest.importorskip("skl2onnx")
+pytest.importorskip("onnxmltools")
+
+from api.services.model_service import ModelService
+from src.inference.onnx_model import ONNX_SUFFIX, export_onnx
+from src.utils import save_model
+
+NUMERIC = ["elevation", "slope", "rainfall_daily"]
+LITHOLOGY = ["basalt", "granite", "limestone", "shale"]
+TOLERANCE = 1e-4
+
+
+@pytest.fixture(scope="module")
+def data():
+    """Raw frame with one categorical column, its fitted preprocessor and transformed splits."""
+    rng = np.random.default_rng(0)
+    n_rows = 500
+    raw = pd.DataFrame({
+        "elevation": rng.uniform(200, 3000, n_rows),
+        "slope": rng.uniform(0, 60, n_rows),
+        "rainfall_daily": rng.gamma(2.0, 20.0, n_rows),
+        "lithology": rng.choice(LITHOLOGY, n_rows),
+    })
+    y = 1 / (1 + np.exp(-(raw["slope"] / 20 - raw["elevation"] / 1500 + (raw["lithology"] == "shale"))))
+    preprocessor = ColumnTransformer([
+        ("num", StandardScaler(), NUMERIC),
+        ("cat", OneHotEncoder(handle_unknown="ignore", sparse_output=False), ["lithology"]),
+    ])
+    transformed = preprocessor.fit_transform(raw)
+    # Feature names as DataPreprocessStrategy gives them to the models
+    names = NUMERIC + preprocessor.named_transformers_["cat"].get_feature_names_out(["lithology"]).tolist()
+    X = pd.DataFrame(transformed, columns=names)
+    return raw, preprocessor, X, y
+
+
+@pytest.mark.parametrize("name", ["randomforest", "xgboost", "lightgbm", "linear_regression"])
+def test_onnx_graph_matches_native_predict(tmp_path, data, make_regressor, name):
+    raw, preprocessor, X, y = data
+    model = make_regressor(name).fit(X[:400], y[:400])
+    path, drift = export_onnx(model, preprocessor, name, X[400:], save_dir=str(tmp_path))
+    assert drift["max_abs"] <= TOLERANCE
+
+    from src.utils import load_model_artifact
+    onnx_model = load_model_artifact(path)["model"]
+    test_raw = raw.iloc[400:]
+    expected = model.predict(pd.DataFrame(preprocessor.transform(test_raw), columns=X.columns))
+    actual = onnx_model.predict(onnx_model.feed_frame(test_raw))
+    np.testing.assert_allclose(actual, expected, atol=TOLERANCE, rtol=0)
+
+
+@pytest.mark.parametrize("name", ["randomforest", "xgboost", "lightgbm", "linear_regression"])
+def test_served_onnx_model_matches_native_model(tmp_path, data, make_regressor, name):
+    raw, preprocessor, X, y = data
+    model = make_regressor(name).fit(X[:400], y[:400])
+    save_model(model, name, preprocessor=preprocessor, save_dir=str(tmp_path), timestamped=False)
+    export_onnx(model, preprocessor, name, X[400:], save_dir=str(tmp_path))
+
+    service = ModelService(tmp_path, metrics_path=str(tmp_path / "metrics.txt"), onnx_threads=1)
+    assert service.get_loaded(f"{name}{ONNX_SUFFIX}").backend == "onnx"
+    rows = raw.iloc[400:].to_dict("records")
+    native = [service.predict(name, row) for row in rows[:20]]
+    served = [service.predict(f"{name}{ONNX_SUFFIX}", row) for row in rows[:20]]
+    np.testing.assert_allclose(served, native, atol=TOLERANCE, rtol=0)
+    np.testing.assert_allclose(
+        service.predict_batch(f"{name}{ONNX_SUFFIX}", rows), service.predict_batch(name, rows),
+        atol=TOLERANCE, rtol=0,
+    )
+
+
+def test_export_refuses_a_drifting_graph(tmp_path, data, make_regressor):
+    raw, preprocessor, X, y = data
+    model = make_regressor("randomforest").fit(X[:400], y[:400])
+    with pytest.raises(ValueError, match="drifts"):
+        export_onnx(model, preprocessor, "randomforest", X[400:], save_dir=str(tmp_path), max_drift=-1.0)
+    assert not list(tmp_path.glob("*.pkl"))
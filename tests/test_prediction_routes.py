@@ -0,0 +1,93 @@
+import asyncio
+
+import httpx
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi import FastAPI
+from sklearn.linear_model import LinearRegression
+
+from api.routers.predictions import router
+from api.services.inference_executor import InferenceExecutor
+from api.services.model_service import ModelService
+from src.data.data_pipeline import EXPECTED_FEATURES
+from src.utils import save_model
+
+CATEGORIES = {
+    "lithology": ["basalt", "granite", "limestone", "sandstone", "shale"],
+    "land_use": ["agriculture", "barren", "forest", "grassland", "urban"],
+    "human_activity": ["high", "low", "medium"],
+}
+NUMERIC = [name for name in EXPECTED_FEATURES if not name.startswith(tuple(f"{field}_" for field in CATEGORIES))]
+
+
+def _sites(n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    sites = []
+    for _ in range(n_rows):
+        site = {name: float(rng.uniform(0, 1)) for name in NUMERIC}
+        site["previous_landslides"] = int(rng.integers(0, 3))
+        site.update({field: str(rng.choice(values)) for field, values in CATEGORIES.items()})
+        sites.append(site)
+    return sites
+
+
+def _one_hot(sites):
+    frame = pd.DataFrame(0.0, index=range(len(sites)), columns=EXPECTED_FEATURES)
+    for i, site in enumerate(sites):
+        for name in NUMERIC:
+            frame.loc[i, name] = site[name]
+        for field in CATEGORIES:
+            frame.loc[i, f"{field}_{site[field]}"] = 1.0
+    return frame
+
+
+@pytest.fixture
+def app(tmp_path):
+    # A bare estimator, served through FeatureEncoder like models saved before preprocessors were
+    train = _one_hot(_sites(100))
+    target = 0.2 + 0.6 * train["slope"] * train["lithology_shale"] + 0.1 * train["human_activity_high"]
+    model = LinearRegression().fit(train, target)
+    save_model(model, "linear_regression", save_dir=str(tmp_path), timestamped=False)
+
+    app = FastAPI()
+    app.include_router(router, prefix="/api/v1")
+    app.state.model_service = ModelService(tmp_path, metrics_path=str(tmp_path / "metrics.txt"))
+    app.state.inference_executor = InferenceExecutor(max_workers=1, max_queue_depth=8)
+    app.state.model = model
+    yield app
+    app.state.inference_executor.shutdown()
+
+
+def _post(app, path, body):
+    async def send():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.post(path, json=body)
+
+    return asyncio.run(send())
+
+
+def test_batch_keeps_input_order_and_reports_errors_per_row(app):
+    sites = _sites(6, seed=1)
+    sites[1]["lithology"] = ""
+    sites[4]["slope"] = 500
+    response = _post(app, "/api/v1/predict/batch", {"model_name": "linear_regression", "inputs": sites})
+    assert response.status_code == 200
+
+    results = response.json()["results"]
+    assert [result["index"] for result in results] == list(range(len(sites)))
+    assert results[1]["prediction"] is None and results[1]["error"].startswith("lithology")
+    assert results[4]["prediction"] is None and results[4]["error"].startswith("slope")
+
+    valid = [0, 2, 3, 5]
+    expected = np.clip(app.state.model.predict(_one_hot([sites[i] for i in valid])), 0, 1)
+    np.testing.assert_allclose([results[i]["prediction"] for i in valid], expected, atol=1e-5)
+    assert all(results[i]["error"] is None for i in valid)
+
+
+def test_empty_category_is_rejected_for_a_single_prediction(app):
+    site = _sites(1)[0]
+    site["land_use"] = ""
+    response = _post(app, "/api/v1/predict", {**site, "model_name": "linear_regression"})
+    assert response.status_code == 422
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.compose import ColumnTransformer
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+from api.services.feature_encoder import PreprocessorEncoder
+
+NUMERIC = ["elevation", "slope", "rainfall_daily"]
+CATEGORICAL = ["lithology", "land_use"]
+
+
+def _frame(n_rows=50, seed=0):
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame({name: rng.normal(100, 30, n_rows) for name in NUMERIC})
+    frame["lithology"] = rng.choice(["basalt", "granite", "shale"], n_rows)
+    frame["land_use"] = rng.choice(["forest", "urban"], n_rows)
+    # Fitted on, but read by no step
+    frame["unused"] = rng.normal(size=n_rows)
+    return frame
+
+
+PREPROCESSORS = {
+    "default": lambda: ColumnTransformer([
+        ("num", StandardScaler(), NUMERIC), ("cat", OneHotEncoder(handle_unknown="ignore"), CATEGORICAL),
+    ]),
+    "without_mean": lambda: ColumnTransformer([
+        ("num", StandardScaler(with_mean=False), NUMERIC), ("cat", OneHotEncoder(), CATEGORICAL),
+    ]),
+    "without_std": lambda: ColumnTransformer([
+        ("num", StandardScaler(with_std=False), NUMERIC), ("cat", OneHotEncoder(), CATEGORICAL),
+    ]),
+    "unscaled": lambda: ColumnTransformer([
+        ("num", StandardScaler(with_mean=False, with_std=False), NUMERIC), ("cat", OneHotEncoder(), CATEGORICAL),
+    ]),
+    "by_index": lambda: ColumnTransformer([
+        ("num", StandardScaler(), [0, 1, 2]), ("cat", OneHotEncoder(), [3, 4]),
+    ]),
+    "passthrough": lambda: ColumnTransformer(
+        [("cat", OneHotEncoder(), CATEGORICAL)], remainder="passthrough",
+    ),
+}
+
+
+@pytest.mark.parametrize("name", sorted(PREPROCESSORS))
+def test_encoder_matches_transform(name):
+    train = _frame()
+    preprocessor = PREPROCESSORS[name]().fit(train)
+    encoder = PreprocessorEncoder(preprocessor)
+    assert encoder.compiled == (name != "passthrough")
+
+    requests = _frame(20, seed=1)
+    expected = preprocessor.transform(requests)
+    # Requests carry only the columns the transformer reads
+    rows = requests[encoder.input_columns].to_dict("records")
+    np.testing.assert_allclose(encoder.encode_batch(rows), expected, rtol=1e-5, atol=1e-4)
+
+
+def test_dropped_columns_are_not_required():
+    preprocessor = PREPROCESSORS["default"]().fit(_frame())
+    assert "unused" in preprocessor.feature_names_in_
+    assert PreprocessorEncoder(preprocessor).input_columns == NUMERIC + CATEGORICAL
@@ -0,0 +1,122 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("scipy")
+
+from src.hazards.spatial import EARTH_RADIUS_KM, SpatialIndex
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+@pytest.fixture(scope="module")
+def places():
+    rng = np.random.default_rng(0)
+    n_places = 3000
+    # Uniform on the sphere, plus a cluster straddling the antimeridian
+    lat = np.degrees(np.arcsin(rng.uniform(-1, 1, n_places)))
+    lon = rng.uniform(-180, 180, n_places)
+    lat[:200] = rng.uniform(-20, 20, 200)
+    lon[:200] = (rng.uniform(170, 190, 200) + 180) % 360 - 180
+    return pd.DataFrame({
+        "Name": [f"place-{i}" for i in range(n_places)],
+        "Latitude": lat,
+        "Longitude": lon,
+        "Risk_Level": rng.integers(0, 3, n_places),
+    })
+
+
+@pytest.fixture(scope="module")
+def index(places):
+    return SpatialIndex(places)
+
+
+QUERIES = [(28.61, 77.21), (0.0, 179.95), (5.0, -179.9), (-89.5, 10.0), (89.9, -120.0), (0.0, 0.0)]
+
+
+def test_distances_are_great_circle_distances():
+    two = pd.DataFrame({"Latitude": [28.6139, 19.0760], "Longitude": [77.2090, 72.8777], "Risk_Level": [0, 1]})
+    _, distance = SpatialIndex(two).nearest(28.6139, 77.2090, k=2)
+    # Delhi to Mumbai
+    assert distance[0] == pytest.approx(0.0, abs=1e-6)
+    assert distance[1] == pytest.approx(1148.1, abs=0.5)
+    # One degree of latitude
+    one = pd.DataFrame({"Latitude": [1.0], "Longitude": [0.0], "Risk_Level": [0]})
+    _, distance = SpatialIndex(one).nearest(0.0, 0.0)
+    assert distance[0] == pytest.approx(2 * np.pi * EARTH_RADIUS_KM / 360, rel=1e-9)
+
+
+@pytest.mark.parametrize("lat,lon", QUERIES)
+def test_nearest_matches_brute_force(places, index, lat, lon):
+    expected = haversine_km(lat, lon, places["Latitude"].to_numpy(), places["Longitude"].to_numpy())
+    positions, distance = index.nearest(lat, lon, k=10)
+    np.testing.assert_allclose(distance, np.sort(expected)[:10], atol=1e-6)
+    np.testing.assert_allclose(expected[positions], distance, atol=1e-6)
+
+
+@pytest.mark.parametrize("lat,lon", QUERIES)
+def test_nearest_with_min_level_matches_brute_force(places, index, lat, lon):
+    expected = haversine_km(lat, lon, places["Latitude"].to_numpy(), places["Longitude"].to_numpy())
+    expected = np.sort(expected[places["Risk_Level"].to_numpy() >= 2])[:5]
+    positions, distance = index.nearest(lat, lon, k=5, min_level=2)
+    np.testing.assert_allclose(distance, expected, atol=1e-6)
+    assert (places["Risk_Level"].to_numpy()[positions] >= 2).all()
+
+
+@pytest.mark.parametrize("lat,lon", QUERIES)
+@pytest.mark.parametrize("radius_km", [50.0, 500.0, 2500.0])
+def test_radius_matches_brute_force(places, index, lat, lon, radius_km):
+    expected = haversine_km(lat, lon, places["Latitude"].to_numpy(), places["Longitude"].to_numpy())
+    positions, distance = index.within_radius(lat, lon, radius_km)
+    assert set(positions.tolist()) == set(np.flatnonzero(expected <= radius_km).tolist())
+    np.testing.assert_allclose(distance, expected[positions], atol=1e-6)
+    assert (np.diff(distance) >= 0).all()
+
+
+def test_radius_reaches_across_the_antimeridian():
+    two = pd.DataFrame({"Latitude": [0.0, 0.0], "Longitude": [179.9, -179.9], "Risk_Level": [0, 0]})
+    positions, distance = SpatialIndex(two).within_radius(0.0, 179.9, 30.0)
+    assert positions.tolist() == [0, 1]
+    assert distance[1] == pytest.approx(haversine_km(0.0, 179.9, 0.0, -179.9), abs=1e-6)
+    assert distance[1] < 25
+
+
+def _in_box(places, lat_min, lat_max, lon_min, lon_max):
+    lat, lon = places["Latitude"].to_numpy(), places["Longitude"].to_numpy()
+    in_lat = (lat >= lat_min) & (lat <= lat_max)
+    in_lon = (lon >= lon_min) & (lon <= lon_max) if lon_min <= lon_max else (lon >= lon_min) | (lon <= lon_max)
+    return np.flatnonzero(in_lat & in_lon)
+
+
+@pytest.mark.parametrize("box", [
+    (8.0, 37.0, 68.0, 97.0),
+    (-90.0, 90.0, -180.0, 180.0),
+    # lon_min > lon_max: the box crosses the antimeridian
+    (-15.0, 15.0, 175.0, -175.0),
+    (-10.0, 10.0, 170.0, -170.0),
+])
+def test_bbox_matches_brute_force(places, index, box):
+    expected = _in_box(places, *box)
+    np.testing.assert_array_equal(index.within_bbox(*box), expected)
+    assert len(expected) > 0
+
+
+def test_antimeridian_bbox_excludes_the_rest_of_the_world(places, index):
+    positions = index.within_bbox(-10.0, 10.0, 170.0, -170.0)
+    lon = places["Longitude"].to_numpy()[positions]
+    assert ((lon >= 170) | (lon <= -170)).all()
+    assert (lon > 0).any() and (lon < 0).any()
+    # The same longitudes the other way round are the whole band except that strip
+    band = index.within_bbox(-10.0, 10.0, -170.0, 170.0)
+    assert not set(positions.tolist()) & set(band.tolist())
+
+
+def test_bbox_min_level_and_limit(places, index):
+    box = (-10.0, 10.0, 170.0, -170.0)
+    expected = [i for i in _in_box(places, *box) if places["Risk_Level"].iloc[i] >= 1]
+    np.testing.assert_array_equal(index.within_bbox(*box, min_level=1), expected)
+    np.testing.assert_array_equal(index.within_bbox(*box, min_level=1, limit=3), expected[:3])
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data import data_loader
+from src.data.data_pipeline import PREPROCESS_CONFIG
+from src.data.split_cache import cache_key
+
+
+def _write_csv(path, seed=0, n_rows=60):
+    rng = np.random.default_rng(seed)
+    pd.DataFrame({
+        "date": pd.date_range("2024-01-01", periods=n_rows).astype(str),
+        "latitude": rng.uniform(size=n_rows),
+        "longitude": rng.uniform(size=n_rows),
+        "slope": rng.normal(30, 10, n_rows),
+        "lithology": rng.choice(["basalt", "shale"], n_rows),
+        "landslide_occurred": rng.integers(0, 2, n_rows),
+    }).to_csv(path, index=False)
+    return str(path)
+
+
+@pytest.fixture
+def clean_calls(monkeypatch):
+    """Counts how often the splits are recomputed instead of read from the cache"""
+    calls = []
+    real_clean_data = data_loader.clean_data
+    monkeypatch.setattr(data_loader, "clean_data", lambda data: calls.append(len(data)) or real_clean_data(data))
+    return calls
+
+
+def test_key_changes_with_the_data_file_and_config(tmp_path, monkeypatch):
+    path = _write_csv(tmp_path / "data.csv")
+    key = cache_key(path)
+    assert cache_key(path) == key
+    assert cache_key(path, streaming=True) != key
+
+    _write_csv(tmp_path / "data.csv", seed=1)
+    changed_data = cache_key(path)
+    assert changed_data != key
+
+    monkeypatch.setitem(PREPROCESS_CONFIG, "test_size", 0.3)
+    assert cache_key(path) != changed_data
+
+
+def test_cache_hits_until_the_data_file_changes(tmp_path, clean_calls):
+    path = _write_csv(tmp_path / "data.csv")
+    cache_dir = str(tmp_path / "cache")
+    first = data_loader.load_splits(path, cache_dir=cache_dir)
+    cached = data_loader.load_splits(path, cache_dir=cache_dir)
+    assert len(clean_calls) == 1
+    for fresh, loaded in zip(first[:4], cached[:4]):
+        np.testing.assert_array_equal(np.asarray(fresh), np.asarray(loaded))
+
+    _write_csv(tmp_path / "data.csv", seed=1)
+    changed = data_loader.load_splits(path, cache_dir=cache_dir)
+    assert len(clean_calls) == 2
+    assert not np.array_equal(np.asarray(changed[0]), np.asarray(first[0]))
+
+
+def test_cache_misses_when_the_preprocessing_config_changes(tmp_path, clean_calls, monkeypatch):
+    path = _write_csv(tmp_path / "data.csv")
+    cache_dir = str(tmp_path / "cache")
+    x_train = data_loader.load_splits(path, cache_dir=cache_dir)[0]
+
+    monkeypatch.setitem(PREPROCESS_CONFIG, "test_size", 0.5)
+    resplit = data_loader.load_splits(path, cache_dir=cache_dir)[0]
+    assert len(clean_calls) == 2
+    assert len(resplit) == 30 and len(x_train) == 48
@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+
+from src.data.data_loader import clean_data, ingest_data, pipeline_columns
+from src.data.shared_data import load_shared_splits
+from src.data.streaming import stream_clean_data
+
+
+def _csv(tmp_path):
+    rng = np.random.default_rng(0)
+    n = 250
+    frame = pd.DataFrame({
+        "date": pd.date_range("2024-01-01", periods=n).astype(str),
+        "latitude": rng.uniform(size=n),
+        "longitude": rng.uniform(size=n),
+        "slope": rng.normal(30, 10, n),
+        "rainfall_daily": rng.gamma(2.0, 20.0, n),
+        # Integer column: float64 and int64 alike must end up scaled
+        "previous_landslides": rng.integers(0, 5, n),
+        "lithology": rng.choice(["basalt", "granite", "shale"], n),
+        "land_use": rng.choice(["forest", "urban"], n),
+        "landslide_occurred": rng.integers(0, 2, n),
+    })
+    path = tmp_path / "data.csv"
+    frame.to_csv(path, index=False)
+    return str(path)
+
+
+def test_streamed_splits_match_clean_data(tmp_path):
+    path = _csv(tmp_path)
+    x_train, x_test, y_train, y_test, preprocessor = clean_data(ingest_data(path))
+    # Chunks smaller than the file, so statistics really are accumulated
+    shared, streamed_preprocessor = stream_clean_data(path, str(tmp_path / "splits"), chunksize=60)
+    sx_train, sx_test, sy_train, sy_test = load_shared_splits(shared)
+
+    assert list(sx_train.columns) == list(x_train.columns)
+    np.testing.assert_allclose(sx_train.to_numpy(), x_train.to_numpy(), rtol=1e-5, atol=1e-5)
+    np.testing.assert_allclose(sx_test.to_numpy(), x_test.to_numpy(), rtol=1e-5, atol=1e-5)
+    np.testing.assert_array_equal(sy_train.to_numpy(), y_train.to_numpy())
+    np.testing.assert_array_equal(sy_test.to_numpy(), y_test.to_numpy())
+
+    # The saved transformers must agree on new rows too
+    rows = ingest_data(path, columns=pipeline_columns(path)).drop(columns="landslide_occurred").head(20)
+    np.testing.assert_allclose(
+        streamed_preprocessor.transform(rows), preprocessor.transform(rows), rtol=1e-5, atol=1e-5
+    )
@@ -0,0 +1,48 @@
+import os
+
+import numpy as np
+import optuna
+import pandas as pd
+
+from src.optimize.tuner import HyperparameterTuner, make_storage
+
+
+class ThreadRecordingModel:
+    """Model whose trials record the thread count their worker was given."""
+
+    def __init__(self):
+        self.config = {}
+
+    def optimize(self, trial, x_train, y_train, x_test, y_test):
+        trial.set_user_attr("n_jobs", self.config.get("n_jobs"))
+        trial.set_user_attr("pid", os.getpid())
+        return trial.suggest_float("x", 0, 1)
+
+
+def _splits():
+    X = pd.DataFrame({"a": np.arange(20.0), "b": np.arange(20.0)})
+    y = pd.Series(np.arange(20.0), name="y")
+    return X[:16], y[:16], X[16:], y[16:]
+
+
+def test_worker_threads_split_the_model_budget():
+    x_train, y_train, x_test, y_test = _splits()
+    tuner = HyperparameterTuner(ThreadRecordingModel(), x_train, y_train, x_test, y_test, n_threads=6)
+    assert tuner.worker_threads(2) == 3
+    assert tuner.worker_threads(4) == 1
+    assert tuner.worker_threads(8) == 1
+    unbounded = HyperparameterTuner(ThreadRecordingModel(), x_train, y_train, x_test, y_test)
+    assert unbounded.worker_threads(1) == (os.cpu_count() or 1)
+
+
+def test_parallel_workers_receive_their_share_of_the_budget(tmp_path):
+    x_train, y_train, x_test, y_test = _splits()
+    tuner = HyperparameterTuner(ThreadRecordingModel(), x_train, y_train, x_test, y_test, pruner="none", n_threads=4)
+    storage = str(tmp_path / "study.log")
+    tuner.optimize(n_trials=6, n_jobs=2, storage=storage, study_name="threads")
+
+    study = optuna.load_study(study_name="threads", storage=make_storage(storage))
+    trials = [trial for trial in study.trials if trial.state == optuna.trial.TrialState.COMPLETE]
+    assert len(trials) >= 6
+    assert {trial.user_attrs["n_jobs"] for trial in trials} == {2}
+    assert os.getpid() not in {trial.user_attrs["pid"] for trial in trials}